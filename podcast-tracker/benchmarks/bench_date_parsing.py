@@ -0,0 +1,115 @@
+"""
+Benchmark: per-entry cost of parsing episode publication dates.
+
+Builds a feed with N entries whose dates mix the formats seen in real
+podcast feeds (RFC 822 with numeric and named zones, ISO 8601, a few
+free-form ones), parses it once with feedparser, then times parsing every
+entry's date with dateutil alone (the previous behaviour) and with
+RSSParser's fast path, printing the cost per entry and how many dates each
+path handled.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_date_parsing.py [--entries N] [--json out.json]
+"""
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import feedparser
+from dateutil import parser as date_parser
+
+from podcast_tracker.services.rss_parser import RSSParser, date_parse_stats
+
+# (strftime format, entries out of every 20); most feeds are RFC 822
+DATE_FORMATS = [
+    ("%a, %d %b %Y %H:%M:%S +0000", 9),
+    ("%a, %d %b %Y %H:%M:%S +0100", 4),
+    ("%a, %d %b %Y %H:%M:%S GMT", 4),
+    ("%Y-%m-%dT%H:%M:%S+02:00", 2),
+    ("%B %d, %Y %H:%M", 1),
+]
+
+
+def build_feed(entries: int) -> bytes:
+    """An RSS document with `entries` items."""
+    formats = [date_format for date_format, weight in DATE_FORMATS for _ in range(weight)]
+    base_date = datetime(2020, 1, 1)
+    items = []
+    for i in range(entries):
+        date_format = formats[i % len(formats)]
+        pub_date = (base_date + timedelta(hours=i)).strftime(date_format)
+        items.append(
+            f"<item><title>Episode {i}</title><guid isPermaLink=\"false\">bench-{i}</guid>"
+            f"<pubDate>{pub_date}</pubDate>"
+            f"<enclosure url=\"https://bench.example.com/{i}.mp3\" type=\"audio/mpeg\"/></item>"
+        )
+    
+    return (
+        "<?xml version=\"1.0\"?><rss version=\"2.0\"><channel><title>Benchmark</title>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode()
+
+
+def time_per_entry(entries, parse, repeat: int) -> float:
+    """Best per-entry time in microseconds over `repeat` passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for entry in entries:
+            parse(entry)
+        best = min(best, time.perf_counter() - start)
+    return best / len(entries) * 1e6
+
+
+def dateutil_only(entry):
+    """The previous behaviour: dateutil on the raw string."""
+    try:
+        return date_parser.parse(entry.published)
+    except Exception:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    start = time.perf_counter()
+    feed = feedparser.parse(build_feed(args.entries))
+    feedparser_us = (time.perf_counter() - start) / args.entries * 1e6
+    
+    baseline_us = time_per_entry(feed.entries, dateutil_only, args.repeat)
+    
+    date_parse_stats.reset()
+    fast_us = time_per_entry(feed.entries, lambda entry: RSSParser._parse_date(entry, "published"), args.repeat)
+    paths = {path: count // args.repeat for path, count in date_parse_stats.snapshot().items()}
+    
+    result = {
+        "entries": args.entries,
+        "feedparser_us_per_entry": round(feedparser_us, 2),
+        "dateutil_us_per_entry": round(baseline_us, 2),
+        "fast_path_us_per_entry": round(fast_us, 2),
+        "speedup": round(baseline_us / fast_us, 1),
+        "paths": paths,
+    }
+    
+    print(f"feedparser (whole entry)  {result['feedparser_us_per_entry']:>8.2f} us/entry")
+    print(f"dateutil only             {result['dateutil_us_per_entry']:>8.2f} us/entry")
+    print(f"fast path                 {result['fast_path_us_per_entry']:>8.2f} us/entry  ({result['speedup']}x)")
+    print("paths: " + ", ".join(f"{path}={count}" for path, count in paths.items()))
+    
+    if args.json:
+        args.json.write_text(json.dumps({"benchmark": "date_parsing", "results": [result]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark: API reader latency while the scheduler bulk-ingests episodes.
+
+Runs the same workload against a database using SQLite's defaults
+(rollback journal, synchronous=FULL) and one using the tuned profile from
+Settings (WAL, synchronous=NORMAL, ...), then prints reader latency
+percentiles for both.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_sqlite_tuning.py [--episodes N] [--json out.json]
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy.orm import sessionmaker
+
+from podcast_tracker.database import Base, Podcast, create_db_engine
+from podcast_tracker.services import PodcastService
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def reader(db_path: Path, tuned: bool, started, done, results) -> None:
+    """Poll the first page of pending episodes like the web UI, timing each read."""
+    logging.disable(logging.INFO)
+    engine = create_db_engine(f"sqlite:///{db_path}", tuned=tuned)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    latencies = []
+    
+    with Session() as db:
+        service = PodcastService(db)
+        started.set()
+        while not done.is_set():
+            start = time.perf_counter()
+            service.count_pending_episodes()
+            service.pending_episodes_query().limit(20).all()
+            db.rollback()  # end the read transaction like a request would
+            latencies.append((time.perf_counter() - start) * 1000)
+    
+    engine.dispose()
+    results.put(latencies)
+
+
+def run_profile(db_path: Path, tuned: bool, episodes: int, batch_size: int) -> dict:
+    """Ingest `episodes` rows in batches while a reader process polls the first page."""
+    engine = create_db_engine(f"sqlite:///{db_path}", tuned=tuned)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    with Session() as db:
+        podcast = Podcast(name="Benchmark", rss_url="https://bench.example.com/feed.xml")
+        db.add(podcast)
+        db.commit()
+        podcast_id = podcast.id
+    
+    # A separate process, like a second uvicorn worker, so the GIL does not
+    # hide lock waits
+    context = multiprocessing.get_context("spawn")
+    started, done, results = context.Event(), context.Event(), context.Queue()
+    reader_process = context.Process(target=reader, args=(db_path, tuned, started, done, results))
+    reader_process.start()
+    started.wait()
+    
+    base_date = datetime(2020, 1, 1)
+    ingest_start = time.perf_counter()
+    with Session() as db:
+        service = PodcastService(db)
+        podcast = db.get(Podcast, podcast_id)
+        for offset in range(0, episodes, batch_size):
+            batch = [
+                {
+                    "guid": f"bench-{i}",
+                    "title": f"Episode {i}",
+                    "description": "x" * 2000,
+                    "pub_date": base_date + timedelta(hours=i),
+                    "episode_url": f"https://bench.example.com/{i}.mp3",
+                }
+                for i in range(offset, min(offset + batch_size, episodes))
+            ]
+            service._add_episodes_from_feed(podcast, batch)
+    ingest_seconds = time.perf_counter() - ingest_start
+    
+    done.set()
+    latencies = results.get()
+    reader_process.join()
+    engine.dispose()
+    
+    return {
+        "tuned": tuned,
+        "episodes": episodes,
+        "ingest_seconds": round(ingest_seconds, 3),
+        "reads": len(latencies),
+        "read_p50_ms": round(statistics.median(latencies), 3),
+        "read_p95_ms": round(_percentile(latencies, 0.95), 3),
+        "read_max_ms": round(max(latencies), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=60000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for tuned in (False, True):
+            results.append(run_profile(
+                Path(tmp) / f"bench_{'tuned' if tuned else 'default'}.db",
+                tuned,
+                args.episodes,
+                args.batch_size
+            ))
+    
+    for result in results:
+        label = "tuned  " if result["tuned"] else "default"
+        print(
+            f"{label} ingest {result['ingest_seconds']:>7.2f}s  reads {result['reads']:>6}  "
+            f"p50 {result['read_p50_ms']:>8.2f}ms  p95 {result['read_p95_ms']:>8.2f}ms  "
+            f"max {result['read_max_ms']:>8.2f}ms"
+        )
+    
+    if args.json:
+        args.json.write_text(json.dumps({"benchmark": "sqlite_tuning", "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
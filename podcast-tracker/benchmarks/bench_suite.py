@@ -0,0 +1,371 @@
+"""
+Benchmark suite: feed refresh, ingestion and API latency on synthetic data.
+
+Scenarios, each run for every size given on the command line:
+
+- refresh: refresh_all_podcasts against feeds of N items served by a local
+  HTTP server; a cold pass (every episode new) then a warm one (304s)
+- ingest: _add_episodes_from_feed of a fresh batch into a database of
+  N episodes, then the same batch again (all known)
+- pagination: GET /api/episodes on a database of N episodes: first page
+  with and without the total, a deep OFFSET page and a cursor walk
+- listened: PATCH of one episode and bulk PATCH by ids and by podcast
+
+Data comes from benchmarks/synthetic.py and depends only on --seed, so
+results of two runs (or two commits) can be compared; --json writes them
+with the environment they were measured in. Databases take a while to
+build at 1M episodes: pass --db-dir to keep them between runs.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_suite.py [--feed-items 10 100 1000 10000]
+        [--episodes 10000 100000 1000000] [--scenario refresh ...] [--json out.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Measure the application, not its response cache; no scheduler either
+os.environ["TESTING"] = "true"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+import podcast_tracker.database.database as db_module
+from podcast_tracker.config import settings
+from podcast_tracker.database import Base, Episode, Podcast, create_db_engine
+from podcast_tracker.main import app
+from podcast_tracker.services import PodcastService
+from podcast_tracker.services.rss_parser import RSSParser
+
+from synthetic import FeedServer, build_database, feed_xml
+
+SCENARIOS = ("refresh", "ingest", "pagination", "listened")
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(samples) -> dict:
+    """Latency summary of a list of durations in seconds, in milliseconds."""
+    return {
+        "samples": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "p50_ms": round(_percentile(samples, 0.50) * 1000, 3),
+        "p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def timed(function, *args, **kwargs):
+    """Call function and return (result, seconds)."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def environment(args) -> dict:
+    """Where and on what the results were measured."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "sqlite_tuning": settings.sqlite_tuning,
+        "refresh_concurrency": settings.refresh_concurrency,
+        "args": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+    }
+
+
+def open_database(path: Path):
+    """Engine and session factory for a benchmark database, as the app would open it."""
+    engine = create_db_engine(f"sqlite:///{path}", tuned=settings.sqlite_tuning)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def prepared_database(episodes: int, args, workdir: Path) -> Path:
+    """
+    A writable copy of the database with `episodes` episodes.
+    
+    Built once per size and seed; kept in --db-dir when given.
+    
+    Args:
+        episodes: Number of episodes
+        args: Command line arguments
+        workdir: Directory for the working copy
+    
+    Returns:
+        Path of the working copy
+    """
+    cache_dir = args.db_dir or workdir
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    source = cache_dir / f"episodes-{episodes}-p{args.podcasts}-s{args.seed}.db"
+    if not source.exists():
+        print(f"  building database with {episodes} episodes...", flush=True)
+        partial = source.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+        _, seconds = timed(build_database, partial, episodes, args.podcasts, seed=args.seed)
+        partial.rename(source)
+        print(f"  built in {seconds:.1f}s", flush=True)
+    
+    target = workdir / f"work-{episodes}.db"
+    shutil.copyfile(source, target)
+    return target
+
+
+def bench_refresh(items: int, args, workdir: Path) -> dict:
+    """refresh_all_podcasts against --refresh-podcasts local feeds of `items` items."""
+    feeds = {feed_id: feed_xml(feed_id, items, args.seed) for feed_id in range(args.refresh_podcasts)}
+    engine, Session = open_database(workdir / f"refresh-{items}.db")
+    Base.metadata.create_all(bind=engine)
+    
+    try:
+        with FeedServer(feeds) as server, Session() as db:
+            db.add_all(
+                Podcast(name=f"Benchmark podcast {feed_id}", rss_url=server.url(feed_id))
+                for feed_id in feeds
+            )
+            db.commit()
+            
+            service = PodcastService(db)
+            cold_new, cold = timed(service.refresh_all_podcasts)
+            warm_new, warm = timed(service.refresh_all_podcasts)
+            
+            return {
+                "scenario": "refresh",
+                "feed_items": items,
+                "podcasts": len(feeds),
+                "feed_bytes": sum(len(body) for body in feeds.values()),
+                "cold_seconds": round(cold, 4),
+                "cold_new_episodes": cold_new,
+                "cold_ms_per_episode": round(cold / max(cold_new, 1) * 1000, 4),
+                "warm_seconds": round(warm, 4),
+                "warm_new_episodes": warm_new,
+                "requests": server.requests,
+            }
+    finally:
+        engine.dispose()
+
+
+def bench_ingest(episodes: int, db_path: Path, args) -> dict:
+    """_add_episodes_from_feed of --ingest-items new episodes into the first podcast."""
+    # Parse the batch through the real fetch and parse path, outside the timing
+    with FeedServer({args.podcasts: feed_xml(args.podcasts, args.ingest_items, args.seed)}) as server:
+        batch = RSSParser.parse_feed(server.url(args.podcasts))["episodes"]
+    
+    engine, Session = open_database(db_path)
+    try:
+        with Session() as db:
+            podcast = db.query(Podcast).order_by(Podcast.id).first()
+            existing = db.query(Episode).filter(Episode.podcast_id == podcast.id).count()
+            service = PodcastService(db)
+            
+            added, new_seconds = timed(service._add_episodes_from_feed, podcast, batch)
+            db.commit()
+            again, known_seconds = timed(service._add_episodes_from_feed, podcast, batch)
+            db.commit()
+            
+            return {
+                "scenario": "ingest",
+                "episodes": episodes,
+                "podcast_episodes": existing,
+                "batch": len(batch),
+                "new_seconds": round(new_seconds, 4),
+                "new_added": added,
+                "new_ms_per_episode": round(new_seconds / max(added, 1) * 1000, 4),
+                "known_seconds": round(known_seconds, 4),
+                "known_added": again,
+            }
+    finally:
+        engine.dispose()
+
+
+def _request_samples(client: TestClient, method: str, url: str, repeat: int, **kwargs) -> list:
+    """Durations of `repeat` identical requests, after one warm-up request."""
+    samples = []
+    for _ in range(repeat + 1):
+        response, seconds = timed(client.request, method, url, **kwargs)
+        response.raise_for_status()
+        samples.append(seconds)
+    return samples[1:]
+
+
+def bench_pagination(episodes: int, client: TestClient, args) -> list:
+    """GET /api/episodes: page 1, a deep OFFSET page and a cursor walk."""
+    results = []
+    first = client.get("/api/episodes", params={"page_size": args.page_size}).json()
+    deep_page = max(1, (first["total_pages"] or 1) // 2)
+    
+    cases = [
+        ("first_page", {"page": 1}),
+        ("first_page_no_total", {"page": 1, "include_total": "false"}),
+        ("first_page_compact", {"page": 1, "include_total": "false", "compact": "true"}),
+        ("deep_offset_page", {"page": deep_page, "include_total": "false"}),
+    ]
+    for case, params in cases:
+        samples = _request_samples(
+            client, "GET", "/api/episodes", args.repeat, params={"page_size": args.page_size, **params}
+        )
+        results.append({"scenario": "pagination", "case": case, "episodes": episodes,
+                        "page": params["page"], **summarize(samples)})
+    
+    # Follow next_cursor through --cursor-pages pages, one sample per page
+    samples = []
+    params = {"page_size": args.page_size, "include_total": "false"}
+    for _ in range(args.cursor_pages):
+        response, seconds = timed(client.get, "/api/episodes", params=params)
+        response.raise_for_status()
+        samples.append(seconds)
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            break
+        params["cursor"] = cursor
+    results.append({"scenario": "pagination", "case": "cursor_walk", "episodes": episodes,
+                    "pages": len(samples), **summarize(samples)})
+    
+    return results
+
+
+def bench_listened(episodes: int, client: TestClient, Session, args) -> list:
+    """PATCH listened: one episode, many ids, a whole podcast; each undone afterwards."""
+    with Session() as db:
+        podcast_id = db.query(Podcast.id).order_by(Podcast.id).limit(1).scalar()
+        ids = [episode_id for (episode_id,) in db.query(Episode.id).filter(
+            Episode.listened.is_(False)
+        ).order_by(Episode.id).limit(max(args.repeat, args.bulk_ids))]
+    
+    results = []
+    
+    samples = []
+    for episode_id in ids[:args.repeat]:
+        for listened in (True, False):
+            response, seconds = timed(client.patch, f"/api/episodes/{episode_id}/listened",
+                                      json={"listened": listened})
+            response.raise_for_status()
+            samples.append(seconds)
+    results.append({"scenario": "listened", "case": "single", "episodes": episodes, **summarize(samples)})
+    
+    samples = []
+    for _ in range(args.repeat):
+        for listened in (True, False):
+            response, seconds = timed(client.patch, "/api/episodes/listened",
+                                      json={"ids": ids[:args.bulk_ids], "listened": listened})
+            response.raise_for_status()
+            samples.append(seconds)
+    results.append({"scenario": "listened", "case": "bulk_ids", "episodes": episodes,
+                    "ids": len(ids[:args.bulk_ids]), **summarize(samples)})
+    
+    # Marking a whole podcast cannot be undone exactly; run it once, last
+    response, seconds = timed(client.patch, "/api/episodes/listened",
+                              json={"podcast_id": podcast_id, "listened": True})
+    response.raise_for_status()
+    results.append({"scenario": "listened", "case": "bulk_podcast", "episodes": episodes,
+                    "updated": response.json()["updated"], **summarize([seconds])})
+    
+    return results
+
+
+def bench_database(episodes: int, args, workdir: Path) -> list:
+    """Run the scenarios that need a database of `episodes` episodes."""
+    db_path = prepared_database(episodes, args, workdir)
+    results = []
+    
+    if "pagination" in args.scenario or "listened" in args.scenario:
+        engine, Session = open_database(db_path)
+        saved = (db_module._EngineProxy.get(), db_module._SessionLocalProxy.get())
+        db_module._EngineProxy.set(engine)
+        db_module._SessionLocalProxy.set(Session)
+        try:
+            client = TestClient(app)
+            if "pagination" in args.scenario:
+                results.extend(bench_pagination(episodes, client, args))
+            if "listened" in args.scenario:
+                results.extend(bench_listened(episodes, client, Session, args))
+        finally:
+            db_module._EngineProxy.set(saved[0])
+            db_module._SessionLocalProxy.set(saved[1])
+            engine.dispose()
+    
+    # Last: it adds episodes to the database
+    if "ingest" in args.scenario:
+        results.append(bench_ingest(episodes, db_path, args))
+    
+    db_path.unlink()
+    return results
+
+
+def print_result(result: dict) -> None:
+    """One line per result."""
+    details = ", ".join(f"{key}={value}" for key, value in result.items() if key != "scenario")
+    print(f"{result['scenario']:<11} {details}", flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--feed-items", nargs="+", type=int, default=[10, 100, 1000, 10000],
+                        help="Feed sizes for the refresh scenario")
+    parser.add_argument("--episodes", nargs="+", type=int, default=[10000, 100000],
+                        help="Database sizes for the other scenarios (up to 1000000)")
+    parser.add_argument("--podcasts", type=int, default=20, help="Podcasts in the generated databases")
+    parser.add_argument("--refresh-podcasts", type=int, default=5, help="Feeds refreshed per run")
+    parser.add_argument("--ingest-items", type=int, default=1000, help="Episodes in the ingested batch")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--cursor-pages", type=int, default=50)
+    parser.add_argument("--bulk-ids", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20, help="Samples per latency measurement")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--db-dir", type=Path, help="Keep generated databases here between runs")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    args = parser.parse_args()
+    
+    logging.disable(logging.INFO)
+    results = []
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        
+        if "refresh" in args.scenario:
+            for items in args.feed_items:
+                result = bench_refresh(items, args, workdir)
+                print_result(result)
+                results.append(result)
+        
+        if set(args.scenario) - {"refresh"}:
+            for episodes in args.episodes:
+                for result in bench_database(episodes, args, workdir):
+                    print_result(result)
+                    results.append(result)
+    
+    if args.json:
+        args.json.write_text(json.dumps(
+            {"benchmark": "suite", "environment": environment(args), "results": results}, indent=2
+        ))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+"""
+Synthetic data for the benchmarks: RSS feeds, a local feed server and
+pre-filled databases. Everything is derived from a seed, so two runs with
+the same arguments work on identical data.
+"""
+
+import gzip
+import hashlib
+import random
+import threading
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from podcast_tracker.database import Base, Episode, Podcast, create_db_engine
+from podcast_tracker.database.stats import rebuild_podcast_stats
+
+WORDS = (
+    "inteligencia artificial modelos lenguaje agentes datos robots aprendizaje redes "
+    "entrevista noticias semana código abierto ética empresa investigación futuro"
+).split()
+
+BASE_DATE = datetime(2015, 1, 1)
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def description_html(rng: random.Random) -> str:
+    """Show notes like real feeds have: a few KB of HTML."""
+    paragraphs = "".join(f"<p>{_text(rng, rng.randint(30, 120))}</p>" for _ in range(rng.randint(2, 6)))
+    links = "".join(f'<li><a href="https://example.com/{rng.randint(1, 10**6)}">{_text(rng, 3)}</a></li>'
+                    for _ in range(rng.randint(1, 8)))
+    return f"{paragraphs}<ul>{links}</ul>"
+
+
+def feed_xml(feed_id: int, items: int, seed: int = 0) -> bytes:
+    """
+    Build an RSS 2.0 feed.
+    
+    Args:
+        feed_id: Feed number, part of every GUID
+        items: Number of <item> elements, newest first
+        seed: Random seed
+    
+    Returns:
+        The feed document
+    """
+    rng = random.Random(seed * 1_000_003 + feed_id)
+    entries = []
+    for i in reversed(range(items)):
+        pub_date = BASE_DATE + timedelta(days=i, minutes=feed_id)
+        entries.append(
+            f"<item><title>{escape(_text(rng, 6))} #{i}</title>"
+            f"<guid isPermaLink=\"false\">bench-{feed_id}-{i}</guid>"
+            f"<pubDate>{format_datetime(pub_date.replace(tzinfo=None)) + ' +0000'}</pubDate>"
+            f"<description>{escape(description_html(rng))}</description>"
+            f"<enclosure url=\"https://bench.example.com/{feed_id}/{i}.mp3\" type=\"audio/mpeg\" length=\"1\"/>"
+            f"<itunes:duration>{rng.randint(10, 120)}:00</itunes:duration></item>"
+        )
+    
+    return (
+        "<?xml version=\"1.0\" encoding=\"UTF-8\"?>"
+        "<rss version=\"2.0\" xmlns:itunes=\"http://www.itunes.com/dtds/podcast-1.0.dtd\"><channel>"
+        f"<title>Benchmark podcast {feed_id}</title><description>Synthetic feed</description>"
+        + "".join(entries)
+        + "</channel></rss>"
+    ).encode()
+
+
+class FeedServer:
+    """
+    Local stand-in for podcast hosts: serves /feeds/<id>.xml over HTTP/1.1
+    with ETags (answering If-None-Match with 304) and gzip when accepted.
+    
+    Usage:
+        with FeedServer({1: feed_xml(1, 100)}) as server:
+            server.url(1)
+    """
+    
+    def __init__(self, feeds: Dict[int, bytes]):
+        self.feeds = {
+            feed_id: (body, gzip.compress(body, 5), f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+            for feed_id, body in feeds.items()
+        }
+        self.requests = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+    
+    def url(self, feed_id: int) -> str:
+        """URL of a feed."""
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/feeds/{feed_id}.xml"
+    
+    def __enter__(self) -> "FeedServer":
+        server = self
+        
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            
+            def log_message(self, format, *args):
+                pass
+            
+            def do_GET(self):
+                server.requests += 1
+                try:
+                    feed_id = int(Path(self.path).stem)
+                    body, compressed, etag = server.feeds[feed_id]
+                except (ValueError, KeyError):
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml")
+                self.send_header("ETag", etag)
+                if "gzip" in self.headers.get("Accept-Encoding", ""):
+                    body = compressed
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def build_database(
+    path: Path,
+    episodes: int,
+    podcasts: int = 20,
+    listened_ratio: float = 0.5,
+    seed: int = 0,
+    batch_size: int = 20000
+) -> None:
+    """
+    Create a database with the current schema and `episodes` episodes
+    spread over `podcasts` podcasts, one episode every few hours.
+    
+    Rows go through the same bulk insert as feed ingestion, so the search
+    index triggers and summaries are filled as in production.
+    
+    Args:
+        path: Database file to create
+        episodes: Total number of episodes
+        podcasts: Number of podcasts
+        listened_ratio: Share of episodes marked as listened
+        seed: Random seed
+        batch_size: Rows per INSERT
+    """
+    rng = random.Random(seed)
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    with Session() as db:
+        db.add_all(
+            Podcast(name=f"Benchmark podcast {p}", rss_url=f"https://bench.example.com/{p}.xml")
+            for p in range(podcasts)
+        )
+        db.commit()
+        podcast_ids = [podcast.id for podcast in db.query(Podcast).order_by(Podcast.id)]
+        
+        # A few distinct descriptions, reused: generating HTML per row would dominate the build
+        descriptions = [description_html(rng) for _ in range(64)]
+        
+        for offset in range(0, episodes, batch_size):
+            rows = []
+            for i in range(offset, min(offset + batch_size, episodes)):
+                podcast_id = podcast_ids[i % podcasts]
+                rows.append({
+                    "podcast_id": podcast_id,
+                    "guid": f"bench-{podcast_id}-{i}",
+                    "title": f"{_text(rng, 6)} #{i}",
+                    "description": descriptions[i % len(descriptions)],
+                    "pub_date": BASE_DATE + timedelta(hours=3 * i),
+                    "duration": "60:00",
+                    "episode_url": f"https://bench.example.com/{podcast_id}/{i}.mp3",
+                    "listened": rng.random() < listened_ratio,
+                })
+            db.execute(insert(Episode), rows)
+            db.commit()
+        
+        rebuild_podcast_stats(db.connection())
+        db.commit()
+    
+    engine.dispose()
@@ -1,19 +1,46 @@
 """API package."""
 
 from .routes import router
+from .async_routes import async_router
+from .cache import ResponseCacheMiddleware, response_cache
+from .metrics import MetricsMiddleware
 from .schemas import (
     PodcastSchema,
     EpisodeSchema,
     EpisodeUpdate,
+    EpisodeBulkUpdate,
+    BulkUpdateResponse,
     EpisodeListResponse,
+    EpisodeSearchResult,
+    EpisodeSearchResponse,
+    CacheStatsResponse,
+    RefreshJobSchema,
     RefreshResponse,
+    FeedHealthSchema,
+    FeedHealthResponse,
+    OpmlImportResult,
+    OpmlImportResponse,
 )
 
 __all__ = [
     "router",
+    "async_router",
+    "ResponseCacheMiddleware",
+    "response_cache",
+    "MetricsMiddleware",
     "PodcastSchema",
     "EpisodeSchema",
     "EpisodeUpdate",
+    "EpisodeBulkUpdate",
+    "BulkUpdateResponse",
     "EpisodeListResponse",
+    "EpisodeSearchResult",
+    "EpisodeSearchResponse",
+    "CacheStatsResponse",
+    "RefreshJobSchema",
     "RefreshResponse",
+    "FeedHealthSchema",
+    "FeedHealthResponse",
+    "OpmlImportResult",
+    "OpmlImportResponse",
 ]
@@ -0,0 +1,84 @@
+"""Async FastAPI routes, used when DATABASE_URL selects an async driver.
+
+These serve the hot read/write endpoints on the event loop instead of the
+threadpool. The query logic is shared with the sync routes through the
+handlers module, which runs on the AsyncSession's sync facade.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from ..database import get_async_db_session
+from . import handlers
+from .schemas import (
+    PodcastSchema,
+    EpisodeSchema,
+    EpisodeUpdate,
+    EpisodeBulkUpdate,
+    BulkUpdateResponse,
+    EpisodeListResponse,
+    EpisodeSearchResponse,
+)
+
+async_router = APIRouter()
+
+
+@async_router.get("/api/podcasts", response_model=List[PodcastSchema])
+async def get_podcasts_async(db: AsyncSession = Depends(get_async_db_session)):
+    """Get all podcasts."""
+    return await db.run_sync(handlers.list_podcasts)
+
+
+@async_router.get("/api/episodes", response_model=EpisodeListResponse)
+async def get_episodes_async(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    podcast_id: int = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Count all pending episodes"),
+    compact: bool = Query(False, description="Return podcasts once in a side map"),
+    include: Optional[str] = Query(None, description="Comma-separated extra fields: description"),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Get episodes with pagination (see routes.get_episodes)."""
+    return await db.run_sync(
+        handlers.list_episodes, page, page_size, podcast_id, cursor, include_total, compact, include
+    )
+
+
+@async_router.get("/api/episodes/search", response_model=EpisodeSearchResponse)
+async def search_episodes_async(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    podcast_id: int = Query(None),
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Search episode titles and descriptions (see routes.search_episodes)."""
+    return await db.run_sync(handlers.search_episodes, q, page, page_size, podcast_id)
+
+
+@async_router.get("/api/episodes/{episode_id}", response_model=EpisodeSchema)
+async def get_episode_async(episode_id: int, db: AsyncSession = Depends(get_async_db_session)):
+    """Get a specific episode."""
+    return await db.run_sync(handlers.read_episode, episode_id)
+
+
+@async_router.patch("/api/episodes/{episode_id}/listened", response_model=EpisodeSchema)
+async def mark_episode_listened_async(
+    episode_id: int,
+    update: EpisodeUpdate,
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Mark an episode as listened or not listened."""
+    return await db.run_sync(handlers.update_episode_listened, episode_id, update)
+
+
+@async_router.patch("/api/episodes/listened", response_model=BulkUpdateResponse)
+async def mark_episodes_listened_async(
+    update: EpisodeBulkUpdate,
+    db: AsyncSession = Depends(get_async_db_session)
+):
+    """Mark many episodes as listened or not listened in one transaction."""
+    return await db.run_sync(handlers.bulk_update_listened, update)
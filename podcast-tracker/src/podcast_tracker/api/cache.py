@@ -0,0 +1,181 @@
+"""In-process cache for the JSON read endpoints, with strong ETags."""
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from starlette.middleware.base import BaseHTTPMiddleware
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Tuple
+import hashlib
+import threading
+import time
+
+from ..config import settings
+from ..database.versions import DataVersion, data_version
+from ..metrics import CounterFunc, registry
+
+# GET endpoints whose responses only change when the data is written
+CACHEABLE_PATHS = {"/api/podcasts", "/api/episodes", "/api/episodes/search"}
+
+
+class CachedResponse(NamedTuple):
+    """A stored response and the data version it was built from."""
+    version: Tuple[int, int]
+    etag: str
+    body: bytes
+    media_type: str
+    stored_at: float
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from the response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class ResponseCache:
+    """
+    LRU cache of response bodies keyed by path and query parameters.
+    
+    Entries are valid while the data version of their scope is unchanged,
+    which every process sharing the database bumps on commit, and for at
+    most ttl_seconds as a bound on writes made outside an ORM session.
+    """
+    
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300, versions: DataVersion = data_version):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.versions = versions
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+    
+    @staticmethod
+    def key(path: str, query_params) -> str:
+        """Build the cache key of a request; parameter order does not matter."""
+        return path + "?" + "&".join(f"{name}={value}" for name, value in sorted(query_params.multi_items()))
+    
+    def get(self, key: str, version: Tuple[int, int]) -> Optional[CachedResponse]:
+        """
+        Get a fresh entry and count the hit or miss.
+        
+        Args:
+            key: Cache key
+            version: Current data version of the request's scope
+        
+        Returns:
+            The cached response, or None if missing or stale
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                entry.version != version or time.monotonic() - entry.stored_at > self.ttl_seconds
+            ):
+                del self._entries[key]
+                entry = None
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+    
+    def put(self, key: str, version: Tuple[int, int], body: bytes, media_type: str) -> CachedResponse:
+        """Store a response built from the given data version."""
+        entry = CachedResponse(version, make_etag(body), body, media_type, time.monotonic())
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+    
+    def record_not_modified(self) -> None:
+        """Count a 304 response."""
+        with self._lock:
+            self.not_modified += 1
+    
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.not_modified = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Get the hit/miss counters and the number of entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "entries": len(self._entries),
+            }
+
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    ttl_seconds=settings.response_cache_ttl_seconds
+)
+registry.register(CounterFunc(
+    "podcast_tracker_response_cache_requests",
+    "Cacheable requests by result (hits, misses, not_modified).",
+    "result",
+    lambda: {name: value for name, value in response_cache.stats().items() if name != "entries"}
+))
+
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Serve cacheable GET requests from the response cache.
+    
+    Hits, including 304 answers to If-None-Match, never reach the route or
+    the database. Responses carry a strong ETag and Cache-Control: no-cache,
+    so browsers revalidate on every poll.
+    """
+    
+    def __init__(self, app, cache: ResponseCache = response_cache):
+        super().__init__(app)
+        self.cache = cache
+    
+    async def dispatch(self, request: Request, call_next):
+        if request.method != "GET" or request.url.path not in CACHEABLE_PATHS:
+            return await call_next(request)
+        
+        key = self.cache.key(request.url.path, request.query_params)
+        # The routes treat podcast_id=0 as no filter
+        podcast_id = request.query_params.get("podcast_id", "")
+        scope = int(podcast_id) if podcast_id.isdigit() and int(podcast_id) > 0 else None
+        
+        # Read the version first: a write during the request leaves the entry stale
+        version = await run_in_threadpool(self.cache.versions.current, scope)
+        entry = self.cache.get(key, version)
+        
+        if entry is None:
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            entry = self.cache.put(key, version, body, response.headers.get("content-type", "application/json"))
+        
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.cache.record_not_modified()
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=entry.body, media_type=entry.media_type, headers=headers)
@@ -0,0 +1,54 @@
+"""Server-Sent Events stream of change events."""
+
+import asyncio
+from typing import AsyncIterator, List, Optional
+
+from ..events import Event, EventBroadcaster, Subscription
+
+# Milliseconds browsers wait before reconnecting a dropped stream
+RETRY_MS = 3000
+
+
+def parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    """Parse a Last-Event-ID; anything malformed counts as a fresh connection."""
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+async def event_stream(
+    broadcaster: EventBroadcaster,
+    subscription: Subscription,
+    backlog: List[Event],
+    heartbeat: float
+) -> AsyncIterator[str]:
+    """
+    Yield SSE messages: the backlog, then live events as they are published.
+    
+    A comment line is sent after `heartbeat` idle seconds so proxies keep the
+    connection open. The stream ends when the client falls too far behind;
+    its browser reconnects with the last id it received and resumes.
+    
+    Args:
+        broadcaster: Broadcaster the subscription belongs to
+        subscription: Subscription of this client
+        backlog: Events missed since the client's Last-Event-ID
+        heartbeat: Seconds between keep-alive comments
+    """
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        for event in backlog:
+            yield event.encode()
+        
+        while not subscription.lagged:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if subscription.lagged:
+                break
+            yield event.encode()
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,246 @@
+"""Request handling shared by the sync and async API routes.
+
+Each function takes a synchronous Session and returns fully built schemas,
+so it can run directly in a sync route or through AsyncSession.run_sync in
+an async one without triggering lazy loads during serialization.
+"""
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload, noload, undefer
+from datetime import datetime
+from dataclasses import asdict
+from typing import BinaryIO, List, Optional, Set, Tuple
+import base64
+import math
+
+from ..database import Podcast, Episode, FeedState
+from ..services import PodcastService, OpmlError, feed_status, iter_opml_feeds, render_opml, FEED_STATUSES
+from ..services.podcast_service import EXISTING, FAILED, IMPORTED
+from .schemas import (
+    PodcastSchema,
+    EpisodeSchema,
+    EpisodeUpdate,
+    EpisodeBulkUpdate,
+    BulkUpdateResponse,
+    EpisodeListResponse,
+    EpisodeSearchResult,
+    EpisodeSearchResponse,
+    FeedHealthSchema,
+    FeedHealthResponse,
+    OpmlImportResult,
+    OpmlImportResponse,
+)
+
+
+# Deferred episode columns a list request can ask for with `include`
+INCLUDABLE_FIELDS = {"description"}
+
+
+def parse_include(include: Optional[str]) -> Set[str]:
+    """Parse a comma-separated `include` parameter."""
+    fields = {field.strip() for field in (include or "").split(",") if field.strip()}
+    unknown = fields - INCLUDABLE_FIELDS
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown include field: {', '.join(sorted(unknown))}")
+    return fields
+
+
+def encode_cursor(episode: Episode) -> str:
+    """Encode the (pub_date, id) position of an episode as an opaque cursor."""
+    raw = f"{episode.pub_date.isoformat()}|{episode.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        pub_date, episode_id = base64.urlsafe_b64decode(padded).decode().rsplit("|", 1)
+        return datetime.fromisoformat(pub_date), int(episode_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def list_podcasts(db: Session) -> List[PodcastSchema]:
+    """Get all podcasts, with their descriptions."""
+    podcasts = db.query(Podcast).options(undefer(Podcast.description)).all()
+    return [PodcastSchema.model_validate(podcast) for podcast in podcasts]
+
+
+def list_episodes(
+    db: Session,
+    page: int,
+    page_size: int,
+    podcast_id: Optional[int],
+    cursor: Optional[str],
+    include_total: bool,
+    compact: bool,
+    include: Optional[str] = None
+) -> EpisodeListResponse:
+    """Get a page of pending episodes (see routes.get_episodes)."""
+    service = PodcastService(db)
+    fields = parse_include(include)
+    
+    # Get total count
+    total = None
+    total_pages = None
+    if include_total:
+        total = service.count_pending_episodes(podcast_id)
+        total_pages = math.ceil(total / page_size)
+    
+    # Get paginated results, one extra row tells whether a next page exists
+    if cursor:
+        query = service.pending_episodes_query(podcast_id, after=decode_cursor(cursor))
+    else:
+        query = service.pending_episodes_query(podcast_id).offset((page - 1) * page_size)
+    
+    # Load the podcast relationship in the same query, or not at all
+    loader = noload(Episode.podcast) if compact else joinedload(Episode.podcast)
+    query = query.options(loader)
+    if "description" in fields:
+        query = query.options(undefer(Episode.description))
+    episodes = query.limit(page_size + 1).all()
+    
+    next_cursor = None
+    if len(episodes) > page_size:
+        episodes = episodes[:page_size]
+        next_cursor = encode_cursor(episodes[-1])
+    
+    podcasts = None
+    if compact:
+        podcast_ids = {episode.podcast_id for episode in episodes}
+        podcasts = {
+            podcast.id: podcast
+            for podcast in db.query(Podcast).filter(Podcast.id.in_(podcast_ids))
+        } if podcast_ids else {}
+    
+    return EpisodeListResponse(
+        episodes=episodes,
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+        next_cursor=next_cursor,
+        podcasts=podcasts
+    )
+
+
+def search_episodes(
+    db: Session,
+    q: str,
+    page: int,
+    page_size: int,
+    podcast_id: Optional[int]
+) -> EpisodeSearchResponse:
+    """Search episodes (see routes.search_episodes)."""
+    service = PodcastService(db)
+    
+    # One extra hit tells whether a next page exists
+    results = service.search_episodes(q, page_size + 1, (page - 1) * page_size, podcast_id)
+    
+    episodes = [
+        EpisodeSearchResult(
+            **EpisodeSchema.model_validate(episode).model_dump(),
+            rank=hit.rank,
+            snippet=hit.snippet
+        )
+        for episode, hit in results[:page_size]
+    ]
+    
+    return EpisodeSearchResponse(
+        episodes=episodes,
+        query=q,
+        page=page,
+        page_size=page_size,
+        has_more=len(results) > page_size
+    )
+
+
+def read_episode(db: Session, episode_id: int) -> EpisodeSchema:
+    """Get a specific episode, with its description."""
+    episode = db.query(Episode).options(undefer(Episode.description)).filter(Episode.id == episode_id).first()
+    
+    if not episode:
+        raise HTTPException(status_code=404, detail="Episode not found")
+    
+    return EpisodeSchema.model_validate(episode)
+
+
+def update_episode_listened(db: Session, episode_id: int, update: EpisodeUpdate) -> EpisodeSchema:
+    """Mark an episode as listened or not listened."""
+    service = PodcastService(db)
+    
+    episode = db.query(Episode).filter(Episode.id == episode_id).first()
+    if not episode:
+        raise HTTPException(status_code=404, detail="Episode not found")
+    
+    if update.listened is not None:
+        episode = service.set_listened(episode, update.listened)
+    
+    return EpisodeSchema.model_validate(episode)
+
+
+def bulk_update_listened(db: Session, update: EpisodeBulkUpdate) -> BulkUpdateResponse:
+    """Mark many episodes as listened or not listened."""
+    service = PodcastService(db)
+    
+    updated = service.set_listened_bulk(
+        update.listened,
+        episode_ids=update.ids,
+        podcast_id=update.podcast_id,
+        before=update.before
+    )
+    
+    return BulkUpdateResponse(updated=updated)
+
+
+def feed_health(db: Session) -> FeedHealthResponse:
+    """Get the fetch health of every feed, most failures first."""
+    now = datetime.utcnow()
+    rows = (
+        db.query(Podcast.id, Podcast.name, Podcast.rss_url, FeedState)
+        .outerjoin(FeedState, FeedState.podcast_id == Podcast.id)
+        .order_by(func.coalesce(FeedState.consecutive_failures, 0).desc(), Podcast.name)
+        .all()
+    )
+    
+    feeds = []
+    counts = dict.fromkeys(FEED_STATUSES, 0)
+    for podcast_id, name, rss_url, state in rows:
+        status = feed_status(state, now)
+        counts[status] += 1
+        
+        health = FeedHealthSchema(podcast_id=podcast_id, name=name, rss_url=rss_url, status=status)
+        if state is not None:
+            health.consecutive_failures = state.consecutive_failures or 0
+            health.last_error = state.last_error
+            health.last_error_at = state.last_error_at
+            health.last_success_at = state.last_success_at
+            health.retry_after = state.retry_after
+            health.next_check_at = state.next_check_at
+        feeds.append(health)
+    
+    return FeedHealthResponse(feeds=feeds, counts=counts)
+
+
+def import_opml(db: Session, source: BinaryIO) -> OpmlImportResponse:
+    """Import the feeds of an OPML document, reporting the outcome of each."""
+    try:
+        results = PodcastService(db).import_podcasts(iter_opml_feeds(source))
+    except OpmlError as e:
+        # Feeds listed before the error were imported; importing again skips them
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    statuses = [result.status for result in results]
+    return OpmlImportResponse(
+        imported=statuses.count(IMPORTED),
+        existing=statuses.count(EXISTING),
+        failed=statuses.count(FAILED),
+        results=[OpmlImportResult(**asdict(result)) for result in results]
+    )
+
+
+def export_opml(db: Session) -> bytes:
+    """Get every podcast feed as an OPML document."""
+    return render_opml(db.query(Podcast).order_by(Podcast.name))
@@ -0,0 +1,46 @@
+"""Request latency metrics for the API."""
+
+import time
+
+from ..metrics import http_request_seconds
+
+
+class MetricsMiddleware:
+    """
+    Record the latency of every HTTP request by method, route and status.
+    
+    A plain ASGI middleware, so responses are passed through untouched.
+    Requests are labelled with the route template (/api/episodes/{episode_id}),
+    never the raw path, except for fixed paths answered before routing (cache
+    hits, static files); other unmatched requests share one label.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                label = route.path
+            elif status < 400:
+                label = scope["path"]
+            else:
+                label = "unmatched"
+            
+            http_request_seconds.labels(scope["method"], label, status).observe(time.perf_counter() - start)
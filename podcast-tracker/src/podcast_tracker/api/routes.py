@@ -1,19 +1,34 @@
 """FastAPI routes for the Podcast Tracker API."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 import logging
-import math
+import tempfile
 
-from ..database import get_db_session, Podcast, Episode
-from ..services import PodcastService
+from ..config import settings
+from ..database import get_db_session
+from ..events import broadcaster
+from ..metrics import CONTENT_TYPE, registry
+from ..services import refresh_jobs
+from . import handlers
+from .cache import response_cache
+from .events import event_stream, parse_last_event_id
 from .schemas import (
     PodcastSchema,
     EpisodeSchema,
     EpisodeUpdate,
+    EpisodeBulkUpdate,
+    BulkUpdateResponse,
     EpisodeListResponse,
+    EpisodeSearchResponse,
+    CacheStatsResponse,
+    RefreshJobSchema,
     RefreshResponse,
+    FeedHealthResponse,
+    OpmlImportResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -24,8 +39,7 @@ router = APIRouter()
 @router.get("/api/podcasts", response_model=List[PodcastSchema])
 def get_podcasts(db: Session = Depends(get_db_session)):
     """Get all podcasts."""
-    podcasts = db.query(Podcast).all()
-    return podcasts
+    return handlers.list_podcasts(db)
 
 
 @router.get("/api/episodes", response_model=EpisodeListResponse)
@@ -33,50 +47,50 @@ def get_episodes(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     podcast_id: int = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    include_total: bool = Query(True, description="Count all pending episodes"),
+    compact: bool = Query(False, description="Return podcasts once in a side map"),
+    include: Optional[str] = Query(None, description="Comma-separated extra fields: description"),
     db: Session = Depends(get_db_session)
 ):
-    """Get episodes with pagination."""
-    query = db.query(Episode).filter(Episode.listened == False)
+    """
+    Get episodes with pagination.
     
-    if podcast_id:
-        query = query.filter(Episode.podcast_id == podcast_id)
+    Pages are addressed either by number (OFFSET) or, for constant-time deep
+    scrolling, by the opaque next_cursor returned with the previous page.
+    When a cursor is given, page is only echoed back.
     
-    # Get total count
-    total = query.count()
+    In compact mode episodes do not embed their podcast; the podcasts used
+    on the page are returned once in `podcasts`, keyed by id.
     
-    # Get paginated results
-    episodes = (
-        query
-        .order_by(Episode.pub_date.desc())
-        .limit(page_size)
-        .offset((page - 1) * page_size)
-        .all()
-    )
-    
-    # Load podcast relationship
-    for episode in episodes:
-        _ = episode.podcast  # Trigger lazy loading
-    
-    total_pages = math.ceil(total / page_size)
+    Episodes carry a plain-text `summary`; the full HTML `description` is
+    only read and returned with include=description.
+    """
+    return handlers.list_episodes(db, page, page_size, podcast_id, cursor, include_total, compact, include)
+
+
+@router.get("/api/episodes/search", response_model=EpisodeSearchResponse)
+def search_episodes(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    podcast_id: int = Query(None),
+    db: Session = Depends(get_db_session)
+):
+    """
+    Search episode titles and descriptions, listened or not.
     
-    return EpisodeListResponse(
-        episodes=episodes,
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages
-    )
+    Every word must match; a word ending in * matches as a prefix.
+    Results are ranked with bm25, title matches first; `snippet` is escaped
+    HTML with the matches wrapped in <mark>.
+    """
+    return handlers.search_episodes(db, q, page, page_size, podcast_id)
 
 
 @router.get("/api/episodes/{episode_id}", response_model=EpisodeSchema)
 def get_episode(episode_id: int, db: Session = Depends(get_db_session)):
     """Get a specific episode."""
-    episode = db.query(Episode).filter(Episode.id == episode_id).first()
-    
-    if not episode:
-        raise HTTPException(status_code=404, detail="Episode not found")
-    
-    return episode
+    return handlers.read_episode(db, episode_id)
 
 
 @router.patch("/api/episodes/{episode_id}/listened", response_model=EpisodeSchema)
@@ -86,29 +100,132 @@ def mark_episode_listened(
     db: Session = Depends(get_db_session)
 ):
     """Mark an episode as listened or not listened."""
-    service = PodcastService(db)
+    return handlers.update_episode_listened(db, episode_id, update)
+
+
+@router.patch("/api/episodes/listened", response_model=BulkUpdateResponse)
+def mark_episodes_listened(update: EpisodeBulkUpdate, db: Session = Depends(get_db_session)):
+    """
+    Mark many episodes as listened or not listened in one transaction.
+    
+    Select episodes either by `ids`, or by `podcast_id` and/or `before`
+    (publication date). Returns the number of episodes whose state changed.
+    """
+    return handlers.bulk_update_listened(db, update)
+
+
+@router.post("/api/podcasts/refresh", response_model=RefreshResponse, status_code=202)
+def refresh_podcasts():
+    """
+    Manually trigger a refresh of all podcasts.
     
-    episode = db.query(Episode).filter(Episode.id == episode_id).first()
-    if not episode:
-        raise HTTPException(status_code=404, detail="Episode not found")
+    The refresh runs in the background; poll GET /api/podcasts/refresh/{job_id}
+    for its progress. While a manual refresh is in flight, no new one is
+    started and its job is returned instead. Every podcast is queued in the
+    feed job queue and the job processes the queued checks itself; a feed
+    already being checked by a refresh worker is waited for, not checked
+    twice.
+    """
+    job, created = refresh_jobs.submit()
     
-    if update.listened is not None:
-        episode.listened = update.listened
-        db.commit()
-        db.refresh(episode)
+    if created:
+        logger.info(f"Manual refresh triggered, job {job.id}")
+        message = "Refresh started."
+    else:
+        message = "A refresh is already in progress."
     
-    return episode
+    return RefreshResponse(message=message, job=RefreshJobSchema(**job.to_dict()))
 
 
-@router.post("/api/podcasts/refresh", response_model=RefreshResponse)
-def refresh_podcasts(db: Session = Depends(get_db_session)):
-    """Manually trigger a refresh of all podcasts."""
-    logger.info("Manual refresh triggered")
+@router.get("/api/podcasts/refresh/{job_id}", response_model=RefreshJobSchema)
+def get_refresh_job(job_id: str):
+    """Get the status and progress of a refresh job, whichever process runs it."""
+    job = refresh_jobs.get(job_id)
     
-    service = PodcastService(db)
-    new_episodes = service.refresh_all_podcasts()
+    if not job:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
     
-    return RefreshResponse(
-        message=f"Refresh complete. Found {new_episodes} new episodes.",
-        new_episodes=new_episodes
+    return RefreshJobSchema(**job.to_dict())
+
+
+@router.get("/api/podcasts/opml")
+def export_opml(db: Session = Depends(get_db_session)):
+    """Export every podcast feed as an OPML subscription list."""
+    return Response(
+        content=handlers.export_opml(db),
+        media_type="text/x-opml",
+        headers={"Content-Disposition": 'attachment; filename="podcasts.opml"'}
     )
+
+
+@router.post("/api/podcasts/opml", response_model=OpmlImportResponse)
+async def import_opml(request: Request, db: Session = Depends(get_db_session)):
+    """
+    Import the podcasts of an OPML subscription list sent as the request body.
+    
+    The feeds are fetched in parallel (REFRESH_CONCURRENCY, at most
+    REFRESH_PER_HOST_LIMIT per host) and stored with their episodes in
+    batches. Feeds already tracked are reported as `exists`; feeds that
+    cannot be fetched or parsed as `failed`, with the error.
+    """
+    # Spool the body instead of holding it, then parse it as it is read back
+    with tempfile.SpooledTemporaryFile(max_size=1024 * 1024) as source:
+        size = 0
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.opml_max_bytes:
+                raise HTTPException(status_code=413, detail="OPML document too large")
+            source.write(chunk)
+        source.seek(0)
+        
+        return await run_in_threadpool(handlers.import_opml, db, source)
+
+
+@router.get("/api/feeds/health", response_model=FeedHealthResponse)
+def get_feed_health(db: Session = Depends(get_db_session)):
+    """
+    Get the fetch health of every feed.
+    
+    A feed is `ok` after a successful fetch and `failing` after failed ones,
+    retried after an exponential backoff (`retry_after`). After
+    FEED_FAILURE_THRESHOLD failures in a row its circuit is `open` and
+    refreshes skip it until retry_after; then it is `half_open` and the next
+    refresh tries it again. `unknown` feeds have not been fetched yet.
+    """
+    return handlers.feed_health(db)
+
+
+@router.get("/api/events", response_class=StreamingResponse)
+async def stream_events(
+    last_event_id: Optional[str] = Header(None),
+    since: Optional[str] = Query(None, description="Last event id, for clients that cannot send Last-Event-ID")
+):
+    """
+    Stream change events as Server-Sent Events.
+    
+    `episodes` events carry the podcast and number of new episodes,
+    `listened` events the episodes whose listened state changed. A client
+    reconnecting with the id of the last event it received (Last-Event-ID,
+    as browsers do) gets the events it missed first; if they are no longer
+    available it gets a `reset` event and should reload everything. Events
+    and their ids are shared by every server process, wherever the change
+    was made.
+    """
+    subscription, backlog = broadcaster.subscribe(parse_last_event_id(last_event_id or since))
+    return StreamingResponse(
+        event_stream(broadcaster, subscription, backlog, settings.events_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/api/cache/stats", response_model=CacheStatsResponse)
+def get_cache_stats():
+    """Get the response cache hit/miss counters."""
+    return CacheStatsResponse(**response_cache.stats())
+
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics():
+    """Get ingest, scheduler and API metrics in the Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
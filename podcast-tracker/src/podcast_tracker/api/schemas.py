@@ -1,8 +1,33 @@
 """Pydantic schemas for API validation."""
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl, model_validator
+from sqlalchemy import inspect
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+
+class LoadedColumnsMixin(BaseModel):
+    """Build a response from an ORM object without loading its deferred columns."""
+    
+    @model_validator(mode="before")
+    @classmethod
+    def skip_unloaded_deferred(cls, data: Any) -> Any:
+        """Read deferred columns that were not loaded as None."""
+        state = inspect(data, raiseerr=False)
+        if state is None or not hasattr(state, "unloaded"):
+            return data
+        
+        skipped = {
+            prop.key for prop in state.mapper.column_attrs if prop.deferred
+        } & state.unloaded
+        if not skipped:
+            return data
+        
+        return {
+            name: None if name in skipped else getattr(data, name)
+            for name in cls.model_fields
+            if name in skipped or hasattr(data, name)
+        }
 
 
 class PodcastBase(BaseModel):
@@ -19,8 +44,8 @@ class PodcastCreate(PodcastBase):
     pass
 
 
-class PodcastSchema(PodcastBase):
-    """Schema for podcast response."""
+class PodcastSchema(PodcastBase, LoadedColumnsMixin):
+    """Schema for podcast response; description is null unless loaded."""
     id: int
     created_at: datetime
     
@@ -44,10 +69,11 @@ class EpisodeCreate(EpisodeBase):
     podcast_id: int
 
 
-class EpisodeSchema(EpisodeBase):
-    """Schema for episode response."""
+class EpisodeSchema(EpisodeBase, LoadedColumnsMixin):
+    """Schema for episode response; description is null unless requested."""
     id: int
     podcast_id: int
+    summary: Optional[str] = None
     created_at: datetime
     podcast: Optional[PodcastSchema] = None
     
@@ -60,16 +86,119 @@ class EpisodeUpdate(BaseModel):
     listened: Optional[bool] = None
 
 
+class EpisodeBulkUpdate(BaseModel):
+    """Schema for updating many episodes, selected by ids or by a filter."""
+    listened: bool = True
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    podcast_id: Optional[int] = None
+    before: Optional[datetime] = None
+    
+    @model_validator(mode="after")
+    def check_selection(self):
+        """Require either ids or a filter, not both."""
+        has_filter = self.podcast_id is not None or self.before is not None
+        if self.ids is not None and has_filter:
+            raise ValueError("Give either ids or podcast_id/before, not both")
+        if self.ids is None and not has_filter:
+            raise ValueError("Give ids, or podcast_id and/or before")
+        return self
+
+
+class BulkUpdateResponse(BaseModel):
+    """Schema for bulk update response."""
+    updated: int
+
+
 class EpisodeListResponse(BaseModel):
     """Schema for paginated episode list."""
     episodes: list[EpisodeSchema]
-    total: int
+    total: Optional[int] = None
+    page: int
+    page_size: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    podcasts: Optional[Dict[int, PodcastSchema]] = None
+
+
+class EpisodeSearchResult(EpisodeSchema):
+    """Schema for an episode matching a search."""
+    rank: float
+    snippet: Optional[str] = None
+
+
+class EpisodeSearchResponse(BaseModel):
+    """Schema for paginated search results."""
+    episodes: list[EpisodeSearchResult]
+    query: str
     page: int
     page_size: int
-    total_pages: int
+    has_more: bool = False
+
+
+class CacheStatsResponse(BaseModel):
+    """Schema for response cache counters."""
+    hits: int
+    misses: int
+    not_modified: int
+    entries: int
+
+
+class RefreshJobSchema(BaseModel):
+    """Schema for a background refresh job and its progress."""
+    id: str
+    kind: str
+    status: str
+    total: int
+    checked: int
+    new_episodes: int
+    not_modified: int
+    failed: int
+    skipped: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
 
 
 class RefreshResponse(BaseModel):
     """Schema for refresh response."""
     message: str
-    new_episodes: int
+    job: RefreshJobSchema
+
+
+class FeedHealthSchema(BaseModel):
+    """Schema for the fetch health of a podcast feed."""
+    podcast_id: int
+    name: str
+    rss_url: str
+    status: str
+    consecutive_failures: int = 0
+    last_error: Optional[str] = None
+    last_error_at: Optional[datetime] = None
+    last_success_at: Optional[datetime] = None
+    retry_after: Optional[datetime] = None
+    next_check_at: Optional[datetime] = None
+
+
+class FeedHealthResponse(BaseModel):
+    """Schema for the health of every feed, with the number of feeds by status."""
+    feeds: List[FeedHealthSchema]
+    counts: Dict[str, int]
+
+
+class OpmlImportResult(BaseModel):
+    """Schema for the outcome of importing one feed."""
+    name: str
+    rss_url: str
+    status: str
+    podcast_id: Optional[int] = None
+    episodes: int = 0
+    error: Optional[str] = None
+
+
+class OpmlImportResponse(BaseModel):
+    """Schema for an OPML import: per-feed outcomes and their totals."""
+    imported: int
+    existing: int
+    failed: int
+    results: List[OpmlImportResult]
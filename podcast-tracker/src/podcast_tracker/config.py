@@ -9,9 +9,75 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = "sqlite:///./podcast_tracker.db"
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
     
-    # Scheduler
+    # SQLite tuning, applied to every new connection
+    sqlite_tuning: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 65536
+    sqlite_mmap_size: int = 268435456
+    sqlite_temp_store: str = "MEMORY"
+    
+    # Scheduler: each feed is polled at an interval learned from its
+    # publication cadence; check_interval_hours is used until it is known
     check_interval_hours: int = 1
+    scheduler_tick_minutes: int = 5
+    refresh_checks_per_cadence: int = 48
+    refresh_min_interval_minutes: int = 30
+    refresh_max_interval_hours: int = 24
+    refresh_jitter: float = 0.1
+    
+    # Refresh
+    refresh_concurrency: int = 8
+    refresh_per_host_limit: int = 2
+    
+    # Feed job queue: the scheduler queues the due feeds and refresh workers
+    # (refresh_workers threads in the web server, plus any `podcast-tracker
+    # worker` process) claim them under a lease renewed while they work. A job
+    # whose lease expires is claimed again, at most job_max_attempts times
+    refresh_workers: int = 1
+    job_lease_seconds: int = 300
+    job_poll_seconds: float = 5.0
+    job_max_attempts: int = 3
+    
+    # Leader election: with several web server processes only the holder of
+    # the scheduler lease seeds podcasts and runs the scheduler; the lease is
+    # renewed every third of leader_lease_seconds, and another process takes
+    # over once it expires
+    leader_lease_seconds: int = 30
+    
+    # Failing feeds: retried after an exponential backoff; after
+    # feed_failure_threshold consecutive failures the circuit opens and the
+    # feed is skipped by every refresh until its backoff expires
+    feed_failure_threshold: int = 5
+    feed_backoff_base_minutes: int = 15
+    feed_backoff_max_hours: int = 24
+    
+    # Feed HTTP client (refresh_per_host_limit also caps connections per host)
+    http_connect_timeout: float = 10.0
+    http_read_timeout: float = 30.0
+    http_total_timeout: float = 120.0
+    http_max_body_bytes: int = 20 * 1024 * 1024
+    http_max_connections: int = 20
+    
+    # Largest OPML document accepted by POST /api/podcasts/opml
+    opml_max_bytes: int = 5 * 1024 * 1024
+    
+    # Response cache for the read endpoints
+    response_cache_enabled: bool = True
+    response_cache_max_entries: int = 512
+    response_cache_ttl_seconds: int = 300
+    
+    # Prometheus metrics at /metrics
+    metrics_enabled: bool = True
+    
+    # Server-Sent Events at /api/events
+    events_history: int = 1000
+    events_heartbeat_seconds: float = 15.0
+    events_poll_seconds: float = 1.0
     
     # Logging
     log_level: str = "INFO"
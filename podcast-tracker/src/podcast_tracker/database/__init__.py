@@ -1,15 +1,51 @@
 """Database package."""
 
-from .models import Base, Podcast, Episode
-from .database import engine, SessionLocal, init_db, get_db, get_db_session
+from .models import Base, Podcast, Episode, FeedState, PodcastStats, FeedJob, LeaderLease, DataVersionCounter, ChangeEvent, RefreshJobState
+from .database import (
+    engine,
+    SessionLocal,
+    create_db_engine,
+    create_async_db_engine,
+    is_async_database_url,
+    init_db,
+    get_db,
+    get_db_session,
+    get_async_db_session,
+    get_schema_version,
+)
+from .migrations import run_migrations
+from .stats import apply_stats_delta, rebuild_podcast_stats, find_stats_drift
+from .search import SearchHit, search_episodes, rebuild_search_index
+from .versions import DataVersion, data_version
 
 __all__ = [
     "Base",
     "Podcast",
     "Episode",
+    "FeedState",
+    "PodcastStats",
+    "FeedJob",
+    "LeaderLease",
+    "DataVersionCounter",
+    "ChangeEvent",
+    "RefreshJobState",
     "engine",
+    "create_db_engine",
+    "create_async_db_engine",
+    "is_async_database_url",
     "SessionLocal",
     "init_db",
     "get_db",
     "get_db_session",
+    "get_async_db_session",
+    "get_schema_version",
+    "run_migrations",
+    "apply_stats_delta",
+    "rebuild_podcast_stats",
+    "find_stats_drift",
+    "SearchHit",
+    "search_episodes",
+    "rebuild_search_index",
+    "DataVersion",
+    "data_version",
 ]
@@ -1,25 +1,151 @@
 """Database configuration and session management."""
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator, List
 import logging
 
 from ..config import settings
 from .models import Base
+from .migrations import run_migrations, get_applied_versions, schema_lock
 
 logger = logging.getLogger(__name__)
 
+def sqlite_pragmas() -> List[str]:
+    """
+    PRAGMA statements of the tuned SQLite profile.
+    
+    WAL lets API readers proceed while the scheduler commits a refresh, and
+    synchronous=NORMAL is durable under WAL except for the last commits on
+    power loss.
+    """
+    return [
+        f"journal_mode={settings.sqlite_journal_mode}",
+        f"synchronous={settings.sqlite_synchronous}",
+        f"busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"cache_size=-{settings.sqlite_cache_size_kib}",
+        f"mmap_size={settings.sqlite_mmap_size}",
+        f"temp_store={settings.sqlite_temp_store}",
+    ]
+
+
+# DBAPI drivers that only work with SQLAlchemy's asyncio extension
+ASYNC_DRIVERS = {"aiosqlite", "asyncpg", "aiomysql", "asyncmy", "psycopg_async"}
+
+
+def is_async_database_url(database_url: str) -> bool:
+    """Check whether a database URL selects an async driver (e.g. sqlite+aiosqlite)."""
+    return make_url(database_url).get_driver_name() in ASYNC_DRIVERS
+
+
+def sync_database_url(database_url: str) -> str:
+    """
+    Get the synchronous equivalent of a database URL.
+    
+    The scheduler and the service layer always use a sync engine; with an
+    async URL they use the backend's default sync driver on the same database.
+    """
+    if not is_async_database_url(database_url):
+        return database_url
+    
+    url = make_url(database_url)
+    return url.set(drivername=url.get_backend_name()).render_as_string(hide_password=False)
+
+
+def _engine_options(database_url: str, kwargs: dict) -> bool:
+    """Fill in pool options for a URL; returns whether the URL is SQLite."""
+    url = make_url(database_url)
+    is_sqlite = url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and url.database in (None, "", ":memory:")
+    
+    if not in_memory:
+        kwargs.setdefault("pool_size", settings.database_pool_size)
+        kwargs.setdefault("max_overflow", settings.database_max_overflow)
+    
+    return is_sqlite
+
+
+def _apply_sqlite_profile(sync_engine: Engine) -> None:
+    """Run sqlite_pragmas() on every new connection of an engine."""
+    pragmas = sqlite_pragmas()
+    
+    @event.listens_for(sync_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(f"PRAGMA {pragma}")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(database_url: str, tuned: bool = True, **kwargs) -> Engine:
+    """
+    Create an engine, applying the tuned profile to SQLite connections.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        tuned: Apply sqlite_pragmas() on every new SQLite connection
+        **kwargs: Extra create_engine arguments
+    
+    Returns:
+        SQLAlchemy engine
+    """
+    is_sqlite = _engine_options(database_url, kwargs)
+    if is_sqlite:
+        kwargs.setdefault("connect_args", {"check_same_thread": False})
+    
+    new_engine = create_engine(database_url, echo=False, **kwargs)
+    
+    if is_sqlite and tuned:
+        _apply_sqlite_profile(new_engine)
+    
+    return new_engine
+
+
+def create_async_db_engine(database_url: str, tuned: bool = True, **kwargs) -> AsyncEngine:
+    """
+    Create an async engine, applying the tuned profile to SQLite connections.
+    
+    Args:
+        database_url: SQLAlchemy database URL with an async driver
+        tuned: Apply sqlite_pragmas() on every new SQLite connection
+        **kwargs: Extra create_async_engine arguments
+    
+    Returns:
+        SQLAlchemy async engine
+    """
+    is_sqlite = _engine_options(database_url, kwargs)
+    if is_sqlite and "pool_size" in kwargs:
+        # aiosqlite defaults to NullPool, reopening the file on every checkout
+        kwargs.setdefault("poolclass", AsyncAdaptedQueuePool)
+    
+    new_engine = create_async_engine(database_url, echo=False, **kwargs)
+    
+    if is_sqlite and tuned:
+        _apply_sqlite_profile(new_engine.sync_engine)
+    
+    return new_engine
+
+
 # Create engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {},
-    echo=False
+engine = create_db_engine(sync_database_url(settings.database_url), tuned=settings.sqlite_tuning)
+
+# Create async engine, only when DATABASE_URL selects an async driver
+async_engine = (
+    create_async_db_engine(settings.database_url, tuned=settings.sqlite_tuning)
+    if is_async_database_url(settings.database_url) else None
 )
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = (
+    async_sessionmaker(autoflush=False, bind=async_engine) if async_engine is not None else None
+)
 
 
 class _EngineProxy:
@@ -52,13 +178,44 @@ class _SessionLocalProxy:
         cls._sessionlocal = new_sessionlocal
 
 
+class _AsyncSessionLocalProxy:
+    """Proxy object that allows runtime AsyncSessionLocal replacement."""
+    _sessionlocal = AsyncSessionLocal
+    
+    @classmethod
+    def get(cls):
+        """Get the current AsyncSessionLocal."""
+        return cls._sessionlocal
+    
+    @classmethod
+    def set(cls, new_sessionlocal):
+        """Set a new AsyncSessionLocal."""
+        cls._sessionlocal = new_sessionlocal
+
+
 def init_db() -> None:
     """Initialize database, create all tables."""
     logger.info("Initializing database...")
-    Base.metadata.create_all(bind=_EngineProxy.get())
+    engine = _EngineProxy.get()
+    
+    # Under the write lock: other server processes may be starting too
+    with schema_lock(engine) as conn:
+        Base.metadata.create_all(bind=conn)
+    
+    # create_all only creates missing tables; columns and indexes added to
+    # existing tables are applied by migrations
+    applied = run_migrations(engine)
+    if applied:
+        logger.info(f"Applied {applied} schema migration(s)")
+    
     logger.info("Database initialized successfully")
 
 
+def get_schema_version() -> int:
+    """Get the latest schema migration applied to the database."""
+    return max(get_applied_versions(_EngineProxy.get()), default=0)
+
+
 @contextmanager
 def get_db() -> Generator[Session, None, None]:
     """
@@ -95,3 +252,20 @@ def get_db_session() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async dependency for FastAPI routes, available with an async DATABASE_URL.
+    
+    Usage:
+        @app.get("/")
+        async def route(db: AsyncSession = Depends(get_async_db_session)):
+            ...
+    """
+    AsyncSessionLocalCurrent = _AsyncSessionLocalProxy.get()
+    if AsyncSessionLocalCurrent is None:
+        raise RuntimeError("DATABASE_URL does not select an async driver")
+    
+    async with AsyncSessionLocalCurrent() as db:
+        yield db
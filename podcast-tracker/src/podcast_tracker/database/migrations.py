@@ -0,0 +1,289 @@
+"""Schema migrations for databases created by older versions."""
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, bindparam, inspect, select, text, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.schema import CreateTable
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, List, NamedTuple
+import logging
+import time
+
+from .models import ChangeEvent, DataVersionCounter, Episode, FeedJob, FeedState, LeaderLease, Podcast, PodcastStats, RefreshJobState, make_summary
+from .search import create_search_index, rebuild_search_index
+from .stats import rebuild_podcast_stats
+
+logger = logging.getLogger(__name__)
+
+# Longest wait for another process setting up the schema (migration 6 rebuilds episodes)
+SCHEMA_LOCK_TIMEOUT_SECONDS = 600
+
+# Kept outside Base.metadata so create_all never stamps a database by accident
+_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+class Migration(NamedTuple):
+    """A single schema migration."""
+    version: int
+    name: str
+    upgrade: Callable[[Connection], None]
+
+
+def _create_episode_indexes(conn: Connection, *names: str) -> None:
+    """Create the named indexes declared on Episode if they are missing."""
+    for index in Episode.__table__.indexes:
+        if index.name in names:
+            index.create(bind=conn, checkfirst=True)
+
+
+def _add_episode_guid(conn: Connection) -> None:
+    """Add episodes.guid and its unique (podcast_id, guid) index."""
+    columns = {column["name"] for column in inspect(conn).get_columns("episodes")}
+    if "guid" not in columns:
+        conn.execute(text("ALTER TABLE episodes ADD COLUMN guid VARCHAR(500)"))
+    _create_episode_indexes(conn, "ix_episodes_podcast_id_guid")
+
+
+def _add_pending_episode_indexes(conn: Connection) -> None:
+    """Add the indexes serving the pending-episodes listing."""
+    _create_episode_indexes(
+        conn,
+        "ix_episodes_listened_pub_date",
+        "ix_episodes_podcast_id_listened_pub_date",
+    )
+
+
+def _backfill_podcast_stats(conn: Connection) -> None:
+    """Fill podcast_stats from the episodes stored so far."""
+    PodcastStats.__table__.create(bind=conn, checkfirst=True)
+    rebuild_podcast_stats(conn)
+
+
+def _add_feed_schedule(conn: Connection) -> None:
+    """Add the per-feed refresh schedule columns to feed_states."""
+    FeedState.__table__.create(bind=conn, checkfirst=True)
+    columns = {column["name"] for column in inspect(conn).get_columns("feed_states")}
+    if "check_interval_seconds" not in columns:
+        conn.execute(text("ALTER TABLE feed_states ADD COLUMN check_interval_seconds INTEGER"))
+    if "next_check_at" not in columns:
+        conn.execute(text("ALTER TABLE feed_states ADD COLUMN next_check_at DATETIME"))
+    for index in FeedState.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+
+
+def _add_episode_search_index(conn: Connection) -> None:
+    """Create the full-text search index and fill it from existing episodes."""
+    rebuild_search_index(conn)
+
+
+def _rebuild_episodes_table(conn: Connection, old_columns: List[str]) -> None:
+    """Recreate episodes with the column order of the model, keeping ids."""
+    metadata = MetaData()
+    Podcast.__table__.to_metadata(metadata)
+    new_table = Episode.__table__.to_metadata(metadata, name="episodes_new")
+    conn.execute(CreateTable(new_table))
+
+    columns = ", ".join(name for name in old_columns if name in new_table.c)
+    conn.execute(text(f"INSERT INTO episodes_new ({columns}) SELECT {columns} FROM episodes"))
+    # Indexes and search triggers go with the old table; the search index
+    # itself stays valid since episode ids are unchanged
+    conn.execute(text("DROP TABLE episodes"))
+    conn.execute(text("ALTER TABLE episodes_new RENAME TO episodes"))
+
+    for index in Episode.__table__.indexes:
+        index.create(bind=conn, checkfirst=True)
+    create_search_index(conn)
+
+
+def _add_episode_summary(conn: Connection) -> None:
+    """Add episodes.summary and, on SQLite, move description to the end of the row."""
+    columns = [column["name"] for column in inspect(conn).get_columns("episodes")]
+    if conn.dialect.name == "sqlite" and columns[-1] != "description":
+        _rebuild_episodes_table(conn, columns)
+    elif "summary" not in columns:
+        conn.execute(text("ALTER TABLE episodes ADD COLUMN summary VARCHAR(300)"))
+
+    episodes = Episode.__table__
+    rows = [
+        {"episode_id": episode_id, "summary": make_summary(description)}
+        for episode_id, description in conn.execute(
+            select(episodes.c.id, episodes.c.description).where(
+                episodes.c.summary.is_(None),
+                episodes.c.description.isnot(None)
+            )
+        )
+    ]
+    if rows:
+        conn.execute(
+            update(episodes).where(episodes.c.id == bindparam("episode_id")).values(summary=bindparam("summary")),
+            rows
+        )
+
+
+def _add_feed_health(conn: Connection) -> None:
+    """Add the failure tracking columns to feed_states."""
+    columns = {column["name"] for column in inspect(conn).get_columns("feed_states")}
+    added = {
+        "consecutive_failures": "INTEGER NOT NULL DEFAULT 0",
+        "last_error": "VARCHAR(500)",
+        "last_error_at": "DATETIME",
+        "last_success_at": "DATETIME",
+        "retry_after": "DATETIME",
+    }
+    for name, definition in added.items():
+        if name not in columns:
+            conn.execute(text(f"ALTER TABLE feed_states ADD COLUMN {name} {definition}"))
+
+
+def _add_feed_jobs(conn: Connection) -> None:
+    """Create the queue of feed checks claimed by refresh workers."""
+    FeedJob.__table__.create(bind=conn, checkfirst=True)
+
+
+def _add_leader_leases(conn: Connection) -> None:
+    """Create the leases electing the process that runs the scheduler."""
+    LeaderLease.__table__.create(bind=conn, checkfirst=True)
+
+
+def _add_data_versions(conn: Connection) -> None:
+    """Create the data version counters shared by every process's response cache."""
+    DataVersionCounter.__table__.create(bind=conn, checkfirst=True)
+
+
+def _add_change_events(conn: Connection) -> None:
+    """Create the log of change events relayed to the SSE clients of every process."""
+    ChangeEvent.__table__.create(bind=conn, checkfirst=True)
+
+
+def _add_refresh_jobs(conn: Connection) -> None:
+    """Create the manual refresh jobs, so any server process can report their progress."""
+    RefreshJobState.__table__.create(bind=conn, checkfirst=True)
+
+
+# Migrations must be idempotent: init_db runs them right after create_all,
+# which has already built the latest schema on a fresh database.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "add episode guid", _add_episode_guid),
+    Migration(2, "add pending episode indexes", _add_pending_episode_indexes),
+    Migration(3, "backfill podcast stats", _backfill_podcast_stats),
+    Migration(4, "add episode search index", _add_episode_search_index),
+    Migration(5, "add feed refresh schedule", _add_feed_schedule),
+    Migration(6, "add episode summary", _add_episode_summary),
+    Migration(7, "add feed health", _add_feed_health),
+    Migration(8, "add feed job queue", _add_feed_jobs),
+    Migration(9, "add leader leases", _add_leader_leases),
+    Migration(10, "add data versions", _add_data_versions),
+    Migration(11, "add change events", _add_change_events),
+    Migration(12, "add refresh jobs", _add_refresh_jobs),
+]
+
+
+@contextmanager
+def schema_lock(engine: Engine) -> Iterator[Connection]:
+    """
+    Open a transaction holding the database write lock until it ends.
+
+    Server processes started together (uvicorn --workers) all set up the
+    schema at startup. Under this lock they take turns, and each one sees
+    the tables and migrations of the others instead of creating them
+    again. On SQLite the transaction starts with BEGIN IMMEDIATE, retried
+    while another process holds the lock.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Yields:
+        Connection in the locked transaction, committed on exit
+    """
+    with engine.connect() as conn:
+        if conn.dialect.name != "sqlite":
+            with conn.begin():
+                yield conn
+            return
+
+        deadline = time.monotonic() + SCHEMA_LOCK_TIMEOUT_SECONDS
+        while True:
+            try:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+                break
+            except OperationalError as e:
+                conn.rollback()
+                if "locked" not in str(e) or time.monotonic() > deadline:
+                    raise
+                logger.info("Waiting for another process to set up the database schema")
+                time.sleep(0.1)
+
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+
+def _applied_versions(conn: Connection) -> List[int]:
+    """Read the applied versions, none if migrations never ran."""
+    if not inspect(conn).has_table(schema_migrations.name):
+        return []
+    return sorted(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def get_applied_versions(engine: Engine) -> List[int]:
+    """
+    Get the versions already applied to a database.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Sorted list of applied migration versions
+    """
+    with engine.connect() as conn:
+        return _applied_versions(conn)
+
+
+def run_migrations(engine: Engine) -> int:
+    """
+    Apply every pending migration, each in its own transaction.
+
+    Each transaction holds schema_lock, so a migration is applied once
+    however many processes start at the same time.
+
+    Args:
+        engine: SQLAlchemy engine
+
+    Returns:
+        Number of migrations applied
+    """
+    with schema_lock(engine) as conn:
+        _metadata.create_all(bind=conn)
+    applied = set(get_applied_versions(engine))
+    count = 0
+
+    for migration in MIGRATIONS:
+        if migration.version in applied:
+            continue
+
+        with schema_lock(engine) as conn:
+            # Another process may have applied it while this one waited for the lock
+            if migration.version in _applied_versions(conn):
+                continue
+
+            logger.info(f"Applying migration {migration.version}: {migration.name}")
+            migration.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version,
+                name=migration.name
+            ))
+        count += 1
+
+    return count
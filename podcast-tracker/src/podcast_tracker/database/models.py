@@ -1,11 +1,47 @@
 """Database models for Podcast Tracker."""
 
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
-from sqlalchemy.orm import relationship, declarative_base
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship, declarative_base, deferred
 from datetime import datetime
+from typing import Optional
+import html
+import re
 
 Base = declarative_base()
 
+# Length of the plain-text summary stored with each episode for list views
+SUMMARY_LENGTH = 280
+
+_TAG_RE = re.compile(r"<[^>]*>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def make_summary(description: Optional[str]) -> Optional[str]:
+    """
+    Build the plain-text summary of an HTML description.
+    
+    Args:
+        description: Episode description, usually HTML
+        
+    Returns:
+        Text without tags, cut at a word boundary to SUMMARY_LENGTH
+        characters, or None if there is no text
+    """
+    if not description:
+        return None
+    
+    text = _SPACE_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", description))).strip()
+    if len(text) <= SUMMARY_LENGTH:
+        return text or None
+    
+    cut = text[:SUMMARY_LENGTH - 1]
+    return cut[:cut.rfind(" ")].rstrip() + "…" if " " in cut else cut + "…"
+
+
+def _default_summary(context) -> Optional[str]:
+    """Summary of the description being inserted, for every insert path."""
+    return make_summary(context.get_current_parameters().get("description"))
+
 
 class Podcast(Base):
     """Podcast model."""
@@ -16,12 +52,15 @@ class Podcast(Base):
     name = Column(String(255), nullable=False, unique=True)
     rss_url = Column(String(500), nullable=False, unique=True)
     spotify_url = Column(String(500), nullable=True)
-    description = Column(Text, nullable=True)
+    description = deferred(Column(Text, nullable=True))
     artwork_url = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    # Relationship
+    # Relationships
     episodes = relationship("Episode", back_populates="podcast", cascade="all, delete-orphan")
+    feed_state = relationship("FeedState", back_populates="podcast", uselist=False, cascade="all, delete-orphan")
+    stats = relationship("PodcastStats", back_populates="podcast", uselist=False, cascade="all, delete-orphan")
+    feed_job = relationship("FeedJob", back_populates="podcast", uselist=False, cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Podcast(id={self.id}, name='{self.name}')>"
@@ -31,20 +70,159 @@ class Episode(Base):
     """Episode model."""
     
     __tablename__ = "episodes"
+    __table_args__ = (
+        Index("ix_episodes_podcast_id_guid", "podcast_id", "guid", unique=True),
+        # Pending-episodes listing: filter on listened, newest first
+        Index("ix_episodes_listened_pub_date", "listened", "pub_date"),
+        Index("ix_episodes_podcast_id_listened_pub_date", "podcast_id", "listened", "pub_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     podcast_id = Column(Integer, ForeignKey("podcasts.id"), nullable=False)
+    guid = Column(String(500), nullable=True)
     title = Column(String(500), nullable=False)
-    description = Column(Text, nullable=True)
+    summary = Column(String(300), nullable=True, default=_default_summary)
     pub_date = Column(DateTime, nullable=False)
     duration = Column(String(50), nullable=True)
     episode_url = Column(String(500), nullable=False)
     spotify_url = Column(String(500), nullable=True)
     listened = Column(Boolean, default=False, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Last column and deferred: SQLite reads a row's columns in order, so
+    # list queries that skip it stop before its (often overflowing) bytes
+    description = deferred(Column(Text, nullable=True))
     
     # Relationship
     podcast = relationship("Podcast", back_populates="episodes")
     
     def __repr__(self):
         return f"<Episode(id={self.id}, title='{self.title}', listened={self.listened})>"
+
+
+
+class FeedState(Base):
+    """Fetch state of a podcast feed (HTTP cache validators, refresh schedule and health)."""
+    
+    __tablename__ = "feed_states"
+    
+    podcast_id = Column(Integer, ForeignKey("podcasts.id"), primary_key=True)
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    check_interval_seconds = Column(Integer, nullable=True)
+    next_check_at = Column(DateTime, nullable=True, index=True)
+    consecutive_failures = Column(Integer, default=0, nullable=False)
+    last_error = Column(String(500), nullable=True)
+    last_error_at = Column(DateTime, nullable=True)
+    last_success_at = Column(DateTime, nullable=True)
+    retry_after = Column(DateTime, nullable=True)  # No fetch before this time while failing
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # Relationship
+    podcast = relationship("Podcast", back_populates="feed_state")
+    
+    def __repr__(self):
+        return f"<FeedState(podcast_id={self.podcast_id}, etag='{self.etag}')>"
+
+
+class PodcastStats(Base):
+    """Episode counters of a podcast, maintained on every write."""
+    
+    __tablename__ = "podcast_stats"
+    
+    podcast_id = Column(Integer, ForeignKey("podcasts.id"), primary_key=True)
+    total_count = Column(Integer, default=0, nullable=False)
+    pending_count = Column(Integer, default=0, nullable=False)
+    latest_pub_date = Column(DateTime, nullable=True)
+    
+    # Relationship
+    podcast = relationship("Podcast", back_populates="stats")
+    
+    def __repr__(self):
+        return f"<PodcastStats(podcast_id={self.podcast_id}, pending={self.pending_count}, total={self.total_count})>"
+
+
+class FeedJob(Base):
+    """A pending feed check, claimed by a refresh worker under a time-limited lease."""
+    
+    __tablename__ = "feed_jobs"
+    
+    id = Column(Integer, primary_key=True)
+    podcast_id = Column(Integer, ForeignKey("podcasts.id"), nullable=False, unique=True)  # One pending check per podcast
+    # Claimable from this time on: when it was queued, then when the current lease expires
+    available_at = Column(DateTime, nullable=False, index=True)
+    lease_owner = Column(String(255), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)  # Claims so far; fences out expired leases
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Relationship
+    podcast = relationship("Podcast", back_populates="feed_job")
+    
+    def __repr__(self):
+        return f"<FeedJob(id={self.id}, podcast_id={self.podcast_id}, lease_owner='{self.lease_owner}')>"
+
+
+class LeaderLease(Base):
+    """Time-limited lease electing one process to a role, such as running the scheduler."""
+    
+    __tablename__ = "leader_leases"
+    
+    name = Column(String(100), primary_key=True)
+    owner = Column(String(255), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    acquired_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<LeaderLease(name='{self.name}', owner='{self.owner}')>"
+
+
+class DataVersionCounter(Base):
+    """Version of a scope of the stored data, bumped by every write to it (see versions.py)."""
+    
+    __tablename__ = "data_versions"
+    
+    scope = Column(String(32), primary_key=True)  # "epoch", "all" or "podcast:<id>"
+    version = Column(Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f"<DataVersionCounter(scope='{self.scope}', version={self.version})>"
+
+
+class ChangeEvent(Base):
+    """A committed change, relayed to the /api/events clients of every server process."""
+    
+    __tablename__ = "change_events"
+    __table_args__ = {"sqlite_autoincrement": True}  # Ids are event ids: never reused once pruned
+    
+    id = Column(Integer, primary_key=True)
+    type = Column(String(32), nullable=False)
+    data = Column(Text, nullable=False)  # JSON payload
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f"<ChangeEvent(id={self.id}, type='{self.type}')>"
+
+
+class RefreshJobState(Base):
+    """A manual refresh job and its progress, shared by every server process."""
+    
+    __tablename__ = "refresh_jobs"
+    
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(20), nullable=False)
+    status = Column(String(20), nullable=False, index=True)
+    owner = Column(String(255), nullable=False)  # Process running the job
+    total = Column(Integer, default=0, nullable=False)
+    checked = Column(Integer, default=0, nullable=False)
+    new_episodes = Column(Integer, default=0, nullable=False)
+    not_modified = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    skipped = Column(Integer, default=0, nullable=False)
+    error = Column(String(500), nullable=True)
+    created_at = Column(DateTime, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    # Renewed while the job runs; an in-flight job with a stale heartbeat lost its process
+    heartbeat_at = Column(DateTime, nullable=False)
+    
+    def __repr__(self):
+        return f"<RefreshJobState(id='{self.id}', status='{self.status}')>"
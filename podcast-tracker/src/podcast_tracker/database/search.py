@@ -0,0 +1,220 @@
+"""Full-text episode search backed by an SQLite FTS5 index."""
+
+from sqlalchemy import event, func, select, text
+from sqlalchemy.engine import Connection
+from typing import List, NamedTuple, Optional
+import html
+import logging
+import re
+
+from .models import Episode
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "episodes_fts"
+
+# Title matches weigh more than description matches in the bm25 ranking
+RANK_FUNCTION = "bm25(10.0, 1.0)"
+
+# Ranking reads every match; terms found in most episodes are only ranked
+# among their most recent matches so common words stay fast
+RANK_CANDIDATES = 1000
+
+# Markers used inside snippet(); replaced by <mark> once the text is escaped
+_MARK_START = "\x02"
+_MARK_END = "\x03"
+_TAG_RE = re.compile(r"<[^>]*>")
+_TOKEN_RE = re.compile(r"(\w+)(\*?)", re.UNICODE)
+
+# External-content index over episodes(title, description), kept in sync by
+# triggers so every write path (ORM, bulk insert, raw SQL) updates it
+_CREATE_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+        title, description,
+        content='episodes', content_rowid='id', prefix='2 3 4',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ai AFTER INSERT ON episodes BEGIN
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_ad AFTER DELETE ON episodes BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SEARCH_TABLE}_au AFTER UPDATE OF title, description ON episodes BEGIN
+        INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SEARCH_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+
+class SearchHit(NamedTuple):
+    """An episode matching a search, best matches first."""
+    episode_id: int
+    rank: float
+    snippet: Optional[str]
+
+
+def create_search_index(conn: Connection) -> bool:
+    """
+    Create the search index and its triggers if they are missing.
+    
+    Args:
+        conn: Connection
+    
+    Returns:
+        True if the database supports the index (SQLite with FTS5)
+    """
+    if conn.dialect.name != "sqlite":
+        return False
+    
+    for statement in _CREATE_STATEMENTS:
+        conn.execute(text(statement))
+    conn.execute(
+        text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}, rank) VALUES ('rank', :rank)"),
+        {"rank": RANK_FUNCTION}
+    )
+    return True
+
+
+def drop_search_index(conn: Connection) -> None:
+    """Drop the search index; its triggers go with the episodes table."""
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+def rebuild_search_index(conn: Connection) -> int:
+    """
+    Rebuild the search index from the episodes table.
+    
+    Args:
+        conn: Connection
+    
+    Returns:
+        Number of episodes indexed, or 0 if the database has no index support
+    """
+    if not create_search_index(conn):
+        return 0
+    
+    conn.execute(text(f"INSERT INTO {SEARCH_TABLE}({SEARCH_TABLE}) VALUES ('rebuild')"))
+    return conn.execute(select(func.count(Episode.id))).scalar()
+
+
+def match_query(query: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+    
+    Every word must appear (in any order); a word ending in * matches as a
+    prefix. Other operators and quotes typed by the user are not interpreted.
+    
+    Args:
+        query: Text entered by the user
+    
+    Returns:
+        MATCH expression, or None if the text has no searchable words
+    """
+    tokens = _TOKEN_RE.findall(query)
+    if not tokens:
+        return None
+    
+    return " ".join(f'"{word}"{star}' for word, star in tokens)
+
+
+def format_snippet(snippet: Optional[str]) -> Optional[str]:
+    """Strip HTML from a raw snippet, escape it and highlight the matches with <mark>."""
+    if not snippet:
+        return None
+    
+    escaped = html.escape(_TAG_RE.sub("", snippet))
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def search_episodes(
+    conn: Connection,
+    query: str,
+    limit: int = 20,
+    offset: int = 0,
+    podcast_id: Optional[int] = None
+) -> List[SearchHit]:
+    """
+    Search episode titles and descriptions.
+    
+    When a query matches more than RANK_CANDIDATES episodes, only the most
+    recent ones (highest ids) are ranked: FTS5 walks a term's matches in id
+    order cheaply, while bm25 has to score each one.
+    
+    Args:
+        conn: Connection
+        query: Text entered by the user
+        limit: Maximum number of hits
+        offset: Number of hits to skip
+        podcast_id: Only search the episodes of this podcast
+    
+    Returns:
+        Hits ordered by relevance
+    """
+    expression = match_query(query)
+    if expression is None:
+        return []
+    
+    join = ""
+    podcast_filter = ""
+    if podcast_id is not None:
+        join = f"JOIN episodes ON episodes.id = {SEARCH_TABLE}.rowid"
+        podcast_filter = "AND episodes.podcast_id = :podcast_id"
+    
+    params = {
+        "expression": expression,
+        "mark_start": _MARK_START,
+        "mark_end": _MARK_END,
+        "podcast_id": podcast_id,
+        "limit": limit,
+        "offset": offset,
+        "window": max(RANK_CANDIDATES, offset + limit) - 1,
+    }
+    
+    # Lowest id among the candidates, None when every match is a candidate
+    floor = conn.execute(text(f"""
+        SELECT {SEARCH_TABLE}.rowid FROM {SEARCH_TABLE} {join}
+        WHERE {SEARCH_TABLE} MATCH :expression {podcast_filter}
+        ORDER BY {SEARCH_TABLE}.rowid DESC
+        LIMIT 1 OFFSET :window
+    """), params).scalar()
+    
+    candidate_filter = ""
+    if floor is not None:
+        candidate_filter = f"AND {SEARCH_TABLE}.rowid >= :floor"
+        params["floor"] = floor
+    
+    rows = conn.execute(text(f"""
+        SELECT {SEARCH_TABLE}.rowid, {SEARCH_TABLE}.rank,
+               snippet({SEARCH_TABLE}, -1, :mark_start, :mark_end, '…', 16)
+        FROM {SEARCH_TABLE} {join}
+        WHERE {SEARCH_TABLE} MATCH :expression {podcast_filter} {candidate_filter}
+        ORDER BY {SEARCH_TABLE}.rank
+        LIMIT :limit OFFSET :offset
+    """), params)
+    return [SearchHit(row[0], row[1], format_snippet(row[2])) for row in rows]
+
+
+@event.listens_for(Episode.__table__, "after_create")
+def _create_search_index(target, connection, **kw) -> None:
+    """Create the search index with the episodes table."""
+    create_search_index(connection)
+
+
+@event.listens_for(Episode.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw) -> None:
+    """Drop the search index with the episodes table."""
+    drop_search_index(connection)
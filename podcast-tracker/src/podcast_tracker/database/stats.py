@@ -0,0 +1,179 @@
+"""Maintenance of the per-podcast episode counters."""
+
+from sqlalchemy import case, delete, event, func, insert, inspect, or_, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from .models import Episode, PodcastStats
+
+logger = logging.getLogger(__name__)
+
+
+def apply_stats_delta(
+    conn: Connection,
+    podcast_id: int,
+    total: int = 0,
+    pending: int = 0,
+    latest_pub_date: Optional[datetime] = None
+) -> None:
+    """
+    Adjust the counters of a podcast in the current transaction.
+
+    Args:
+        conn: Connection of the transaction writing the episodes
+        podcast_id: Podcast ID
+        total: Change in the number of episodes
+        pending: Change in the number of unlistened episodes
+        latest_pub_date: pub_date of a new episode, if any
+    """
+    if latest_pub_date is not None:
+        latest_pub_date = latest_pub_date.replace(tzinfo=None)
+
+    values = {
+        "total_count": PodcastStats.total_count + total,
+        "pending_count": PodcastStats.pending_count + pending,
+    }
+    if latest_pub_date is not None:
+        values["latest_pub_date"] = case(
+            (
+                or_(
+                    PodcastStats.latest_pub_date.is_(None),
+                    PodcastStats.latest_pub_date < latest_pub_date
+                ),
+                latest_pub_date
+            ),
+            else_=PodcastStats.latest_pub_date
+        )
+
+    result = conn.execute(
+        update(PodcastStats).where(PodcastStats.podcast_id == podcast_id).values(**values)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(PodcastStats).values(
+            podcast_id=podcast_id,
+            total_count=total,
+            pending_count=pending,
+            latest_pub_date=latest_pub_date
+        ))
+
+
+def _aggregate_query(podcast_ids: Optional[Iterable[int]] = None):
+    """SELECT computing the counters of each podcast from its episodes."""
+    query = select(
+        Episode.podcast_id,
+        func.count(Episode.id),
+        func.coalesce(func.sum(case((Episode.listened == False, 1), else_=0)), 0),
+        func.max(Episode.pub_date),
+    ).group_by(Episode.podcast_id)
+
+    if podcast_ids is not None:
+        query = query.where(Episode.podcast_id.in_(list(podcast_ids)))
+
+    return query
+
+
+def rebuild_podcast_stats(conn: Connection, podcast_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the counters from the episodes table.
+
+    Args:
+        conn: Connection
+        podcast_ids: Podcasts to recompute (all podcasts by default)
+
+    Returns:
+        Number of counter rows written
+    """
+    if podcast_ids is not None:
+        podcast_ids = list(podcast_ids)
+        conn.execute(delete(PodcastStats).where(PodcastStats.podcast_id.in_(podcast_ids)))
+    else:
+        conn.execute(delete(PodcastStats))
+
+    result = conn.execute(
+        insert(PodcastStats).from_select(
+            ["podcast_id", "total_count", "pending_count", "latest_pub_date"],
+            _aggregate_query(podcast_ids)
+        )
+    )
+    return result.rowcount
+
+
+def find_stats_drift(conn: Connection) -> List[Dict[str, object]]:
+    """
+    Compare the stored counters with the episodes table.
+
+    Args:
+        conn: Connection
+
+    Returns:
+        One entry per podcast whose counters differ, with stored and actual values
+    """
+    actual = {
+        podcast_id: (total, pending, latest)
+        for podcast_id, total, pending, latest in conn.execute(_aggregate_query())
+    }
+    stored = {
+        row.podcast_id: (row.total_count, row.pending_count, row.latest_pub_date)
+        for row in conn.execute(select(PodcastStats))
+    }
+
+    drift = []
+    for podcast_id in sorted(set(actual) | set(stored)):
+        expected = actual.get(podcast_id, (0, 0, None))
+        found = stored.get(podcast_id, (0, 0, None))
+        if expected != found:
+            drift.append({"podcast_id": podcast_id, "stored": found, "actual": expected})
+
+    return drift
+
+
+@event.listens_for(Episode.listened, "set", active_history=True)
+def _load_previous_listened(target, value, oldvalue, initiator) -> None:
+    """Load the previous listened value on assignment, even if expired, so flushes can diff it."""
+
+
+@event.listens_for(Session, "after_flush")
+def _track_episode_changes(session: Session, flush_context) -> None:
+    """
+    Keep the counters in step with episodes written through the ORM.
+
+    Bulk statements (insert(Episode), update(Episode)) bypass the unit of
+    work and must call apply_stats_delta themselves.
+    """
+    deltas = defaultdict(lambda: {"total": 0, "pending": 0, "latest_pub_date": None})
+    recompute = set()
+
+    for obj in session.new:
+        if isinstance(obj, Episode):
+            delta = deltas[obj.podcast_id]
+            delta["total"] += 1
+            if not obj.listened:
+                delta["pending"] += 1
+            pub_date = obj.pub_date.replace(tzinfo=None)
+            if delta["latest_pub_date"] is None or pub_date > delta["latest_pub_date"]:
+                delta["latest_pub_date"] = pub_date
+
+    for obj in session.dirty:
+        if isinstance(obj, Episode):
+            history = inspect(obj).attrs.listened.history
+            if history.deleted and bool(history.deleted[0]) != bool(obj.listened):
+                deltas[obj.podcast_id]["pending"] += -1 if obj.listened else 1
+
+    for obj in session.deleted:
+        if isinstance(obj, Episode):
+            # The latest pub_date cannot be decremented, recount instead
+            recompute.add(obj.podcast_id)
+
+    if not deltas and not recompute:
+        return
+
+    conn = session.connection()
+    for podcast_id, delta in deltas.items():
+        if podcast_id not in recompute:
+            apply_stats_delta(conn, podcast_id, **delta)
+    if recompute:
+        rebuild_podcast_stats(conn, recompute)
@@ -0,0 +1,150 @@
+"""Data versions bumped by every committed write, used to invalidate cached reads."""
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+from itertools import chain
+from typing import Iterable, Optional, Set, Tuple
+
+from .database import _EngineProxy
+from .models import ChangeEvent, DataVersionCounter, FeedJob, FeedState, LeaderLease, Podcast, RefreshJobState
+
+# session.info key collecting the podcasts written by the current transaction
+_CHANGES_KEY = "podcast_tracker.changed_podcasts"
+
+# Marker for writes whose podcasts are unknown
+_ALL = object()
+
+# Bookkeeping that no cached read serves, written on every refresh, job
+# claim, lease renewal, change event and refresh job progress
+_UNTRACKED = (FeedState, FeedJob, LeaderLease, ChangeEvent, RefreshJobState)
+
+# Counter scopes: writes to unknown podcasts, every write, and one per podcast
+EPOCH_SCOPE = "epoch"
+ALL_SCOPE = "all"
+
+
+def podcast_scope(podcast_id: int) -> str:
+    """Get the counter scope of one podcast's data."""
+    return f"podcast:{podcast_id}"
+
+
+class DataVersion:
+    """
+    Version counters for the stored data, kept in the data_versions table.
+    
+    Every write bumps the global version and the version of each podcast it
+    touched; writes to unknown podcasts bump the epoch, which invalidates
+    everything. Reads scoped to one podcast only depend on that podcast.
+    
+    Counters are bumped in the writing transaction, so every process sharing
+    the database sees a write as soon as it is committed.
+    """
+    
+    def __init__(self, engine: Optional[Engine] = None):
+        self._engine = engine
+    
+    @property
+    def engine(self) -> Engine:
+        """Engine the counters are read from: the given one, else the application's."""
+        return self._engine if self._engine is not None else _EngineProxy.get()
+    
+    def current(self, podcast_id: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Get the version of all data, or of one podcast's data.
+        
+        Args:
+            podcast_id: Podcast the read is scoped to
+        
+        Returns:
+            Opaque version, different after any write affecting the scope
+        """
+        scope = ALL_SCOPE if podcast_id is None else podcast_scope(podcast_id)
+        with self.engine.connect() as conn:
+            versions = dict(conn.execute(
+                select(DataVersionCounter.scope, DataVersionCounter.version)
+                .where(DataVersionCounter.scope.in_([EPOCH_SCOPE, scope]))
+            ).all())
+        return versions.get(EPOCH_SCOPE, 0), versions.get(scope, 0)
+    
+    def bump(self, podcast_ids: Optional[Iterable[int]] = None, conn: Optional[Connection] = None) -> None:
+        """
+        Record a write.
+        
+        Args:
+            podcast_ids: Podcasts written, or None if unknown (invalidates everything)
+            conn: Connection of the writing transaction; a new transaction if None
+        """
+        if podcast_ids is None:
+            scopes = [EPOCH_SCOPE]
+        else:
+            scopes = [ALL_SCOPE] + sorted(podcast_scope(podcast_id) for podcast_id in set(podcast_ids))
+        
+        stmt = sqlite_insert(DataVersionCounter).on_conflict_do_update(
+            index_elements=[DataVersionCounter.scope],
+            set_={"version": DataVersionCounter.version + 1}
+        )
+        rows = [{"scope": scope, "version": 1} for scope in scopes]
+        if conn is not None:
+            conn.execute(stmt, rows)
+            return
+        with self.engine.begin() as conn:
+            conn.execute(stmt, rows)
+
+
+# Global data version instance
+data_version = DataVersion()
+
+
+def _record_changes(session: Session, podcast_ids: Iterable) -> None:
+    """Add podcasts (or _ALL) to the changes of the session's transaction."""
+    changes: Set = session.info.setdefault(_CHANGES_KEY, set())
+    changes.update(podcast_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session: Session, flush_context) -> None:
+    """Collect the podcasts touched by objects written through the unit of work."""
+    podcast_ids = set()
+    dirty = (obj for obj in session.dirty if session.is_modified(obj))
+    for obj in chain(session.new, dirty, session.deleted):
+        if isinstance(obj, _UNTRACKED):
+            continue
+        if isinstance(obj, Podcast):
+            podcast_ids.add(obj.id)
+        else:
+            podcast_ids.add(getattr(obj, "podcast_id", _ALL))
+    
+    if podcast_ids:
+        _record_changes(session, podcast_ids)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_statement_changes(orm_execute_state: ORMExecuteState) -> None:
+    """Collect the podcasts touched by insert/update/delete statements."""
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, _UNTRACKED):
+        return
+    
+    params = orm_execute_state.parameters
+    rows = params if isinstance(params, list) else [params or {}]
+    _record_changes(orm_execute_state.session, {row.get("podcast_id", _ALL) for row in rows})
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_changes(session: Session) -> None:
+    """Bump the data version in the transaction being committed."""
+    session.flush()
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if changes:
+        data_version.bump(None if _ALL in changes else changes, session.connection())
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    """Forget the changes of a rolled back transaction."""
+    session.info.pop(_CHANGES_KEY, None)
@@ -0,0 +1,282 @@
+"""Change events, logged with each write and streamed to clients at /api/events."""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .database.database import _EngineProxy
+from .database.models import ChangeEvent
+from .metrics import Counter, registry
+
+logger = logging.getLogger(__name__)
+
+# Event types
+EPISODES_ADDED = "episodes"    # New episodes stored for a podcast
+LISTENED_CHANGED = "listened"  # Listened state of episodes changed
+RESET = "reset"                # Events were missed: the client must reload everything
+
+# Largest list of episode ids carried by one event; bigger changes only carry counts
+MAX_EVENT_EPISODE_IDS = 500
+
+# Most events read from the log per query
+RELAY_BATCH = 500
+
+events_published = registry.register(Counter(
+    "podcast_tracker_events_published", "Change events published to /api/events subscribers.", ["type"]
+))
+
+
+def record_event(db: Session, event_type: str, data: Dict[str, Any]) -> None:
+    """
+    Log a change event in the session's transaction.
+    
+    The event is committed with the change it describes, then relayed to the
+    subscribers of every server process by their EventRelay, whichever
+    process (server, CLI or refresh worker) made the change.
+    
+    Args:
+        db: Session of the writing transaction
+        event_type: EPISODES_ADDED or LISTENED_CHANGED
+        data: JSON-serializable payload
+    """
+    db.add(ChangeEvent(type=event_type, data=json.dumps(data, default=str)))
+
+
+class Event(NamedTuple):
+    """A change event."""
+    
+    id: int
+    type: str
+    data: Dict[str, Any]
+    
+    def encode(self) -> str:
+        """Format the event as a Server-Sent Events message."""
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+class Subscription:
+    """Events queued for one client, delivered on its event loop."""
+    
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queued: int, after_id: int = 0):
+        self.loop = loop
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(max_queued)
+        self.lagged = False
+        # Events up to this id were already sent, by another process
+        self.after_id = after_id
+    
+    def _offer(self, event: Event) -> None:
+        """Queue an event; runs on the subscriber's loop."""
+        if self.lagged or event.id <= self.after_id:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow: end the stream, the client resumes from its last event id
+            self.lagged = True
+
+
+class EventBroadcaster:
+    """
+    Fan out change events to every connected client of this process.
+    
+    Events are read from the change_events log by an EventRelay thread and
+    handed to each subscriber's event loop, in log order. The latest
+    `history` events are kept so a reconnecting client can resume from the
+    id of the last event it received; when that event is no longer kept,
+    the client gets a RESET event.
+    
+    Ids are log ids, the same in every process, so a client can resume on
+    any server process.
+    """
+    
+    def __init__(self, history: int = settings.events_history):
+        """
+        Initialize the broadcaster.
+        
+        Args:
+            history: Number of recent events kept for resuming clients, and
+                the most events queued for a client before it is dropped
+        """
+        self.history = history
+        self._events: Deque[Event] = deque(maxlen=history)
+        self._last_id = 0
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+    
+    def publish(self, event: Event) -> None:
+        """
+        Publish an event read from the log to every subscriber.
+        
+        Args:
+            event: Event, newer than every event published before
+        """
+        with self._lock:
+            self._last_id = event.id
+            self._events.append(event)
+            subscribers = list(self._subscribers)
+        
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._offer, event)
+            except RuntimeError:
+                # The subscriber's loop is closed
+                self.unsubscribe(subscription)
+        
+        events_published.labels(event.type).inc()
+    
+    def subscribe(
+        self,
+        last_event_id: Optional[int] = None,
+        loop: Optional[asyncio.AbstractEventLoop] = None
+    ) -> Tuple[Subscription, List[Event]]:
+        """
+        Register a client, atomically with the events it missed.
+        
+        Args:
+            last_event_id: Id of the last event the client received, if resuming
+            loop: Loop the client runs on (the running loop by default)
+        
+        Returns:
+            (subscription, events to send before the live ones)
+        """
+        loop = loop or asyncio.get_running_loop()
+        
+        with self._lock:
+            last_id = self._last_id
+            if last_event_id is not None and last_event_id > last_id:
+                # Sent by a process whose relay is ahead of this one's
+                subscription = Subscription(loop, self.history, after_id=last_event_id)
+                self._subscribers.add(subscription)
+                return subscription, []
+            
+            subscription = Subscription(loop, self.history)
+            self._subscribers.add(subscription)
+            
+            if last_event_id is None:
+                return subscription, []
+            
+            oldest = self._events[0].id if self._events else last_id + 1
+            if last_event_id + 1 < oldest:
+                return subscription, [Event(last_id, RESET, {})]
+            return subscription, [event for event in self._events if event.id > last_event_id]
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Forget a client."""
+        with self._lock:
+            self._subscribers.discard(subscription)
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected clients."""
+        with self._lock:
+            return len(self._subscribers)
+
+
+class EventRelay:
+    """
+    Publish the events logged by every process to this process's broadcaster.
+    
+    Polls the change_events log every poll_seconds for events newer than the
+    last one published. The first poll only loads the latest `history`
+    events, for resuming clients. Events older than the broadcaster's
+    history are pruned from the log as the relay moves on.
+    """
+    
+    def __init__(
+        self,
+        broadcaster: "EventBroadcaster",
+        poll_seconds: Optional[float] = None,
+        engine: Optional[Engine] = None
+    ):
+        """
+        Initialize the relay.
+        
+        Args:
+            broadcaster: Broadcaster the events are published to
+            poll_seconds: Wait between polls (settings.events_poll_seconds by default)
+            engine: Engine the log is read from (the application's by default)
+        """
+        self.broadcaster = broadcaster
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.events_poll_seconds
+        self._engine = engine
+        self._last_id: Optional[int] = None  # Latest event read, None before the first poll
+        self._pruned_id = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def engine(self) -> Engine:
+        """Engine the log is read from: the given one, else the application's."""
+        return self._engine if self._engine is not None else _EngineProxy.get()
+    
+    def poll(self) -> int:
+        """
+        Publish the events logged since the last poll.
+        
+        Returns:
+            Number of events published
+        """
+        history = self.broadcaster.history
+        published = 0
+        
+        with self.engine.connect() as conn:
+            while True:
+                query = select(ChangeEvent.id, ChangeEvent.type, ChangeEvent.data)
+                if self._last_id is None:
+                    # First poll: the latest events only, oldest first
+                    rows = conn.execute(query.order_by(ChangeEvent.id.desc()).limit(history)).all()[::-1]
+                    self._last_id = 0
+                else:
+                    rows = conn.execute(
+                        query.where(ChangeEvent.id > self._last_id).order_by(ChangeEvent.id).limit(RELAY_BATCH)
+                    ).all()
+                
+                for event_id, event_type, data in rows:
+                    self.broadcaster.publish(Event(event_id, event_type, json.loads(data)))
+                    self._last_id = event_id
+                published += len(rows)
+                if len(rows) < RELAY_BATCH:
+                    break
+            
+            if self._last_id - self._pruned_id >= history:
+                # Every process keeps the same history: older events can no longer be resumed from
+                self._pruned_id = self._last_id - history
+                conn.execute(delete(ChangeEvent).where(ChangeEvent.id <= self._pruned_id))
+                conn.commit()
+        
+        return published
+    
+    def run(self) -> None:
+        """Poll the log until stop() is called."""
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Error relaying change events: {e}")
+            self._stop.wait(self.poll_seconds)
+    
+    def start(self) -> None:
+        """Run the relay in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="event-relay", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the relay and wait for its thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+# Global broadcaster instance, fed by the relay of each server process
+broadcaster = EventBroadcaster()
+event_relay = EventRelay(broadcaster)
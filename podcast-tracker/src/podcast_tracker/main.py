@@ -1,18 +1,44 @@
 """Main application entry point."""
 
+import argparse
 import logging
+import signal
+import sys
+import threading
 import uvicorn
 import os
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
 from contextlib import asynccontextmanager
+from typing import Optional
 import os
 
 from .config import settings
-from .database import init_db, get_db
-from .services import podcast_scheduler, PodcastService
-from .api import router
+from .database import (
+    Podcast,
+    init_db,
+    get_db,
+    get_schema_version,
+    find_stats_drift,
+    rebuild_podcast_stats,
+    rebuild_search_index,
+    is_async_database_url,
+)
+from .services import (
+    podcast_scheduler,
+    PodcastService,
+    RefreshWorker,
+    LeaderElection,
+    SCHEDULER_LEASE,
+    OpmlError,
+    feed_fetcher,
+    iter_opml_feeds,
+    render_opml,
+)
+from .services.podcast_service import FAILED
+from .api import router, async_router, ResponseCacheMiddleware, MetricsMiddleware
+from .events import event_relay
 
 # Configure logging
 logging.basicConfig(
@@ -52,6 +78,10 @@ INITIAL_PODCASTS = [
 ]
 
 
+# Thread seeding the initial podcasts, started by the elected process
+_seed_thread: Optional[threading.Thread] = None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
@@ -66,11 +96,20 @@ async def lifespan(app: FastAPI):
         # Initialize database
         init_db()
         
-        # Seed initial podcasts
-        seed_podcasts()
+        # Only the elected process seeds podcasts and runs the scheduler, however
+        # many server processes are running; every process runs refresh workers
+        scheduler_leader = LeaderElection(
+            SCHEDULER_LEASE,
+            on_elected=start_leader_duties,
+            on_demoted=podcast_scheduler.stop
+        )
+        scheduler_leader.start()
+        workers = [RefreshWorker() for _ in range(settings.refresh_workers)]
+        for worker in workers:
+            worker.start()
         
-        # Start scheduler
-        podcast_scheduler.start()
+        # Stream the changes made by every process (workers, CLI) to this process's clients
+        event_relay.start()
         
         logger.info("Application started successfully")
     
@@ -79,10 +118,29 @@ async def lifespan(app: FastAPI):
     # Shutdown
     if os.getenv("TESTING") != "true":
         logger.info("Shutting down...")
-        podcast_scheduler.stop()
+        event_relay.stop()
+        scheduler_leader.stop()
+        for worker in workers:
+            worker.stop()
+        feed_fetcher.close()
         logger.info("Application shutdown complete")
 
 
+def start_leader_duties():
+    """
+    Start the scheduler and seed podcasts, once this process is elected leader.
+    
+    Seeding fetches the feeds of the podcasts not stored yet, so it runs in
+    its own thread: the election thread has to keep renewing the lease.
+    """
+    global _seed_thread
+    
+    podcast_scheduler.start()
+    if _seed_thread is None or not _seed_thread.is_alive():
+        _seed_thread = threading.Thread(target=seed_podcasts, name="seed-podcasts", daemon=True)
+        _seed_thread.start()
+
+
 def seed_podcasts():
     """Seed initial podcasts into the database."""
     logger.info("Seeding initial podcasts...")
@@ -111,7 +169,18 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Serve repeated reads from the response cache
+if settings.response_cache_enabled:
+    app.add_middleware(ResponseCacheMiddleware)
+
+# Outermost, so cache hits are timed too
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routes
+# With an async driver the async routes are registered first and take precedence
+if is_async_database_url(settings.database_url):
+    app.include_router(async_router)
 app.include_router(router)
 
 # Get the directory where this file is located
@@ -128,8 +197,170 @@ async def root():
     return FileResponse(os.path.join(STATIC_DIR, "index.html"))
 
 
+def migrate():
+    """Create missing tables and apply pending schema migrations."""
+    init_db()
+    print(f"Database schema at version {get_schema_version()}")
+
+
+def check_stats(rebuild: bool = False) -> int:
+    """
+    Check the per-podcast counters against the episodes table.
+    
+    Args:
+        rebuild: Recompute every counter from the episodes table
+        
+    Returns:
+        Process exit code: 1 if drift was found and not repaired
+    """
+    init_db()
+    
+    with get_db() as db:
+        drift = find_stats_drift(db.connection())
+        for entry in drift:
+            print(f"Podcast {entry['podcast_id']}: stored {entry['stored']}, actual {entry['actual']}")
+        
+        if rebuild:
+            rows = rebuild_podcast_stats(db.connection())
+            print(f"Rebuilt counters for {rows} podcast(s)")
+            return 0
+    
+    print(f"{len(drift)} podcast(s) with drifted counters")
+    return 1 if drift else 0
+
+
+def reindex() -> None:
+    """Rebuild the full-text search index from the episodes table."""
+    init_db()
+    
+    with get_db() as db:
+        count = rebuild_search_index(db.connection())
+    
+    print(f"Indexed {count} episode(s) for search")
+
+
+def import_opml(path: str) -> int:
+    """
+    Add the podcasts of an OPML file, fetching their feeds in parallel.
+    
+    Args:
+        path: OPML file
+    
+    Returns:
+        Process exit code: 1 if any feed failed to import
+    """
+    init_db()
+    
+    with open(path, "rb") as source, get_db() as db:
+        try:
+            results = PodcastService(db).import_podcasts(iter_opml_feeds(source))
+        except OpmlError as e:
+            print(e)
+            return 1
+    
+    for result in results:
+        line = f"{result.status:<8} {result.name} <{result.rss_url}>"
+        if result.episodes:
+            line += f" ({result.episodes} episodes)"
+        if result.error:
+            line += f": {result.error}"
+        print(line)
+    
+    failed = sum(1 for result in results if result.status == FAILED)
+    print(f"{len(results)} feed(s): {len(results) - failed} imported or already tracked, {failed} failed")
+    return 1 if failed else 0
+
+
+def export_opml(path: Optional[str] = None) -> None:
+    """
+    Write every podcast feed as an OPML file.
+    
+    Args:
+        path: Output file (standard output by default)
+    """
+    init_db()
+    
+    with get_db() as db:
+        document = render_opml(db.query(Podcast).order_by(Podcast.name))
+    
+    if path:
+        with open(path, "wb") as output:
+            output.write(document)
+    else:
+        sys.stdout.buffer.write(document)
+
+
+def work(worker_id: Optional[str] = None, once: bool = False) -> None:
+    """
+    Check the feeds queued by the scheduler until interrupted.
+    
+    SIGINT and SIGTERM stop the worker once its current batch is done.
+    
+    Args:
+        worker_id: Unique name of the worker
+        once: Process the jobs already queued, then exit
+    """
+    init_db()
+    worker = RefreshWorker(worker_id=worker_id)
+    
+    try:
+        if once:
+            total = 0
+            while True:
+                claimed = worker.run_once()
+                if not claimed:
+                    break
+                total += claimed
+            print(f"Processed {total} feed job(s)")
+            return
+        
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+        worker.run()
+    finally:
+        feed_fetcher.close()
+
+
 def main():
-    """Run the application."""
+    """Run the application or one of its maintenance commands."""
+    parser = argparse.ArgumentParser(prog="podcast-tracker", description="AI Podcast Tracker")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("serve", help="Run the web server (default)")
+    subparsers.add_parser("migrate", help="Create missing tables and apply schema migrations")
+    stats_parser = subparsers.add_parser("stats", help="Check the per-podcast episode counters")
+    stats_parser.add_argument("--rebuild", action="store_true", help="Recompute the counters")
+    subparsers.add_parser("reindex", help="Rebuild the full-text episode search index")
+    import_parser = subparsers.add_parser("import-opml", help="Add the podcasts of an OPML file")
+    import_parser.add_argument("path", help="OPML file")
+    export_parser = subparsers.add_parser("export-opml", help="Write every podcast feed as OPML")
+    export_parser.add_argument("path", nargs="?", help="Output file (standard output by default)")
+    worker_parser = subparsers.add_parser("worker", help="Check the feeds queued by the scheduler")
+    worker_parser.add_argument("--id", dest="worker_id", help="Unique worker name (host:pid:random by default)")
+    worker_parser.add_argument("--once", action="store_true", help="Process the queued jobs, then exit")
+    args = parser.parse_args()
+    
+    if args.command == "migrate":
+        migrate()
+        return
+    
+    if args.command == "stats":
+        raise SystemExit(check_stats(rebuild=args.rebuild))
+    
+    if args.command == "reindex":
+        reindex()
+        return
+    
+    if args.command == "import-opml":
+        raise SystemExit(import_opml(args.path))
+    
+    if args.command == "export-opml":
+        export_opml(args.path)
+        return
+    
+    if args.command == "worker":
+        work(worker_id=args.worker_id, once=args.once)
+        return
+    
     uvicorn.run(
         "podcast_tracker.main:app",
         host=settings.host,
@@ -0,0 +1,300 @@
+"""In-process metrics, exposed in the Prometheus text format at /metrics."""
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import threading
+import time
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; fetches and refresh runs get longer upper buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    """Render a label set as {name="value",...}."""
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value; integers without a decimal part."""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Metric:
+    """A named metric with optional labels; children are created on first use."""
+    
+    type_name = ""
+    
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+    
+    def labels(self, *values: str):
+        """Get the child metric of a label set."""
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+    
+    def _new_child(self):
+        raise NotImplementedError
+    
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+    
+    def render(self) -> List[str]:
+        """Render the HELP and TYPE lines followed by every sample."""
+        with self._lock:
+            samples = list(self._samples())
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"] + samples
+
+
+class _CounterChild:
+    """Value of a counter for one label set."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+    
+    def inc(self, amount: float = 1) -> None:
+        """Add to the counter."""
+        with self._lock:
+            self.value += amount
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+    
+    type_name = "counter"
+    
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+    
+    def inc(self, amount: float = 1) -> None:
+        """Add to an unlabelled counter."""
+        self.labels().inc(amount)
+    
+    def _samples(self) -> Iterator[str]:
+        for key, child in self._children.items():
+            yield f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    """Buckets of a histogram for one label set."""
+    
+    def __init__(self, buckets: Sequence[float]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+    
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+    
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the duration of the block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+    
+    type_name = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+    
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+    
+    def observe(self, value: float) -> None:
+        """Record one observation on an unlabelled histogram."""
+        self.labels().observe(value)
+    
+    def time(self):
+        """Observe the duration of a block on an unlabelled histogram."""
+        return self.labels().time()
+    
+    def _samples(self) -> Iterator[str]:
+        names = self.labelnames + ("le",)
+        for key, child in self._children.items():
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                yield f"{self.name}_bucket{_format_labels(names, key + (le,))} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CounterFunc(_Metric):
+    """Counter whose values are read from elsewhere when rendered."""
+    
+    type_name = "counter"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelname: Optional[str],
+        read: Callable[[], Dict[str, float]]
+    ):
+        """
+        Initialize the counter.
+        
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelname: Label holding the keys returned by read, or None for
+                a single value under the key ""
+            read: Returns the current values by label value
+        """
+        super().__init__(name, documentation, (labelname,) if labelname else ())
+        self.read = read
+    
+    def _samples(self) -> Iterator[str]:
+        for key, value in self.read().items():
+            labels = _format_labels(self.labelnames, (key,) if self.labelnames else ())
+            yield f"{self.name}_total{labels} {_format_value(value)}"
+
+
+class Registry:
+    """The metrics rendered at /metrics."""
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+    
+    def register(self, metric: _Metric) -> _Metric:
+        """Add a metric; names must be unique."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global metrics registry
+registry = Registry()
+
+# Feed fetching and parsing (RSSParser)
+feed_fetch_seconds = registry.register(Histogram(
+    "podcast_tracker_feed_fetch_seconds", "Time to download a feed.", ["feed"], SLOW_BUCKETS
+))
+feed_fetch_bytes = registry.register(Counter(
+    "podcast_tracker_feed_fetch_bytes", "Feed bytes received over the network.", ["feed"]
+))
+feed_fetches = registry.register(Counter(
+    "podcast_tracker_feed_fetches", "Feed downloads by result (ok, not_modified, error).", ["feed", "result"]
+))
+feed_parse_seconds = registry.register(Histogram(
+    "podcast_tracker_feed_parse_seconds", "Time to parse a downloaded feed.", buckets=SLOW_BUCKETS
+))
+feed_entries_parsed = registry.register(Counter(
+    "podcast_tracker_feed_entries_parsed", "Feed entries parsed into episodes."
+))
+
+# Storage (PodcastService)
+feed_store_seconds = registry.register(Histogram(
+    "podcast_tracker_feed_store_seconds", "Time to store the episodes of a fetched feed."
+))
+episodes_inserted = registry.register(Counter(
+    "podcast_tracker_episodes_inserted", "New episodes inserted."
+))
+db_commit_seconds = registry.register(Histogram(
+    "podcast_tracker_db_commit_seconds", "Time to commit a session, including its final flush."
+))
+
+# Scheduling (PodcastScheduler, refresh jobs)
+scheduler_ticks = registry.register(Counter(
+    "podcast_tracker_scheduler_ticks", "Scheduler ticks."
+))
+scheduler_overlaps = registry.register(Counter(
+    "podcast_tracker_scheduler_overlaps", "Due feeds not queued again because their previous check was still pending."
+))
+feeds_skipped = registry.register(Counter(
+    "podcast_tracker_feeds_skipped", "Feed checks skipped because the feed's circuit was open."
+))
+feed_jobs = registry.register(Counter(
+    "podcast_tracker_feed_jobs", "Feed jobs by event (queued, claimed, reclaimed, abandoned, lost).", ["event"]
+))
+refresh_job_seconds = registry.register(Histogram(
+    "podcast_tracker_refresh_job_seconds",
+    "Duration of manual refresh jobs (kind=all) and of refresh worker batches (kind=queue).",
+    ["kind", "status"],
+    SLOW_BUCKETS
+))
+
+# API
+http_request_seconds = registry.register(Histogram(
+    "podcast_tracker_http_request_seconds", "HTTP request latency by route.", ["method", "route", "status"]
+))
+
+# session.info key holding the start time of the commit in progress
+_COMMIT_STARTED_KEY = "podcast_tracker.commit_started"
+
+
+@event.listens_for(Session, "before_commit")
+def _start_commit_timer(session: Session) -> None:
+    """Remember when the commit started."""
+    session.info[_COMMIT_STARTED_KEY] = time.perf_counter()
+
+
+@event.listens_for(Session, "after_commit")
+def _observe_commit(session: Session) -> None:
+    """Record the duration of a successful commit."""
+    started = session.info.pop(_COMMIT_STARTED_KEY, None)
+    if started is not None:
+        db_commit_seconds.observe(time.perf_counter() - started)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_commit_timer(session: Session) -> None:
+    """Forget a commit that failed."""
+    session.info.pop(_COMMIT_STARTED_KEY, None)
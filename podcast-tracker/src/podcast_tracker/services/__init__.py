@@ -1,12 +1,39 @@
 """Services package."""
 
+from .http_client import FeedFetcher, FeedFetchError, feed_fetcher
 from .rss_parser import RSSParser
-from .podcast_service import PodcastService
+from .feed_health import feed_status, FEED_STATUSES
+from .opml import OpmlError, OpmlFeed, iter_opml_feeds, render_opml
+from .podcast_service import PodcastService, RefreshStats, ImportResult
+from .refresh_jobs import RefreshJob, RefreshJobManager, refresh_jobs, REFRESH_ALL
+from .job_queue import ClaimedJob, FeedJobQueue
+from .worker import RefreshWorker
+from .leader import LeaderElection, SCHEDULER_LEASE
 from .scheduler import podcast_scheduler, PodcastScheduler
 
 __all__ = [
+    "FeedFetcher",
+    "FeedFetchError",
+    "feed_fetcher",
     "RSSParser",
+    "feed_status",
+    "FEED_STATUSES",
     "PodcastService",
+    "RefreshStats",
+    "ImportResult",
+    "OpmlError",
+    "OpmlFeed",
+    "iter_opml_feeds",
+    "render_opml",
+    "RefreshJob",
+    "RefreshJobManager",
+    "refresh_jobs",
+    "REFRESH_ALL",
+    "ClaimedJob",
+    "FeedJobQueue",
+    "RefreshWorker",
+    "LeaderElection",
+    "SCHEDULER_LEASE",
     "podcast_scheduler",
     "PodcastScheduler",
 ]
@@ -0,0 +1,59 @@
+"""Refresh intervals learned from the publication cadence of a feed."""
+
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+import random
+import statistics
+
+from ..config import settings
+
+# Number of recent episodes the cadence is learned from
+CADENCE_SAMPLE = 10
+
+
+def learn_refresh_interval(pub_dates: Iterable[datetime], now: Optional[datetime] = None) -> timedelta:
+    """
+    Pick how often to poll a feed from the publication dates of its episodes.
+    
+    The cadence is the median gap between recent episodes, or the time since
+    the latest one when the feed has gone quiet for longer than that. The
+    feed is polled refresh_checks_per_cadence times per cadence, clamped to
+    [refresh_min_interval_minutes, refresh_max_interval_hours]. Gaps shorter
+    than the minimum interval (episodes released in a batch) are ignored.
+    
+    Args:
+        pub_dates: Publication dates of recent episodes
+        now: Current time (UTC, naive)
+        
+    Returns:
+        Interval until the next check, before jitter
+    """
+    now = now or datetime.utcnow()
+    minimum = timedelta(minutes=settings.refresh_min_interval_minutes)
+    maximum = timedelta(hours=settings.refresh_max_interval_hours)
+    
+    dates = sorted({pub_date.replace(tzinfo=None) for pub_date in pub_dates}, reverse=True)
+    gaps = [newer - older for newer, older in zip(dates, dates[1:]) if newer - older >= minimum]
+    
+    if not gaps:
+        interval = timedelta(hours=settings.check_interval_hours)
+    else:
+        cadence = max(statistics.median(gaps), now - dates[0])
+        interval = cadence / settings.refresh_checks_per_cadence
+    
+    return max(minimum, min(maximum, interval))
+
+
+def with_jitter(interval: timedelta, jitter: Optional[float] = None) -> timedelta:
+    """
+    Spread an interval by a random factor so feeds do not stay in lockstep.
+    
+    Args:
+        interval: Interval to spread
+        jitter: Maximum relative change (settings.refresh_jitter by default)
+        
+    Returns:
+        Interval scaled by a factor in [1 - jitter, 1 + jitter]
+    """
+    jitter = settings.refresh_jitter if jitter is None else jitter
+    return interval * random.uniform(1 - jitter, 1 + jitter)
@@ -0,0 +1,98 @@
+"""Backoff and circuit breaking for feeds that keep failing."""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..config import settings
+from ..database.models import FeedState
+from .cadence import with_jitter
+
+# Health of a feed, as reported by GET /api/feeds/health
+FEED_UNKNOWN = "unknown"      # Never fetched since failures are tracked
+FEED_OK = "ok"                # Last fetch succeeded
+FEED_FAILING = "failing"      # Failing, retried after a backoff
+FEED_OPEN = "open"            # Circuit open: skipped until retry_after
+FEED_HALF_OPEN = "half_open"  # Circuit open but retry_after passed: the next fetch is a probe
+
+FEED_STATUSES = (FEED_OK, FEED_FAILING, FEED_OPEN, FEED_HALF_OPEN, FEED_UNKNOWN)
+
+
+def backoff_delay(failures: int) -> timedelta:
+    """
+    Time to wait before fetching a feed again after consecutive failures.
+    
+    Doubles with every failure, from feed_backoff_base_minutes up to
+    feed_backoff_max_hours, with jitter so failed feeds are not retried
+    in lockstep.
+    
+    Args:
+        failures: Consecutive failures, including the latest one
+    
+    Returns:
+        Delay until the next allowed fetch
+    """
+    base = timedelta(minutes=settings.feed_backoff_base_minutes)
+    maximum = timedelta(hours=settings.feed_backoff_max_hours)
+    # Cap the exponent too, so long outages cannot overflow timedelta
+    delay = min(maximum, base * 2 ** min(max(failures - 1, 0), 32))
+    return with_jitter(delay)
+
+
+def record_failure(feed_state: FeedState, error: str, now: datetime) -> int:
+    """
+    Count a failed check of a feed and back off before the next one.
+    
+    Args:
+        feed_state: Stored fetch state of the feed
+        error: Why the check failed
+        now: Current time (UTC, naive)
+    
+    Returns:
+        Consecutive failures, including this one
+    """
+    failures = (feed_state.consecutive_failures or 0) + 1
+    feed_state.consecutive_failures = failures
+    feed_state.last_error = error[:500]
+    feed_state.last_error_at = now
+    feed_state.retry_after = now + backoff_delay(failures)
+    return failures
+
+
+def feed_status(feed_state: Optional[FeedState], now: Optional[datetime] = None) -> str:
+    """
+    Classify the health of a feed.
+    
+    Args:
+        feed_state: Stored fetch state of the feed, if any
+        now: Current time (UTC, naive)
+    
+    Returns:
+        One of FEED_STATUSES
+    """
+    if feed_state is None:
+        return FEED_UNKNOWN
+    
+    failures = feed_state.consecutive_failures or 0
+    if failures == 0:
+        return FEED_OK if feed_state.last_success_at is not None else FEED_UNKNOWN
+    if failures < settings.feed_failure_threshold:
+        return FEED_FAILING
+    
+    now = now or datetime.utcnow()
+    if feed_state.retry_after is not None and feed_state.retry_after > now:
+        return FEED_OPEN
+    return FEED_HALF_OPEN
+
+
+def circuit_open(feed_state: Optional[FeedState], now: Optional[datetime] = None) -> bool:
+    """
+    Whether a feed has failed so often that refreshes must skip it for now.
+    
+    Args:
+        feed_state: Stored fetch state of the feed, if any
+        now: Current time (UTC, naive)
+    
+    Returns:
+        True while the circuit is open
+    """
+    return feed_status(feed_state, now) == FEED_OPEN
@@ -0,0 +1,200 @@
+"""Shared HTTP client for fetching feeds."""
+
+import logging
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+# Brotli is only advertised when a decoder is installed (httpx[brotli])
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        ACCEPT_ENCODING = "br, gzip, deflate"
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+
+USER_AGENT = "podcast-tracker/1.0"
+ACCEPT = "application/rss+xml, application/atom+xml, application/xml;q=0.9, text/xml;q=0.9, */*;q=0.8"
+
+
+class FeedFetchError(Exception):
+    """A feed could not be downloaded."""
+
+
+class FetchResult(NamedTuple):
+    """A downloaded feed."""
+    status_code: int
+    content: bytes
+    headers: Dict[str, str]
+    url: str
+    downloaded_bytes: int = 0
+
+
+class HostLimiter:
+    """Caps the number of simultaneous fetches against the same host."""
+    
+    def __init__(self, limit: int):
+        """
+        Initialize limiter.
+        
+        Args:
+            limit: Maximum concurrent fetches per host
+        """
+        self.limit = max(1, limit)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    
+    def for_url(self, url: str) -> threading.BoundedSemaphore:
+        """
+        Get the semaphore guarding the host of a URL.
+        
+        Args:
+            url: Feed URL
+        
+        Returns:
+            Semaphore shared by every URL on the same host
+        """
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            if host not in self._semaphores:
+                self._semaphores[host] = threading.BoundedSemaphore(self.limit)
+            return self._semaphores[host]
+
+
+class FeedFetcher:
+    """
+    Download feeds over one pooled, keep-alive HTTP client.
+    
+    Connections (and TLS sessions) are reused across feeds on the same host,
+    responses are negotiated compressed, and at most
+    refresh_per_host_limit requests run against a host at a time.
+    """
+    
+    def __init__(
+        self,
+        connect_timeout: float = settings.http_connect_timeout,
+        read_timeout: float = settings.http_read_timeout,
+        total_timeout: float = settings.http_total_timeout,
+        max_body_bytes: int = settings.http_max_body_bytes,
+        max_connections: int = settings.http_max_connections,
+        per_host_limit: int = settings.refresh_per_host_limit
+    ):
+        """
+        Initialize the fetcher; the client is created on first use.
+        
+        Args:
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for each chunk of the response
+            total_timeout: Seconds a whole download may take, so a host
+                trickling bytes cannot hold a refresh indefinitely
+            max_body_bytes: Largest accepted feed, after decompression
+            max_connections: Size of the connection pool
+            per_host_limit: Maximum concurrent requests per host
+        """
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.total_timeout = total_timeout
+        self.max_body_bytes = max_body_bytes
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+        self.host_limiter = HostLimiter(per_host_limit)
+        self._client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def client(self) -> httpx.Client:
+        """The shared client, created on first use."""
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    timeout=self.timeout,
+                    limits=self.limits,
+                    follow_redirects=True,
+                    headers={
+                        "User-Agent": USER_AGENT,
+                        "Accept": ACCEPT,
+                        "Accept-Encoding": ACCEPT_ENCODING,
+                    }
+                )
+            return self._client
+    
+    def fetch(self, url: str, etag: Optional[str] = None, modified: Optional[str] = None) -> FetchResult:
+        """
+        Download a feed, conditionally when validators are given.
+        
+        Args:
+            url: Feed URL
+            etag: ETag returned by the previous fetch
+            modified: Last-Modified value returned by the previous fetch
+        
+        Returns:
+            FetchResult; status_code 304 with an empty body if not modified
+        
+        Raises:
+            FeedFetchError: On network errors, timeouts, error statuses or
+                oversized bodies
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if modified:
+            headers["If-Modified-Since"] = modified
+        
+        try:
+            with self.host_limiter.for_url(url):
+                deadline = time.monotonic() + self.total_timeout
+                with self.client.stream("GET", url, headers=headers) as response:
+                    result_headers = {key.lower(): value for key, value in response.headers.items()}
+                    
+                    if response.status_code == 304:
+                        return FetchResult(304, b"", result_headers, str(response.url), response.num_bytes_downloaded)
+                    if response.status_code >= 400:
+                        raise FeedFetchError(f"HTTP {response.status_code} fetching {url}")
+                    
+                    declared = response.headers.get("content-length", "")
+                    if declared.isdigit() and int(declared) > self.max_body_bytes:
+                        raise FeedFetchError(f"Feed too large ({declared} bytes): {url}")
+                    
+                    # Count decoded bytes, so a small compressed body cannot expand unbounded
+                    chunks = []
+                    size = 0
+                    for chunk in response.iter_bytes():
+                        size += len(chunk)
+                        if size > self.max_body_bytes:
+                            raise FeedFetchError(f"Feed larger than {self.max_body_bytes} bytes: {url}")
+                        if time.monotonic() > deadline:
+                            raise FeedFetchError(f"Download took longer than {self.total_timeout}s: {url}")
+                        chunks.append(chunk)
+                    
+                    return FetchResult(
+                        response.status_code,
+                        b"".join(chunks),
+                        result_headers,
+                        str(response.url),
+                        response.num_bytes_downloaded
+                    )
+        
+        except httpx.HTTPError as e:
+            raise FeedFetchError(f"Error fetching {url}: {e}") from e
+    
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+# Global feed fetcher instance
+feed_fetcher = FeedFetcher()
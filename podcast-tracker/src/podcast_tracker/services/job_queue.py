@@ -0,0 +1,272 @@
+"""Database-backed queue of feed checks, shared by any number of refresh workers."""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import and_, delete, exists, func, insert, literal, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database.models import FeedJob, FeedState, Podcast
+from ..metrics import feed_jobs
+from .feed_health import record_failure
+
+logger = logging.getLogger(__name__)
+
+
+class ClaimedJob(NamedTuple):
+    """A job leased to a worker."""
+    
+    id: int
+    podcast_id: int
+    attempt: int  # Fencing token: the lease is only valid while attempts still equals it
+
+
+class FeedJobQueue:
+    """
+    Queue of feed checks stored in the feed_jobs table.
+    
+    A worker claims jobs by taking a lease on them: the job's available_at
+    moves to the end of the lease, and its attempts counter is incremented.
+    While it works the worker renews the lease; when it is done it deletes
+    the job. If the worker dies, the lease expires and the job is claimed
+    again by another worker. Every write is conditional on the attempt
+    number of the claim, so a worker whose lease expired can neither renew
+    nor complete a job that was claimed again in the meantime.
+    """
+    
+    def __init__(self, db: Session):
+        """
+        Initialize queue with database session.
+        
+        Args:
+            db: SQLAlchemy session
+        """
+        self.db = db
+    
+    def enqueue(self, podcast_ids: Iterable[int], now: Optional[datetime] = None) -> int:
+        """
+        Queue a check of each podcast that has no pending job yet.
+        
+        Args:
+            podcast_ids: Podcasts to check
+            now: Current time (UTC, naive)
+        
+        Returns:
+            Number of jobs queued
+        """
+        podcast_ids = list(podcast_ids)
+        if not podcast_ids:
+            return 0
+        
+        now = now or datetime.utcnow()
+        # A single INSERT ... SELECT, so concurrent schedulers cannot queue a podcast twice
+        pending = exists().where(FeedJob.podcast_id == Podcast.id)
+        queued = self.db.execute(
+            insert(FeedJob).from_select(
+                ["podcast_id", "available_at", "attempts", "created_at"],
+                select(Podcast.id, literal(now), literal(0), literal(now)).where(
+                    Podcast.id.in_(podcast_ids),
+                    ~pending
+                )
+            )
+        ).rowcount
+        self.db.commit()
+        
+        feed_jobs.labels("queued").inc(queued)
+        return queued
+    
+    def claim(
+        self,
+        worker_id: str,
+        limit: int,
+        lease_seconds: Optional[int] = None,
+        now: Optional[datetime] = None,
+        podcast_ids: Optional[Iterable[int]] = None
+    ) -> List[ClaimedJob]:
+        """
+        Lease up to `limit` claimable jobs, oldest first.
+        
+        Jobs whose lease expired are claimable again; those already claimed
+        settings.job_max_attempts times are dropped instead, since their
+        feed keeps killing workers. That counts as a failure of the feed:
+        its next check waits for the backoff, so the scheduler does not
+        queue it again at once.
+        
+        Args:
+            worker_id: Unique name of the claiming worker
+            limit: Most jobs to claim
+            lease_seconds: Length of the lease (settings.job_lease_seconds by default)
+            now: Current time (UTC, naive)
+            podcast_ids: Only claim the jobs of these podcasts (any job by default)
+        
+        Returns:
+            The claimed jobs
+        """
+        now = now or datetime.utcnow()
+        lease = timedelta(seconds=lease_seconds or settings.job_lease_seconds)
+        
+        abandoned = self.db.scalars(
+            delete(FeedJob)
+            .where(FeedJob.available_at <= now, FeedJob.attempts >= settings.job_max_attempts)
+            .returning(FeedJob.podcast_id)
+        ).all()
+        if abandoned:
+            logger.warning(f"Dropped {len(abandoned)} feed job(s) claimed {settings.job_max_attempts} times")
+            feed_jobs.labels("abandoned").inc(len(abandoned))
+            self._back_off(abandoned, now)
+        
+        # One UPDATE takes the leases: SQLite runs it under the write lock,
+        # other databases skip the rows another worker is claiming
+        claimable = (
+            select(FeedJob.id)
+            .where(FeedJob.available_at <= now)
+            .order_by(FeedJob.available_at, FeedJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if podcast_ids is not None:
+            claimable = claimable.where(FeedJob.podcast_id.in_(list(podcast_ids)))
+        rows = self.db.execute(
+            update(FeedJob)
+            .where(FeedJob.id.in_(claimable.scalar_subquery()), FeedJob.available_at <= now)
+            .values(available_at=now + lease, lease_owner=worker_id, attempts=FeedJob.attempts + 1)
+            .returning(FeedJob.id, FeedJob.podcast_id, FeedJob.attempts)
+            .execution_options(synchronize_session=False)
+        ).all()
+        self.db.commit()
+        
+        jobs = sorted(ClaimedJob(*row) for row in rows)
+        reclaimed = sum(1 for job in jobs if job.attempt > 1)
+        feed_jobs.labels("claimed").inc(len(jobs))
+        if reclaimed:
+            logger.info(f"Worker {worker_id} reclaimed {reclaimed} feed job(s) whose lease had expired")
+            feed_jobs.labels("reclaimed").inc(reclaimed)
+        return jobs
+    
+    def pending(self, podcast_ids: Iterable[int]) -> int:
+        """
+        Count the jobs of the given podcasts still in the queue, claimed or not.
+        
+        Args:
+            podcast_ids: Podcasts to look for
+        
+        Returns:
+            Number of jobs
+        """
+        return self.db.scalar(
+            select(func.count()).select_from(FeedJob).where(FeedJob.podcast_id.in_(list(podcast_ids)))
+        )
+    
+    def renew(
+        self,
+        worker_id: str,
+        jobs: List[ClaimedJob],
+        lease_seconds: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> int:
+        """
+        Extend the leases of jobs still held by a worker.
+        
+        Args:
+            worker_id: Worker holding the leases
+            jobs: Jobs it claimed
+            lease_seconds: Length of the new lease (settings.job_lease_seconds by default)
+            now: Current time (UTC, naive)
+        
+        Returns:
+            Number of leases extended
+        """
+        if not jobs:
+            return 0
+        
+        now = now or datetime.utcnow()
+        lease = timedelta(seconds=lease_seconds or settings.job_lease_seconds)
+        renewed = self.db.execute(
+            update(FeedJob)
+            .where(self._held_by(worker_id, jobs))
+            .values(available_at=now + lease)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return renewed
+    
+    def complete(self, worker_id: str, jobs: List[ClaimedJob]) -> int:
+        """
+        Remove finished jobs from the queue.
+        
+        A job whose lease was lost is left alone: it belongs to the worker
+        that claimed it again. Both workers may then check the feed; the
+        episodes stored by the first are skipped by the second (see
+        PodcastService._add_episodes_from_feed).
+        
+        Args:
+            worker_id: Worker holding the leases
+            jobs: Jobs it finished
+        
+        Returns:
+            Number of jobs removed
+        """
+        if not jobs:
+            return 0
+        
+        completed = self.db.execute(
+            delete(FeedJob)
+            .where(self._held_by(worker_id, jobs))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        
+        if completed < len(jobs):
+            logger.warning(f"Worker {worker_id} lost the lease of {len(jobs) - completed} feed job(s)")
+            feed_jobs.labels("lost").inc(len(jobs) - completed)
+        return completed
+    
+    def release(self, worker_id: str, jobs: List[ClaimedJob], now: Optional[datetime] = None) -> int:
+        """
+        Give back jobs without processing them, making them claimable at once.
+        
+        The claim still counts as an attempt.
+        
+        Args:
+            worker_id: Worker holding the leases
+            jobs: Jobs to give back
+            now: Current time (UTC, naive)
+        
+        Returns:
+            Number of jobs released
+        """
+        if not jobs:
+            return 0
+        
+        released = self.db.execute(
+            update(FeedJob)
+            .where(self._held_by(worker_id, jobs))
+            .values(available_at=now or datetime.utcnow(), lease_owner=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return released
+    
+    def _back_off(self, podcast_ids: List[int], now: datetime) -> None:
+        """Record the abandoned checks of the podcasts as failures, postponing their next check."""
+        feed_states = {
+            state.podcast_id: state
+            for state in self.db.query(FeedState).filter(FeedState.podcast_id.in_(podcast_ids))
+        }
+        for podcast_id in podcast_ids:
+            feed_state = feed_states.get(podcast_id)
+            if feed_state is None:
+                feed_state = FeedState(podcast_id=podcast_id, consecutive_failures=0)
+                self.db.add(feed_state)
+            record_failure(feed_state, f"Check abandoned after {settings.job_max_attempts} attempts", now)
+            feed_state.next_check_at = max(feed_state.next_check_at or now, feed_state.retry_after)
+    
+    @staticmethod
+    def _held_by(worker_id: str, jobs: List[ClaimedJob]):
+        """Condition matching the jobs whose claim by the worker is still current."""
+        return and_(
+            FeedJob.lease_owner == worker_id,
+            tuple_(FeedJob.id, FeedJob.attempts).in_([(job.id, job.attempt) for job in jobs])
+        )
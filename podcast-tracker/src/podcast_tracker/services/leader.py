@@ -0,0 +1,175 @@
+"""Leader election through a lease row, so one process runs the scheduled jobs."""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import case, delete, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+
+from ..config import settings
+from ..database import get_db
+from ..database.models import LeaderLease
+
+logger = logging.getLogger(__name__)
+
+# Lease held by the process running PodcastScheduler
+SCHEDULER_LEASE = "scheduler"
+
+
+class LeaderElection:
+    """
+    Hold a named lease in the leader_leases table while this process leads.
+    
+    Every process runs an election thread that tries to take or renew the
+    lease every third of its length. The holder is the leader; when it dies
+    its lease expires and the next process to try takes over. A leader
+    that fails to renew in time steps down.
+    
+    Two leaders can briefly overlap only if clocks disagree by more than
+    the lease; the scheduler tolerates it, since queueing feed jobs is
+    idempotent.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        on_elected: Callable[[], None],
+        on_demoted: Callable[[], None],
+        owner_id: Optional[str] = None,
+        lease_seconds: Optional[int] = None
+    ):
+        """
+        Initialize the election.
+        
+        Args:
+            name: Name of the lease (one leader per name)
+            on_elected: Called when this process becomes the leader
+            on_demoted: Called when it stops being the leader
+            owner_id: Unique name of this process (host, pid and a random suffix by default)
+            lease_seconds: Length of the lease (settings.leader_lease_seconds by default)
+        """
+        self.name = name
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.owner_id = owner_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds or settings.leader_lease_seconds
+        self.is_leader = False
+        self._expires_at = datetime.min
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def try_acquire(self, now: Optional[datetime] = None) -> bool:
+        """
+        Take the lease if it is free or expired, or renew it if already held.
+        
+        Args:
+            now: Current time (UTC, naive)
+        
+        Returns:
+            True if this process holds the lease
+        """
+        now = now or datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        held = LeaderLease.owner == self.owner_id
+        
+        with get_db() as db:
+            taken = db.execute(
+                update(LeaderLease)
+                .where(LeaderLease.name == self.name, or_(held, LeaderLease.expires_at <= now))
+                .values(
+                    owner=self.owner_id,
+                    expires_at=expires_at,
+                    acquired_at=case((held, LeaderLease.acquired_at), else_=now)
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if taken:
+                return True
+            
+            try:
+                db.execute(insert(LeaderLease).values(
+                    name=self.name,
+                    owner=self.owner_id,
+                    expires_at=expires_at,
+                    acquired_at=now
+                ))
+                db.commit()
+            except IntegrityError:
+                # Held by another process
+                db.rollback()
+                return False
+        
+        return True
+    
+    def release(self) -> None:
+        """Give up the lease, so another process can take over at once."""
+        with get_db() as db:
+            db.execute(delete(LeaderLease).where(
+                LeaderLease.name == self.name,
+                LeaderLease.owner == self.owner_id
+            ))
+    
+    def step(self) -> bool:
+        """
+        Run one election round, calling on_elected or on_demoted on a change.
+        
+        Returns:
+            Whether this process is the leader
+        """
+        now = datetime.utcnow()
+        try:
+            leader = self.try_acquire(now)
+        except Exception as e:
+            # Keep leading on the current lease only if it outlasts the next try
+            logger.error(f"Error renewing the {self.name} lease: {e}")
+            leader = self.is_leader and now + timedelta(seconds=self.lease_seconds / 3) < self._expires_at
+        else:
+            if leader:
+                self._expires_at = now + timedelta(seconds=self.lease_seconds)
+        
+        if leader and not self.is_leader:
+            logger.info(f"{self.owner_id} is now the {self.name} leader")
+            self.is_leader = True
+            self.on_elected()
+        elif not leader and self.is_leader:
+            logger.warning(f"{self.owner_id} lost the {self.name} lease")
+            self.is_leader = False
+            self.on_demoted()
+        
+        return self.is_leader
+    
+    def start(self) -> None:
+        """Run the election in a background thread; the first round runs right away."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"leader-{self.name}", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop the election, stepping down and releasing the lease if leading."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        
+        if self.is_leader:
+            self.is_leader = False
+            self.on_demoted()
+            try:
+                self.release()
+            except Exception as e:
+                logger.error(f"Error releasing the {self.name} lease: {e}")
+    
+    def _run(self) -> None:
+        """Election loop."""
+        while True:
+            try:
+                self.step()
+            except Exception as e:
+                logger.error(f"Error in the {self.name} election: {e}")
+            if self._stop.wait(self.lease_seconds / 3):
+                return
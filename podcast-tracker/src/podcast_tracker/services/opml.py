@@ -0,0 +1,96 @@
+"""OPML subscription lists: streaming reader of feed outlines, and export."""
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import BinaryIO, Iterable, Iterator, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from ..database.models import Podcast
+
+
+class OpmlError(ValueError):
+    """The document is not a valid OPML file."""
+
+
+class OpmlFeed(NamedTuple):
+    """A feed listed in an OPML file."""
+    
+    name: str
+    rss_url: str
+    spotify_url: Optional[str] = None
+
+
+def _spotify_url(html_url: Optional[str]) -> Optional[str]:
+    """Keep an outline's htmlUrl when it is a Spotify page, as exported by render_opml."""
+    if html_url and (urlparse(html_url).hostname or "").endswith("spotify.com"):
+        return html_url
+    return None
+
+
+def iter_opml_feeds(source: BinaryIO) -> Iterator[OpmlFeed]:
+    """
+    Yield the feeds of an OPML document as it is parsed.
+    
+    The document is read incrementally and every outline is cleared once
+    read, so even long lists are never held in memory as a tree. Outlines
+    nested in folders are flattened; outlines without an xmlUrl (folders
+    themselves) and repeated URLs are skipped.
+    
+    Args:
+        source: Binary file-like object with the document
+    
+    Yields:
+        OpmlFeed for every feed outline, in document order
+    
+    Raises:
+        OpmlError: If the document is not well-formed OPML
+    """
+    seen = set()
+    root = None
+    try:
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                    if root.tag != "opml":
+                        raise OpmlError(f"Not an OPML document: root element is <{root.tag}>")
+                continue
+            if element.tag != "outline":
+                continue
+            
+            rss_url = (element.get("xmlUrl") or element.get("xmlurl") or "").strip()
+            if rss_url and rss_url not in seen:
+                seen.add(rss_url)
+                name = (element.get("title") or element.get("text") or rss_url).strip()
+                yield OpmlFeed(name[:255], rss_url, _spotify_url(element.get("htmlUrl")))
+            element.clear()
+    except ET.ParseError as e:
+        raise OpmlError(f"Invalid OPML: {e}") from e
+
+
+def render_opml(podcasts: Iterable[Podcast], title: str = "AI Podcast Tracker") -> bytes:
+    """
+    Build an OPML 2.0 document listing the feeds of the given podcasts.
+    
+    Args:
+        podcasts: Podcasts to export
+        title: Title of the list
+    
+    Returns:
+        UTF-8 encoded document
+    """
+    root = ET.Element("opml", version="2.0")
+    head = ET.SubElement(root, "head")
+    ET.SubElement(head, "title").text = title
+    ET.SubElement(head, "dateCreated").text = format_datetime(datetime.now(timezone.utc), usegmt=True)
+    
+    body = ET.SubElement(root, "body")
+    for podcast in podcasts:
+        attributes = {"type": "rss", "text": podcast.name, "title": podcast.name, "xmlUrl": podcast.rss_url}
+        if podcast.spotify_url:
+            attributes["htmlUrl"] = podcast.spotify_url
+        ET.SubElement(body, "outline", attributes)
+    
+    ET.indent(root)
+    return ET.tostring(root, encoding="utf-8", xml_declaration=True) + b"\n"
@@ -1,16 +1,61 @@
 """Business logic for podcast management."""
 
 import logging
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import func, insert, or_, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session, joinedload
+from contextlib import nullcontext
 from datetime import datetime
 
-from ..database.models import Podcast, Episode
+from ..config import settings
+from ..database.models import Podcast, Episode, FeedState, PodcastStats
+from ..database.search import SearchHit, search_episodes
+from ..database.stats import apply_stats_delta, rebuild_podcast_stats
+from ..events import EPISODES_ADDED, LISTENED_CHANGED, MAX_EVENT_EPISODE_IDS, record_event
+from ..metrics import episodes_inserted, feed_store_seconds, feeds_skipped
+from .cadence import CADENCE_SAMPLE, learn_refresh_interval, with_jitter
+from .feed_health import circuit_open, record_failure
+from .http_client import FeedFetchError, HostLimiter
+from .opml import OpmlError, OpmlFeed
 from .rss_parser import RSSParser
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class RefreshStats:
+    """Outcome of a refresh run, updated as feeds are checked."""
+    
+    total: int = 0
+    checked: int = 0
+    new_episodes: int = 0
+    not_modified: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+# Outcome of each feed of an import
+IMPORTED = "imported"
+EXISTING = "exists"
+FAILED = "failed"
+
+
+@dataclass
+class ImportResult:
+    """Outcome of importing one feed."""
+    
+    name: str
+    rss_url: str
+    status: str
+    podcast_id: Optional[int] = None
+    episodes: int = 0
+    error: Optional[str] = None
+
+
 class PodcastService:
     """Service for managing podcasts and episodes."""
     
@@ -32,7 +77,7 @@ class PodcastService:
             name: Podcast name
             rss_url: RSS feed URL
             spotify_url: Optional Spotify URL
-            
+        
         Returns:
             Created Podcast object or None if failed
         """
@@ -66,42 +111,375 @@ class PodcastService:
             
             # Add initial episodes
             self._add_episodes_from_feed(podcast, feed_data["episodes"])
+            self._record_success(podcast, None, feed_data)
             
             return podcast
-            
+        
         except Exception as e:
             logger.error(f"Error adding podcast {name}: {e}")
             self.db.rollback()
             return None
     
+    def import_podcasts(self, feeds: Iterable[OpmlFeed], batch_size: int = 50) -> List[ImportResult]:
+        """
+        Add many podcasts at once, fetching their feeds in parallel.
+        
+        Feeds are consumed lazily (e.g. straight from iter_opml_feeds) and
+        at most twice settings.refresh_concurrency fetches are queued, with
+        settings.refresh_per_host_limit per host. Fetched feeds are stored
+        batch_size at a time: podcasts, episodes, counters and fetch state in
+        one transaction per batch. Feeds already tracked are left alone.
+        
+        Args:
+            feeds: Feeds to add
+            batch_size: Most fetched feeds stored per transaction
+        
+        Returns:
+            ImportResult for every feed, in input order
+        
+        Raises:
+            OpmlError: If the OPML document breaks partway; the feeds read
+                before the error are still imported
+        """
+        known_urls = dict(self.db.query(Podcast.rss_url, Podcast.id))
+        names = {name for (name,) in self.db.query(Podcast.name)}
+        concurrency = max(settings.refresh_concurrency, 1)
+        host_limiter = HostLimiter(settings.refresh_per_host_limit)
+        
+        results: Dict[int, ImportResult] = {}
+        fetched: List[Tuple[int, OpmlFeed, Dict[str, Any]]] = []
+        in_flight = {}
+        
+        def collect(max_in_flight: int) -> None:
+            """Wait for fetches until at most max_in_flight remain, storing full batches."""
+            while len(in_flight) > max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, feed = in_flight.pop(future)
+                    try:
+                        fetched.append((index, feed, future.result()))
+                    except Exception as e:
+                        logger.error(f"Error importing {feed.name}: {e}")
+                        results[index] = ImportResult(feed.name, feed.rss_url, FAILED, error=str(e))
+                
+                if len(fetched) >= batch_size:
+                    results.update(self._store_imported(fetched))
+                    fetched.clear()
+        
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="feed-import") as executor:
+            try:
+                for index, feed in enumerate(feeds):
+                    if feed.rss_url in known_urls:
+                        results[index] = ImportResult(feed.name, feed.rss_url, EXISTING, podcast_id=known_urls[feed.rss_url])
+                        continue
+                    if feed.name in names:
+                        results[index] = ImportResult(
+                            feed.name, feed.rss_url, FAILED, error="Another podcast already has this name"
+                        )
+                        continue
+                    known_urls[feed.rss_url] = None
+                    names.add(feed.name)
+                    
+                    future = executor.submit(self._fetch_feed, feed.rss_url, None, None, host_limiter)
+                    in_flight[future] = (index, feed)
+                    collect(2 * concurrency - 1)
+            except OpmlError:
+                # The document broke partway: keep the feeds read so far, importing again skips them
+                collect(0)
+                if fetched:
+                    self._store_imported(fetched)
+                raise
+            
+            collect(0)
+        
+        if fetched:
+            results.update(self._store_imported(fetched))
+        
+        counts = Counter(result.status for result in results.values())
+        logger.info(
+            f"Import complete: {counts[IMPORTED]} imported, {counts[EXISTING]} already tracked, "
+            f"{counts[FAILED]} failed"
+        )
+        return [results[index] for index in sorted(results)]
+    
+    def _store_imported(self, batch: List[Tuple[int, OpmlFeed, Dict[str, Any]]]) -> Dict[int, ImportResult]:
+        """
+        Store fetched feeds in one transaction, or one by one if that fails.
+        
+        Args:
+            batch: (input index, feed, parsed feed data) of each fetched feed
+        
+        Returns:
+            ImportResult by input index
+        """
+        try:
+            podcast_ids, pub_dates = self._insert_imported(batch)
+        except Exception as e:
+            self.db.rollback()
+            if len(batch) == 1:
+                index, feed, _ = batch[0]
+                logger.error(f"Error importing {feed.name}: {e}")
+                return {index: ImportResult(feed.name, feed.rss_url, FAILED, error=str(e))}
+            
+            # A single bad feed (or a podcast added meanwhile) must not fail the others
+            results = {}
+            for item in batch:
+                results.update(self._store_imported([item]))
+            return results
+        
+        # Committed: nothing from here on may send the feeds back to the retry above
+        # Poll the new feeds at their own cadence instead of all at the next tick
+        self._schedule_next_checks(self.db.query(Podcast).filter(Podcast.id.in_(podcast_ids.values())).all())
+        
+        return {
+            index: ImportResult(
+                feed.name,
+                feed.rss_url,
+                IMPORTED,
+                podcast_id=podcast_ids[feed.rss_url],
+                episodes=len(pub_dates.get(podcast_ids[feed.rss_url], []))
+            )
+            for index, feed, _ in batch
+        }
+    
+    def _insert_imported(
+        self,
+        batch: List[Tuple[int, OpmlFeed, Dict[str, Any]]]
+    ) -> Tuple[Dict[str, int], Dict[int, List[datetime]]]:
+        """
+        Insert and commit the podcasts, episodes, counters and fetch state of fetched feeds.
+        
+        Args:
+            batch: (input index, feed, parsed feed data) of each fetched feed
+        
+        Returns:
+            Podcast id by feed URL, and the stored publication dates of each podcast's episodes
+        """
+        now = datetime.utcnow()
+        podcast_ids = dict(self.db.execute(
+            insert(Podcast).returning(Podcast.rss_url, Podcast.id),
+            [
+                {
+                    "name": feed.name,
+                    "rss_url": feed.rss_url,
+                    "spotify_url": feed.spotify_url,
+                    "description": feed_data.get("description", ""),
+                    "artwork_url": feed_data.get("artwork_url"),
+                }
+                for _, feed, feed_data in batch
+            ]
+        ).all())
+        
+        episode_rows = {}
+        for _, feed, feed_data in batch:
+            rows = {}
+            for ep_data in feed_data["episodes"]:
+                try:
+                    guid = ep_data.get("guid") or ep_data["episode_url"]
+                    if guid not in rows:
+                        rows[guid] = self._episode_row(podcast_ids[feed.rss_url], feed.spotify_url, guid, ep_data)
+                except Exception as e:
+                    logger.error(f"Error adding episode: {e}")
+            episode_rows[feed.rss_url] = list(rows.values())
+        
+        all_rows = [row for rows in episode_rows.values() for row in rows]
+        pub_dates = defaultdict(list)
+        if all_rows:
+            # Dates read back from the database: feeds mix aware and naive ones
+            for podcast_id, pub_date in self.db.execute(
+                insert(Episode).returning(Episode.podcast_id, Episode.pub_date), all_rows
+            ):
+                pub_dates[podcast_id].append(pub_date)
+        rebuild_podcast_stats(self.db.connection(), podcast_ids.values())
+        self.db.execute(insert(FeedState), [
+            {
+                "podcast_id": podcast_ids[feed.rss_url],
+                "etag": feed_data.get("etag"),
+                "last_modified": feed_data.get("last_modified"),
+                "consecutive_failures": 0,
+                "last_success_at": now,
+            }
+            for _, feed, feed_data in batch
+        ])
+        for podcast_id, dates in pub_dates.items():
+            record_event(self.db, EPISODES_ADDED, {
+                "podcast_id": podcast_id,
+                "count": len(dates),
+                "latest_pub_date": max(dates).isoformat(),
+            })
+        self.db.commit()
+        episodes_inserted.inc(len(all_rows))
+        
+        logger.info(f"Imported {len(batch)} podcast(s) with {len(all_rows)} episodes")
+        return podcast_ids, dict(pub_dates)
+    
     def check_new_episodes(self, podcast: Podcast) -> int:
         """
         Check for new episodes for a podcast.
         
         Args:
             podcast: Podcast object
-            
+        
         Returns:
             Number of new episodes added
         """
+        stats = RefreshStats()
+        self._check_feed(podcast, podcast.feed_state, stats)
+        return stats.new_episodes
+    
+    def _check_feed(self, podcast: Podcast, feed_state: Optional[FeedState], stats: RefreshStats) -> None:
+        """
+        Fetch a podcast feed and store its new episodes.
+        
+        Args:
+            podcast: Podcast object
+            feed_state: Stored fetch state of the podcast, if any
+            stats: Refresh statistics to update
+        """
         try:
             logger.info(f"Checking new episodes for: {podcast.name}")
             
-            # Parse RSS feed
-            feed_data = self.rss_parser.parse_feed(podcast.rss_url)
+            # Parse RSS feed, conditional on the validators of the last fetch
+            feed_data = self._fetch_feed(
+                podcast.rss_url,
+                feed_state.etag if feed_state else None,
+                feed_state.last_modified if feed_state else None
+            )
+        
+        except Exception as e:
+            logger.error(f"Error checking new episodes for {podcast.name}: {e}")
+            self._record_failure(podcast, feed_state, str(e))
+            stats.failed += 1
+            return
+        
+        self._apply_feed(podcast, feed_state, feed_data, stats)
+    
+    def _apply_feed(
+        self,
+        podcast: Podcast,
+        feed_state: Optional[FeedState],
+        feed_data: Optional[Dict[str, Any]],
+        stats: RefreshStats
+    ) -> None:
+        """
+        Store the episodes of an already fetched feed.
+        
+        Args:
+            podcast: Podcast object
+            feed_state: Stored fetch state of the podcast, if any
+            feed_data: Result of RSSParser.parse_feed
+            stats: Refresh statistics to update
+        """
+        try:
             if not feed_data:
                 logger.error(f"Failed to parse RSS feed for: {podcast.name}")
-                return 0
+                self._record_failure(podcast, feed_state, "Failed to parse RSS feed")
+                stats.failed += 1
+                return
             
-            # Add new episodes
-            new_count = self._add_episodes_from_feed(podcast, feed_data["episodes"])
+            if feed_data.get("not_modified"):
+                logger.info(f"Feed not modified, skipping: {podcast.name}")
+                self._record_success(podcast, feed_state)
+                stats.not_modified += 1
+                return
             
-            logger.info(f"Added {new_count} new episodes for: {podcast.name}")
-            return new_count
+            with feed_store_seconds.time():
+                # Add new episodes
+                new_count = self._add_episodes_from_feed(podcast, feed_data["episodes"])
+                
+                # Only remember the validators once the episodes are stored
+                self._record_success(podcast, feed_state, feed_data)
             
+            logger.info(f"Added {new_count} new episodes for: {podcast.name}")
+            stats.new_episodes += new_count
+        
         except Exception as e:
             logger.error(f"Error checking new episodes for {podcast.name}: {e}")
-            return 0
+            self.db.rollback()
+            self._record_failure(podcast, feed_state, str(e))
+            stats.failed += 1
+    
+    def _get_feed_state(self, podcast: Podcast, feed_state: Optional[FeedState]) -> FeedState:
+        """
+        Get the fetch state of a podcast, creating it on first use.
+        
+        Args:
+            podcast: Podcast object
+            feed_state: Stored fetch state of the podcast, if already loaded
+        
+        Returns:
+            FeedState object, attached to the session
+        """
+        if feed_state is None:
+            feed_state = self.db.get(FeedState, podcast.id)
+        if feed_state is None:
+            feed_state = FeedState(podcast_id=podcast.id, consecutive_failures=0)
+            self.db.add(feed_state)
+        return feed_state
+    
+    def _record_success(
+        self,
+        podcast: Podcast,
+        feed_state: Optional[FeedState],
+        feed_data: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Persist a successful fetch: close the circuit and keep the validators.
+        
+        Args:
+            podcast: Podcast object
+            feed_state: Stored fetch state of the podcast, if any
+            feed_data: Result of RSSParser.parse_feed, None for a 304
+        """
+        feed_state = self._get_feed_state(podcast, feed_state)
+        
+        if feed_data is not None:
+            feed_state.etag = feed_data.get("etag")
+            feed_state.last_modified = feed_data.get("last_modified")
+        
+        if feed_state.consecutive_failures:
+            logger.info(f"Feed recovered after {feed_state.consecutive_failures} failure(s): {podcast.name}")
+        feed_state.consecutive_failures = 0
+        feed_state.retry_after = None
+        feed_state.last_success_at = datetime.utcnow()
+        self.db.commit()
+    
+    def _record_failure(
+        self,
+        podcast: Podcast,
+        feed_state: Optional[FeedState],
+        error: str,
+        now: Optional[datetime] = None
+    ) -> None:
+        """
+        Persist a failed fetch and back off before the next one.
+        
+        Every consecutive failure doubles the wait (see backoff_delay); from
+        settings.feed_failure_threshold failures on, refreshes skip the feed
+        until the wait is over.
+        
+        Args:
+            podcast: Podcast object
+            feed_state: Stored fetch state of the podcast, if any
+            error: Why the fetch failed
+            now: Current time (UTC, naive)
+        """
+        now = now or datetime.utcnow()
+        try:
+            feed_state = self._get_feed_state(podcast, feed_state)
+            failures = record_failure(feed_state, error, now)
+            self.db.commit()
+        
+        except Exception as e:
+            logger.error(f"Error recording the failure of {podcast.name}: {e}")
+            self.db.rollback()
+            return
+        
+        if failures == settings.feed_failure_threshold:
+            logger.warning(
+                f"{podcast.name} failed {failures} times in a row; "
+                f"skipping it until {feed_state.retry_after:%Y-%m-%d %H:%M} UTC"
+            )
     
     def _add_episodes_from_feed(self, podcast: Podcast, episodes_data: List[dict]) -> int:
         """
@@ -110,47 +488,116 @@ class PodcastService:
         Args:
             podcast: Podcast object
             episodes_data: List of episode dictionaries
-            
+        
         Returns:
             Number of new episodes added
         """
-        new_count = 0
+        # Load the identity of every stored episode in one query. Rows stored
+        # before GUIDs were tracked are matched on (title, pub_date) instead.
+        titles_by_guid = {}
+        legacy_ids = {}
+        for episode_id, guid, title, pub_date in self.db.query(
+            Episode.id, Episode.guid, Episode.title, Episode.pub_date
+        ).filter(Episode.podcast_id == podcast.id):
+            if guid is None:
+                legacy_ids[self._episode_key(title, pub_date)] = episode_id
+            else:
+                titles_by_guid[guid] = (episode_id, title)
+        
+        podcast_id = podcast.id
+        spotify_url = podcast.spotify_url  # Use podcast's Spotify URL
+        rows = []
+        updates = []
         
         for ep_data in episodes_data:
             try:
-                # Check if episode already exists
-                existing = self.db.query(Episode).filter(
-                    Episode.podcast_id == podcast.id,
-                    Episode.title == ep_data["title"],
-                    Episode.pub_date == ep_data["pub_date"]
-                ).first()
+                guid = ep_data.get("guid") or ep_data["episode_url"]
+                title = ep_data["title"]
                 
-                if existing:
+                if guid in titles_by_guid:
+                    # Known episode: follow title edits instead of duplicating it
+                    episode_id, stored_title = titles_by_guid[guid]
+                    if episode_id is not None and stored_title != title:
+                        updates.append({"id": episode_id, "title": title})
+                        titles_by_guid[guid] = (episode_id, title)
                     continue
                 
-                # Create new episode
-                episode = Episode(
-                    podcast_id=podcast.id,
-                    title=ep_data["title"],
-                    description=ep_data.get("description", ""),
-                    pub_date=ep_data["pub_date"],
-                    duration=ep_data.get("duration"),
-                    episode_url=ep_data["episode_url"],
-                    spotify_url=podcast.spotify_url,  # Use podcast's Spotify URL
-                    listened=False
-                )
-                
-                self.db.add(episode)
-                new_count += 1
+                legacy_id = legacy_ids.pop(self._episode_key(title, ep_data["pub_date"]), None)
+                if legacy_id is not None:
+                    updates.append({"id": legacy_id, "guid": guid})
+                    titles_by_guid[guid] = (legacy_id, title)
+                    continue
                 
+                rows.append(self._episode_row(podcast_id, spotify_url, guid, ep_data))
+                titles_by_guid[guid] = (None, title)
+            
             except Exception as e:
                 logger.error(f"Error adding episode: {e}")
                 continue
         
-        if new_count > 0:
+        if updates:
+            self.db.execute(update(Episode), updates)
+        pub_dates = []
+        if rows:
+            # Another check of the same feed (a worker whose lease expired) may
+            # have stored some of them since they were loaded: skip those
+            pub_dates = self.db.scalars(
+                sqlite_insert(Episode)
+                .on_conflict_do_nothing(index_elements=[Episode.podcast_id, Episode.guid])
+                .returning(Episode.pub_date),
+                rows
+            ).all()
+        if pub_dates:
+            # Bulk inserts bypass the ORM flush hook that maintains the counters
+            apply_stats_delta(
+                self.db.connection(),
+                podcast_id,
+                total=len(pub_dates),
+                pending=len(pub_dates),
+                latest_pub_date=max(pub_dates)
+            )
+            record_event(self.db, EPISODES_ADDED, {
+                "podcast_id": podcast_id,
+                "count": len(pub_dates),
+                "latest_pub_date": max(pub_dates).isoformat(),
+            })
+        if updates or rows:
             self.db.commit()
+        episodes_inserted.inc(len(pub_dates))
         
-        return new_count
+        return len(pub_dates)
+    
+    @staticmethod
+    def _episode_row(podcast_id: int, spotify_url: Optional[str], guid: str, ep_data: dict) -> Dict[str, Any]:
+        """Build the values of a new episode from parsed feed data."""
+        return {
+            "podcast_id": podcast_id,
+            "guid": guid,
+            "title": ep_data["title"],
+            "description": ep_data.get("description", ""),
+            "pub_date": ep_data["pub_date"],
+            "duration": ep_data.get("duration"),
+            "episode_url": ep_data["episode_url"],
+            "spotify_url": spotify_url,
+            "listened": False,
+        }
+    
+    @staticmethod
+    def _episode_key(title: str, pub_date: datetime) -> Tuple[str, datetime]:
+        """
+        Build the de-duplication key of an episode.
+        
+        SQLite stores DateTime values without their timezone, so the offset
+        is dropped here to compare feed dates with stored ones.
+        
+        Args:
+            title: Episode title
+            pub_date: Publication date
+        
+        Returns:
+            (title, naive pub_date) tuple
+        """
+        return title, pub_date.replace(tzinfo=None)
     
     def mark_as_listened(self, episode_id: int) -> bool:
         """
@@ -158,7 +605,7 @@ class PodcastService:
         
         Args:
             episode_id: Episode ID
-            
+        
         Returns:
             True if successful, False otherwise
         """
@@ -168,37 +615,214 @@ class PodcastService:
                 logger.warning(f"Episode not found: {episode_id}")
                 return False
             
-            episode.listened = True
-            self.db.commit()
+            self.set_listened(episode, True)
             
             logger.info(f"Marked episode as listened: {episode.title}")
             return True
-            
+        
         except Exception as e:
             logger.error(f"Error marking episode as listened: {e}")
             self.db.rollback()
             return False
     
-    def get_pending_episodes(self, limit: int = 50, offset: int = 0) -> List[Episode]:
+    def set_listened(self, episode: Episode, listened: bool) -> Episode:
+        """
+        Set the listened state of an episode.
+        
+        The podcast's pending counter is adjusted in the same transaction by
+        the flush hook in database/stats.py. A change is logged for
+        /api/events subscribers in the same transaction.
+        
+        Args:
+            episode: Episode object
+            listened: New listened state
+        
+        Returns:
+            The refreshed Episode object
+        """
+        if episode.listened != listened:
+            record_event(self.db, LISTENED_CHANGED, {
+                "listened": listened,
+                "count": 1,
+                "episode_ids": [episode.id],
+                "podcast_ids": [episode.podcast_id],
+            })
+        episode.listened = listened
+        self.db.commit()
+        self.db.refresh(episode)
+        return episode
+    
+    def set_listened_bulk(
+        self,
+        listened: bool,
+        episode_ids: Optional[List[int]] = None,
+        podcast_id: Optional[int] = None,
+        before: Optional[datetime] = None
+    ) -> int:
+        """
+        Set the listened state of many episodes with one UPDATE and one commit.
+        
+        Episodes are selected by id, or by podcast and/or publication date.
+        Only episodes whose state actually changes are updated and counted.
+        
+        Args:
+            listened: New listened state
+            episode_ids: Episodes to update
+            podcast_id: Update the episodes of this podcast
+            before: Update the episodes published before this date
+        
+        Returns:
+            Number of episodes updated
+        """
+        conditions = [Episode.listened != listened]
+        if episode_ids is not None:
+            conditions.append(Episode.id.in_(episode_ids))
+        if podcast_id is not None:
+            conditions.append(Episode.podcast_id == podcast_id)
+        if before is not None:
+            conditions.append(Episode.pub_date < before.replace(tzinfo=None))
+        
+        statement = update(Episode).where(*conditions).values(listened=listened)
+        conn = self.db.connection()
+        
+        # Set-based updates bypass the ORM flush hook that maintains the counters
+        if conn.dialect.update_returning:
+            changed_ids = []
+            changed = Counter()
+            for episode_id, changed_podcast_id in self.db.execute(
+                statement.returning(Episode.id, Episode.podcast_id),
+                execution_options={"synchronize_session": False}
+            ):
+                changed_ids.append(episode_id)
+                changed[changed_podcast_id] += 1
+            for changed_podcast_id, count in changed.items():
+                apply_stats_delta(conn, changed_podcast_id, pending=-count if listened else count)
+            updated = len(changed_ids)
+            podcast_ids = sorted(changed)
+        else:
+            changed_ids = None
+            updated = self.db.execute(
+                statement, execution_options={"synchronize_session": False}
+            ).rowcount
+            if updated:
+                rebuild_podcast_stats(conn, [podcast_id] if podcast_id is not None else None)
+            podcast_ids = [podcast_id] if podcast_id is not None else None
+        
+        if updated:
+            record_event(self.db, LISTENED_CHANGED, {
+                "listened": listened,
+                "count": updated,
+                "episode_ids": sorted(changed_ids) if changed_ids and updated <= MAX_EVENT_EPISODE_IDS else None,
+                "podcast_ids": podcast_ids,
+            })
+        self.db.commit()
+        
+        logger.info(f"Marked {updated} episode(s) as {'listened' if listened else 'not listened'}")
+        return updated
+    
+    def get_pending_episodes(
+        self,
+        limit: int = 50,
+        offset: int = 0,
+        podcast_id: Optional[int] = None
+    ) -> List[Episode]:
         """
         Get pending (not listened) episodes.
         
         Args:
             limit: Maximum number of episodes to return
             offset: Offset for pagination
-            
+            podcast_id: Only return episodes of this podcast
+        
         Returns:
             List of Episode objects
         """
         return (
-            self.db.query(Episode)
-            .filter(Episode.listened == False)
-            .order_by(Episode.pub_date.desc())
+            self.pending_episodes_query(podcast_id)
             .limit(limit)
             .offset(offset)
             .all()
         )
     
+    def count_pending_episodes(self, podcast_id: Optional[int] = None) -> int:
+        """
+        Count pending episodes from the maintained per-podcast counters.
+        
+        Args:
+            podcast_id: Only count episodes of this podcast
+        
+        Returns:
+            Number of unlistened episodes
+        """
+        query = self.db.query(func.coalesce(func.sum(PodcastStats.pending_count), 0))
+        
+        if podcast_id:
+            query = query.filter(PodcastStats.podcast_id == podcast_id)
+        
+        return query.scalar()
+    
+    def pending_episodes_query(
+        self,
+        podcast_id: Optional[int] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ):
+        """
+        Build the query listing pending episodes, newest first.
+        
+        The filter and ordering match the (listened, pub_date) and
+        (podcast_id, listened, pub_date) indexes, so SQLite walks an index
+        instead of sorting the table. Ties on pub_date are broken by id,
+        which SQLite stores at the end of every index entry.
+        
+        Args:
+            podcast_id: Only list episodes of this podcast
+            after: (pub_date, id) of the last episode already seen; only
+                older episodes are listed (keyset pagination)
+        
+        Returns:
+            SQLAlchemy query
+        """
+        query = self.db.query(Episode).filter(Episode.listened == False)
+        
+        if podcast_id:
+            query = query.filter(Episode.podcast_id == podcast_id)
+        
+        if after is not None:
+            query = query.filter(tuple_(Episode.pub_date, Episode.id) < tuple_(*after))
+        
+        return query.order_by(Episode.pub_date.desc(), Episode.id.desc())
+    
+    def search_episodes(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        podcast_id: Optional[int] = None
+    ) -> List[Tuple[Episode, SearchHit]]:
+        """
+        Search episode titles and descriptions, best matches first.
+        
+        Args:
+            query: Text entered by the user
+            limit: Maximum number of episodes to return
+            offset: Offset for pagination
+            podcast_id: Only search episodes of this podcast
+        
+        Returns:
+            List of (Episode, SearchHit) pairs, with podcasts loaded
+        """
+        hits = search_episodes(self.db.connection(), query, limit, offset, podcast_id)
+        if not hits:
+            return []
+        
+        episodes = {
+            episode.id: episode
+            for episode in self.db.query(Episode)
+            .options(joinedload(Episode.podcast))
+            .filter(Episode.id.in_([hit.episode_id for hit in hits]))
+        }
+        return [(episodes[hit.episode_id], hit) for hit in hits if hit.episode_id in episodes]
+    
     def get_all_podcasts(self) -> List[Podcast]:
         """
         Get all podcasts.
@@ -215,12 +839,211 @@ class PodcastService:
         Returns:
             Total number of new episodes added
         """
-        podcasts = self.get_all_podcasts()
-        total_new = 0
+        return self.refresh_podcasts().new_episodes
+    
+    def refresh_podcasts(
+        self,
+        podcasts: Optional[List[Podcast]] = None,
+        stats: Optional[RefreshStats] = None
+    ) -> RefreshStats:
+        """
+        Refresh podcasts and report what happened to each feed.
+        
+        Feeds whose circuit is open (see services/feed_health.py) are not
+        fetched; they are counted in stats.skipped, not in stats.total.
+        
+        Args:
+            podcasts: Podcasts to refresh (all podcasts by default)
+            stats: RefreshStats to update while the run progresses
+        
+        Returns:
+            RefreshStats for the run
+        """
+        if podcasts is None:
+            podcasts = self.get_all_podcasts()
+        
+        stats = stats if stats is not None else RefreshStats()
+        feed_states = {
+            state.podcast_id: state
+            for state in self.db.query(FeedState).filter(
+                FeedState.podcast_id.in_([podcast.id for podcast in podcasts])
+            )
+        }
+        
+        # Known-bad feeds would only cost wall time: leave them to their backoff
+        now = datetime.utcnow()
+        open_circuits = {podcast.id for podcast in podcasts if circuit_open(feed_states.get(podcast.id), now)}
+        if open_circuits:
+            podcasts = [podcast for podcast in podcasts if podcast.id not in open_circuits]
+            logger.info(f"Skipping {len(open_circuits)} feed(s) with an open circuit")
+            feeds_skipped.inc(len(open_circuits))
+        stats.skipped = len(open_circuits)
+        stats.total = len(podcasts)
+        
+        if settings.refresh_concurrency > 1 and len(podcasts) > 1:
+            self._refresh_concurrently(podcasts, feed_states, stats)
+        else:
+            for podcast in podcasts:
+                self._check_feed(podcast, feed_states.get(podcast.id), stats)
+                stats.checked += 1
+        
+        self._schedule_next_checks(podcasts)
+        
+        logger.info(
+            f"Refresh complete. Added {stats.new_episodes} new episodes total "
+            f"({stats.not_modified} feeds not modified, {stats.failed} failed, {stats.skipped} skipped)."
+        )
+        return stats
+    
+    def get_due_podcasts(self, now: Optional[datetime] = None) -> List[Podcast]:
+        """
+        Get the podcasts whose next scheduled check has come.
         
-        for podcast in podcasts:
-            new_count = self.check_new_episodes(podcast)
-            total_new += new_count
+        Podcasts never checked before are always due.
+        
+        Args:
+            now: Current time (UTC, naive)
+        
+        Returns:
+            List of Podcast objects
+        """
+        now = now or datetime.utcnow()
+        return (
+            self.db.query(Podcast)
+            .outerjoin(FeedState)
+            .filter(or_(FeedState.next_check_at.is_(None), FeedState.next_check_at <= now))
+            .all()
+        )
+    
+    def _schedule_next_checks(self, podcasts: List[Podcast], now: Optional[datetime] = None) -> None:
+        """
+        Schedule the next check of each podcast from its publication cadence.
+        
+        A failing feed is not checked before its backoff is over.
+        
+        Args:
+            podcasts: Podcasts just checked
+            now: Current time (UTC, naive)
+        """
+        now = now or datetime.utcnow()
+        podcast_ids = [podcast.id for podcast in podcasts]
+        
+        # Latest CADENCE_SAMPLE publication dates of every podcast, in one query
+        recent = (
+            select(
+                Episode.podcast_id,
+                Episode.pub_date,
+                func.row_number().over(
+                    partition_by=Episode.podcast_id,
+                    order_by=Episode.pub_date.desc()
+                ).label("position")
+            )
+            .where(Episode.podcast_id.in_(podcast_ids))
+            .subquery()
+        )
+        pub_dates = defaultdict(list)
+        for podcast_id, pub_date in self.db.execute(
+            select(recent.c.podcast_id, recent.c.pub_date).where(recent.c.position <= CADENCE_SAMPLE)
+        ):
+            pub_dates[podcast_id].append(pub_date)
+        
+        feed_states = {
+            state.podcast_id: state
+            for state in self.db.query(FeedState).filter(FeedState.podcast_id.in_(podcast_ids))
+        }
+        
+        try:
+            for podcast_id in podcast_ids:
+                feed_state = feed_states.get(podcast_id)
+                if feed_state is None:
+                    feed_state = FeedState(podcast_id=podcast_id)
+                    self.db.add(feed_state)
+                
+                interval = learn_refresh_interval(pub_dates[podcast_id], now)
+                feed_state.check_interval_seconds = int(interval.total_seconds())
+                feed_state.next_check_at = now + with_jitter(interval)
+                if feed_state.retry_after is not None and feed_state.retry_after > feed_state.next_check_at:
+                    feed_state.next_check_at = feed_state.retry_after
+            
+            self.db.commit()
+        
+        except Exception as e:
+            logger.error(f"Error scheduling the next feed checks: {e}")
+            self.db.rollback()
+    
+    def _refresh_concurrently(
+        self,
+        podcasts: List[Podcast],
+        feed_states: Dict[int, FeedState],
+        stats: RefreshStats
+    ) -> None:
+        """
+        Fetch feeds in parallel and store their episodes from this thread.
+        
+        Worker threads only download and parse feeds; the session is never
+        handed to them, so every DB write happens here, one feed at a time.
+        
+        Args:
+            podcasts: Podcasts to refresh
+            feed_states: Stored fetch state by podcast id
+            stats: Refresh statistics to update
+        """
+        host_limiter = HostLimiter(settings.refresh_per_host_limit)
+        
+        with ThreadPoolExecutor(
+            max_workers=settings.refresh_concurrency,
+            thread_name_prefix="feed-fetch"
+        ) as executor:
+            futures = {}
+            for podcast in podcasts:
+                logger.info(f"Checking new episodes for: {podcast.name}")
+                feed_state = feed_states.get(podcast.id)
+                future = executor.submit(
+                    self._fetch_feed,
+                    podcast.rss_url,
+                    feed_state.etag if feed_state else None,
+                    feed_state.last_modified if feed_state else None,
+                    host_limiter
+                )
+                futures[future] = podcast
+            
+            for future in as_completed(futures):
+                podcast = futures[future]
+                try:
+                    feed_data = future.result()
+                except Exception as e:
+                    logger.error(f"Error checking new episodes for {podcast.name}: {e}")
+                    self._record_failure(podcast, feed_states.get(podcast.id), str(e))
+                    stats.failed += 1
+                else:
+                    self._apply_feed(podcast, feed_states.get(podcast.id), feed_data, stats)
+                stats.checked += 1
+    
+    def _fetch_feed(
+        self,
+        rss_url: str,
+        etag: Optional[str],
+        modified: Optional[str],
+        host_limiter: Optional[HostLimiter] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch and parse a feed, holding its host slot when given a limiter.
+        
+        Args:
+            rss_url: RSS feed URL
+            etag: ETag of the previous fetch
+            modified: Last-Modified value of the previous fetch
+            host_limiter: Per-host concurrency limiter
+        
+        Returns:
+            Parsed feed data
+        
+        Raises:
+            FeedFetchError: If the feed cannot be fetched or parsed
+        """
+        with host_limiter.for_url(rss_url) if host_limiter else nullcontext():
+            feed_data = self.rss_parser.parse_feed(rss_url, etag=etag, modified=modified)
         
-        logger.info(f"Refresh complete. Added {total_new} new episodes total.")
-        return total_new
+        if not feed_data:
+            raise FeedFetchError(self.rss_parser.last_error() or "Failed to parse RSS feed")
+        return feed_data
@@ -0,0 +1,321 @@
+"""Manual refresh jobs, with concurrent requests collapsed onto one run."""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..database import get_db
+from ..database.models import RefreshJobState
+from ..metrics import refresh_job_seconds
+from .job_queue import FeedJobQueue
+from .podcast_service import PodcastService, RefreshStats
+from .worker import RefreshWorker
+
+logger = logging.getLogger(__name__)
+
+# Job kind: manual refreshes check every podcast
+REFRESH_ALL = "all"
+
+# Job statuses
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+IN_FLIGHT = (QUEUED, RUNNING)
+
+
+@dataclass
+class RefreshJob:
+    """A refresh run and its live progress."""
+    
+    id: str
+    kind: str
+    status: str = QUEUED
+    stats: RefreshStats = field(default_factory=RefreshStats)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
+    _done: threading.Event = field(default_factory=threading.Event, repr=False)
+    
+    @property
+    def in_flight(self) -> bool:
+        """Whether the job has not finished yet."""
+        return self.status in IN_FLIGHT
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the job finishes; returns False on timeout.
+        
+        Only jobs run by this process finish while waited for: poll
+        RefreshJobManager.get for the others.
+        """
+        return self._done.wait(timeout)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Snapshot of the job, with its counters flattened."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+            **asdict(self.stats),
+        }
+
+
+class RefreshJobManager:
+    """
+    Run manual refreshes in a background thread, one at a time.
+    
+    Jobs are stored in the refresh_jobs table, so every server process
+    reports the same progress. A refresh requested while another one is
+    queued or running, in any process, is not started: the caller gets the
+    in-flight job instead (single flight). The process running a job saves
+    its progress as it goes and renews its heartbeat; an in-flight job
+    whose heartbeat is older than stale_seconds lost its process and is
+    marked as failed.
+    
+    The feeds are checked through the feed job queue, like scheduled
+    checks: the job queues every podcast, then claims and processes the
+    queued checks itself as one more refresh worker. A feed already being
+    checked by another worker, or another process's manual refresh, is not
+    checked twice; the job waits for that worker to finish it.
+    """
+    
+    def __init__(self, history: int = 20, stale_seconds: Optional[int] = None):
+        """
+        Initialize the manager.
+        
+        Args:
+            history: Number of jobs kept for status lookups
+            stale_seconds: Age of the heartbeat of an abandoned job
+                (settings.job_lease_seconds by default)
+        """
+        self.history = history
+        self.stale_seconds = stale_seconds or settings.job_lease_seconds
+        self.owner_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Dict[str, RefreshJob] = {}
+        self._lock = threading.Lock()
+    
+    def submit(self) -> Tuple[RefreshJob, bool]:
+        """
+        Start a refresh of every podcast, or join the one in flight.
+        
+        Returns:
+            (job, created) where created is False if an in-flight job was returned
+        """
+        job = RefreshJob(id=uuid.uuid4().hex, kind=REFRESH_ALL)
+        
+        with get_db() as db:
+            self._fail_abandoned(db, job.created_at)
+            # A single INSERT ... SELECT, so concurrent requests cannot start two jobs
+            in_flight = exists().where(RefreshJobState.status.in_(IN_FLIGHT))
+            created = db.execute(
+                insert(RefreshJobState).from_select(
+                    ["id", "kind", "status", "owner", "created_at", "heartbeat_at"],
+                    select(
+                        literal(job.id), literal(job.kind), literal(QUEUED), literal(self.owner_id),
+                        literal(job.created_at), literal(job.created_at)
+                    ).where(~in_flight)
+                )
+            ).rowcount
+            
+            if created:
+                kept = select(RefreshJobState.id).order_by(RefreshJobState.created_at.desc()).limit(self.history)
+                db.execute(delete(RefreshJobState).where(
+                    RefreshJobState.status.notin_(IN_FLIGHT),
+                    RefreshJobState.id.notin_(kept.scalar_subquery())
+                ))
+            else:
+                current = db.scalars(select(RefreshJobState).where(RefreshJobState.status.in_(IN_FLIGHT))).first()
+                joined = self._from_state(current) if current is not None else None
+        
+        if not created:
+            if joined is None:
+                # It finished meanwhile: start a new one
+                return self.submit()
+            with self._lock:
+                return self._running.get(joined.id, joined), False
+        
+        with self._lock:
+            self._running[job.id] = job
+        threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"refresh-{job.id[:8]}",
+            daemon=True
+        ).start()
+        return job, True
+    
+    def get(self, job_id: str) -> Optional[RefreshJob]:
+        """Get a recent job by id, whichever process runs it."""
+        with self._lock:
+            job = self._running.get(job_id)
+        if job is not None:
+            return job
+        
+        now = datetime.utcnow()
+        with get_db() as db:
+            state = db.get(RefreshJobState, job_id)
+            if state is None:
+                return None
+            if state.status in IN_FLIGHT and state.heartbeat_at < self._stale_before(now):
+                self._fail_abandoned(db, now)
+                db.refresh(state)
+            return self._from_state(state)
+    
+    def _stale_before(self, now: datetime) -> datetime:
+        """Heartbeat before which an in-flight job has lost its process."""
+        return now - timedelta(seconds=self.stale_seconds)
+    
+    def _fail_abandoned(self, db: Session, now: datetime) -> None:
+        """Mark the in-flight jobs whose process stopped as failed."""
+        db.execute(
+            update(RefreshJobState)
+            .where(RefreshJobState.status.in_(IN_FLIGHT), RefreshJobState.heartbeat_at < self._stale_before(now))
+            .values(status=FAILED, error="The process running the job stopped", finished_at=now)
+        )
+    
+    @staticmethod
+    def _from_state(state: RefreshJobState) -> RefreshJob:
+        """Build a snapshot of a stored job."""
+        job = RefreshJob(
+            id=state.id,
+            kind=state.kind,
+            status=state.status,
+            stats=RefreshStats(**{stat.name: getattr(state, stat.name) for stat in fields(RefreshStats)}),
+            created_at=state.created_at,
+            started_at=state.started_at,
+            finished_at=state.finished_at,
+            error=state.error
+        )
+        if not job.in_flight:
+            job._done.set()
+        return job
+    
+    def _save(self, job: RefreshJob) -> None:
+        """Store the status and progress of a job run by this process, renewing its heartbeat."""
+        with get_db() as db:
+            db.execute(
+                update(RefreshJobState)
+                .where(RefreshJobState.id == job.id)
+                .values(
+                    status=job.status,
+                    started_at=job.started_at,
+                    finished_at=job.finished_at,
+                    error=job.error[:500] if job.error else None,
+                    heartbeat_at=datetime.utcnow(),
+                    **asdict(job.stats)
+                )
+            )
+    
+    @contextmanager
+    def _heartbeat(self, job: RefreshJob) -> Iterator[None]:
+        """Save the job every third of stale_seconds while the block runs, even mid-batch."""
+        done = threading.Event()
+        
+        def beat():
+            while not done.wait(self.stale_seconds / 3):
+                try:
+                    self._save(job)
+                except Exception as e:
+                    logger.error(f"Could not save refresh job {job.id}: {e}")
+        
+        thread = threading.Thread(target=beat, name=f"refresh-beat-{job.id[:8]}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
+    
+    def _run(self, job: RefreshJob) -> None:
+        """Run a job with its own session."""
+        job.status = RUNNING
+        job.started_at = datetime.utcnow()
+        started = time.perf_counter()
+        
+        try:
+            self._save(job)
+            with self._heartbeat(job):
+                with get_db() as db:
+                    podcast_ids = [podcast.id for podcast in PodcastService(db).get_all_podcasts()]
+                    FeedJobQueue(db).enqueue(podcast_ids)
+                
+                if podcast_ids:
+                    self._drain(job, podcast_ids)
+            
+            job.status = SUCCEEDED
+            if job.stats.total:
+                logger.info(
+                    f"Refresh job {job.id} complete. Found {job.stats.new_episodes} new episodes "
+                    f"({job.stats.not_modified} feeds not modified, {job.stats.failed} failed, "
+                    f"{job.stats.skipped} skipped)."
+                )
+        
+        except Exception as e:
+            logger.error(f"Error in refresh job {job.id}: {e}")
+            job.status = FAILED
+            job.error = str(e)
+        
+        finally:
+            job.finished_at = datetime.utcnow()
+            refresh_job_seconds.labels(job.kind, job.status).observe(time.perf_counter() - started)
+            try:
+                self._save(job)
+            except Exception as e:
+                logger.error(f"Could not save refresh job {job.id}: {e}")
+            with self._lock:
+                self._running.pop(job.id, None)
+            job._done.set()
+    
+    def _drain(self, job: RefreshJob, podcast_ids: List[int]) -> None:
+        """
+        Process the queued checks of the podcasts until none is left.
+        
+        stats.checked counts every finished check, including those made by
+        other workers; the other counters only cover the feeds this job
+        checked itself.
+        """
+        worker = RefreshWorker()
+        stats = job.stats
+        stats.total = len(podcast_ids)
+        
+        while True:
+            batch = RefreshStats()
+            claimed = worker.run_once(batch, podcast_ids)
+            stats.new_episodes += batch.new_episodes
+            stats.not_modified += batch.not_modified
+            stats.failed += batch.failed
+            stats.skipped += batch.skipped
+            
+            with get_db() as db:
+                remaining = FeedJobQueue(db).pending(podcast_ids)
+            
+            # Feeds with an open circuit are skipped, not checked
+            stats.total = len(podcast_ids) - stats.skipped
+            stats.checked = max(stats.total - remaining, 0)
+            self._save(job)
+            if not remaining:
+                return
+            if not claimed:
+                # The rest are being checked by other workers
+                time.sleep(worker.poll_seconds)
+
+
+# Global refresh job manager instance
+refresh_jobs = RefreshJobManager()
@@ -2,36 +2,165 @@
 
 import feedparser
 import logging
-from datetime import datetime
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional, List, Dict, Any
 from dateutil import parser as date_parser
 
+from ..metrics import (
+    CounterFunc,
+    feed_entries_parsed,
+    feed_fetch_bytes,
+    feed_fetch_seconds,
+    feed_fetches,
+    feed_parse_seconds,
+    registry,
+)
+from .http_client import feed_fetcher
+
 logger = logging.getLogger(__name__)
 
+# Ways a publication date can be parsed, fastest first
+DATE_PATHS = ("rfc822", "iso8601", "struct", "dateutil", "failed")
+
+# [Day, ]DD Mon YYYY HH:MM[:SS] [zone]; anything looser goes to the fallbacks
+_RFC822_RE = re.compile(
+    r"(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{2,4}\s+\d{1,2}:\d{2}(?::\d{2})?"
+    r"(?:\s+(?:[+-]\d{4}|[A-Za-z]{1,5}))?"
+)
+
+
+class DateParseStats:
+    """Counts how many entry dates were parsed by each path."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = dict.fromkeys(DATE_PATHS, 0)
+    
+    def record(self, path: str) -> None:
+        """Count one date parsed by a path."""
+        with self._lock:
+            self._counts[path] += 1
+    
+    def snapshot(self) -> Dict[str, int]:
+        """Get the counts by path."""
+        with self._lock:
+            return dict(self._counts)
+    
+    def reset(self) -> None:
+        """Set every count back to zero."""
+        with self._lock:
+            self._counts = dict.fromkeys(DATE_PATHS, 0)
+
+
+# Error of the latest parse_feed call that failed, per thread
+_last_error = threading.local()
+
+# Global date parsing counters
+date_parse_stats = DateParseStats()
+registry.register(CounterFunc(
+    "podcast_tracker_date_parses", "Entry dates parsed, by parser path.", "path", date_parse_stats.snapshot
+))
+
+
+def parse_rfc822_date(value: str) -> Optional[datetime]:
+    """
+    Parse an RFC 822 date (RSS pubDate) without guessing.
+    
+    Args:
+        value: Date string from the feed
+    
+    Returns:
+        Datetime keeping the feed's UTC offset, or None if not RFC 822
+    """
+    if not _RFC822_RE.fullmatch(value):
+        return None
+    try:
+        return parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def parse_iso_date(value: str) -> Optional[datetime]:
+    """
+    Parse an ISO 8601 date (Atom) without guessing.
+    
+    Args:
+        value: Date string from the feed
+    
+    Returns:
+        Datetime keeping the feed's UTC offset, or None if not ISO 8601
+    """
+    # Python < 3.11 does not accept the Z suffix
+    if value[-1:] in ("Z", "z"):
+        value = value[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
 
 class RSSParser:
     """Parser for podcast RSS feeds."""
     
     @staticmethod
-    def parse_feed(rss_url: str) -> Optional[Dict[str, Any]]:
+    def parse_feed(
+        rss_url: str,
+        etag: Optional[str] = None,
+        modified: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Parse RSS feed and extract podcast information.
         
+        The feed is downloaded with the shared pooled client and the bytes
+        are handed to feedparser. When cache validators from a previous fetch
+        are given, the request is conditional and an unchanged feed is not
+        parsed at all.
+        
         Args:
             rss_url: URL of the RSS feed
-            
+            etag: ETag returned by the previous fetch
+            modified: Last-Modified value returned by the previous fetch
+        
         Returns:
-            Dictionary with podcast info or None if parsing fails
+            Dictionary with podcast info, {"not_modified": True} when the
+            server answered 304, or None if fetching or parsing fails (see
+            last_error)
         """
+        _last_error.message = None
         try:
             logger.info(f"Parsing RSS feed: {rss_url}")
-            feed = feedparser.parse(rss_url)
+            try:
+                with feed_fetch_seconds.labels(rss_url).time():
+                    response = feed_fetcher.fetch(rss_url, etag=etag, modified=modified)
+            except Exception:
+                feed_fetches.labels(rss_url, "error").inc()
+                raise
+            feed_fetch_bytes.labels(rss_url).inc(response.downloaded_bytes)
+            
+            if response.status_code == 304:
+                feed_fetches.labels(rss_url, "not_modified").inc()
+                logger.info(f"RSS feed not modified: {rss_url}")
+                return {"not_modified": True}
+            feed_fetches.labels(rss_url, "ok").inc()
+            
+            parse_started = time.perf_counter()
+            
+            # Content-Location lets feedparser resolve relative links after redirects
+            feed = feedparser.parse(
+                response.content,
+                response_headers={**response.headers, "content-location": response.url}
+            )
             
             if feed.bozo:
                 logger.warning(f"RSS feed has errors: {rss_url}")
             
             if not hasattr(feed, 'feed'):
                 logger.error(f"Invalid RSS feed: {rss_url}")
+                _last_error.message = "Invalid RSS feed"
                 return None
             
             # Extract podcast metadata
@@ -39,6 +168,8 @@ class RSSParser:
                 "title": feed.feed.get("title", "Unknown Podcast"),
                 "description": feed.feed.get("description", ""),
                 "artwork_url": RSSParser._extract_artwork(feed.feed),
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
                 "episodes": []
             }
             
@@ -48,13 +179,26 @@ class RSSParser:
                 if episode:
                     podcast_info["episodes"].append(episode)
             
+            feed_parse_seconds.observe(time.perf_counter() - parse_started)
+            feed_entries_parsed.inc(len(podcast_info["episodes"]))
             logger.info(f"Parsed {len(podcast_info['episodes'])} episodes from {rss_url}")
             return podcast_info
-            
+        
         except Exception as e:
             logger.error(f"Error parsing RSS feed {rss_url}: {e}")
+            _last_error.message = str(e) or type(e).__name__
             return None
     
+    @staticmethod
+    def last_error() -> Optional[str]:
+        """
+        Get why the latest parse_feed call made by this thread failed.
+        
+        Returns:
+            Error message, or None if that call succeeded
+        """
+        return getattr(_last_error, "message", None)
+    
     @staticmethod
     def _parse_episode(entry: Any) -> Optional[Dict[str, Any]]:
         """
@@ -62,32 +206,29 @@ class RSSParser:
         
         Args:
             entry: feedparser entry object
-            
+        
         Returns:
             Dictionary with episode info or None if parsing fails
         """
         try:
             # Parse publication date
-            pub_date = None
-            if hasattr(entry, 'published'):
-                try:
-                    pub_date = date_parser.parse(entry.published)
-                except Exception:
-                    pass
-            
-            if not pub_date and hasattr(entry, 'updated'):
-                try:
-                    pub_date = date_parser.parse(entry.updated)
-                except Exception:
-                    pass
+            pub_date = RSSParser._parse_date(entry, "published")
+            
+            if not pub_date:
+                pub_date = RSSParser._parse_date(entry, "updated")
             
             if not pub_date:
                 pub_date = datetime.utcnow()
             
             # Extract episode URL
-            episode_url = entry.get("link", "")
-            if not episode_url and hasattr(entry, "enclosures") and entry.enclosures:
-                episode_url = entry.enclosures[0].get("href", "")
+            enclosure_url = ""
+            if hasattr(entry, "enclosures") and entry.enclosures:
+                enclosure_url = entry.enclosures[0].get("href", "")
+            
+            episode_url = entry.get("link", "") or enclosure_url
+            
+            # Extract stable identity: <guid>, falling back to the enclosure URL
+            guid = entry.get("id", "") or enclosure_url or episode_url or None
             
             # Extract duration
             duration = None
@@ -95,6 +236,7 @@ class RSSParser:
                 duration = entry.itunes_duration
             
             episode = {
+                "guid": guid,
                 "title": entry.get("title", "Untitled Episode"),
                 "description": entry.get("summary", ""),
                 "pub_date": pub_date,
@@ -103,11 +245,55 @@ class RSSParser:
             }
             
             return episode
-            
+        
         except Exception as e:
             logger.error(f"Error parsing episode: {e}")
             return None
     
+    @staticmethod
+    def _parse_date(entry: Any, field: str) -> Optional[datetime]:
+        """
+        Parse a date field of an entry, trying the cheapest parser first.
+        
+        Well-formed RFC 822 and ISO 8601 strings are parsed directly, which
+        keeps the feed's UTC offset. Otherwise the struct feedparser already
+        derived (in UTC) is used, and dateutil's fuzzy parser only when
+        feedparser could not read the date either.
+        
+        Args:
+            entry: feedparser entry object
+            field: "published" or "updated"
+        
+        Returns:
+            Parsed datetime or None if the field is missing or unparseable
+        """
+        value = getattr(entry, field, None)
+        if not isinstance(value, str) or not value:
+            return None
+        
+        value = value.strip()
+        if value[:4].isdigit() and value[4:5] == "-":
+            path, pub_date = "iso8601", parse_iso_date(value)
+        else:
+            path, pub_date = "rfc822", parse_rfc822_date(value)
+        if pub_date is not None:
+            date_parse_stats.record(path)
+            return pub_date
+        
+        parsed = getattr(entry, f"{field}_parsed", None)
+        if isinstance(parsed, time.struct_time):
+            date_parse_stats.record("struct")
+            return datetime(*parsed[:6], tzinfo=timezone.utc)
+        
+        try:
+            pub_date = date_parser.parse(value)
+        except Exception:
+            date_parse_stats.record("failed")
+            return None
+        
+        date_parse_stats.record("dateutil")
+        return pub_date
+    
     @staticmethod
     def _extract_artwork(feed_data: Any) -> Optional[str]:
         """
@@ -115,7 +301,7 @@ class RSSParser:
         
         Args:
             feed_data: feedparser feed object
-            
+        
         Returns:
             Artwork URL or None
         """
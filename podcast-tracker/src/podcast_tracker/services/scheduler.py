@@ -5,15 +5,22 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 
-from ..database import get_db
+from .job_queue import FeedJobQueue
 from .podcast_service import PodcastService
 from ..config import settings
+from ..database import get_db
+from ..metrics import scheduler_overlaps, scheduler_ticks
 
 logger = logging.getLogger(__name__)
 
 
 class PodcastScheduler:
-    """Scheduler for checking new podcast episodes."""
+    """
+    Scheduler for checking new podcast episodes.
+    
+    It only queues a job per due podcast (see services/job_queue.py); the
+    feeds are checked by refresh workers, in this process or in others.
+    """
     
     def __init__(self):
         """Initialize the scheduler."""
@@ -21,25 +28,32 @@ class PodcastScheduler:
         self.is_running = False
     
     def start(self):
-        """Start the scheduler."""
+        """Start the scheduler, again after stop() if this process is elected once more."""
         if self.is_running:
             logger.warning("Scheduler is already running")
             return
         
-        # Add job to check for new episodes
+        # A scheduler that was shut down keeps its closed thread pool: start afresh
+        self.scheduler = BackgroundScheduler()
+        
+        # Add job to queue the feeds whose next check is due; each feed has
+        # its own interval, stored in feed_states.next_check_at
         self.scheduler.add_job(
             func=self._check_new_episodes_job,
-            trigger=IntervalTrigger(hours=settings.check_interval_hours),
+            trigger=IntervalTrigger(minutes=settings.scheduler_tick_minutes),
             id="check_new_episodes",
-            name="Check for new podcast episodes",
+            name="Queue due podcast feeds",
             replace_existing=True,
+            coalesce=True,
             next_run_time=datetime.now()  # Run immediately on start
         )
         
         self.scheduler.start()
         self.is_running = True
         
-        logger.info(f"Scheduler started. Checking for new episodes every {settings.check_interval_hours} hour(s)")
+        logger.info(
+            f"Scheduler started. Checking due feeds every {settings.scheduler_tick_minutes} minute(s)"
+        )
     
     def stop(self):
         """Stop the scheduler."""
@@ -53,16 +67,22 @@ class PodcastScheduler:
         logger.info("Scheduler stopped")
     
     def _check_new_episodes_job(self):
-        """Job to check for new episodes in all podcasts."""
-        logger.info("Running scheduled check for new episodes...")
+        """Job to queue a check of each podcast that is due."""
+        scheduler_ticks.inc()
         
         try:
             with get_db() as db:
-                service = PodcastService(db)
-                new_episodes = service.refresh_all_podcasts()
-                logger.info(f"Scheduled check complete. Found {new_episodes} new episodes.")
+                due = [podcast.id for podcast in PodcastService(db).get_due_podcasts()]
+                queued = FeedJobQueue(db).enqueue(due)
         except Exception as e:
-            logger.error(f"Error in scheduled check: {e}")
+            logger.error(f"Error queueing due podcasts: {e}")
+            return
+        
+        # Feeds still waiting from an earlier tick keep their job
+        if queued < len(due):
+            scheduler_overlaps.inc(len(due) - queued)
+        if due:
+            logger.info(f"Queued {queued} of {len(due)} due podcast(s) for a refresh worker")
 
 
 # Global scheduler instance
@@ -0,0 +1,149 @@
+"""Refresh workers: claim feed jobs from the queue and check their feeds."""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from ..config import settings
+from ..database import get_db
+from ..database.models import Podcast
+from ..metrics import refresh_job_seconds
+from .job_queue import ClaimedJob, FeedJobQueue
+from .podcast_service import PodcastService, RefreshStats
+
+logger = logging.getLogger(__name__)
+
+# Kind label of worker batches in refresh_job_seconds
+QUEUE_BATCH = "queue"
+
+
+class RefreshWorker:
+    """
+    Process feed jobs until stopped.
+    
+    Runs in its own process (`podcast-tracker worker`) or as a thread of the
+    web server (settings.refresh_workers). Each batch of claimed jobs goes
+    through PodcastService.refresh_podcasts, which fetches the feeds in
+    parallel; the leases are renewed from a second thread meanwhile.
+    """
+    
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        poll_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the worker.
+        
+        Args:
+            worker_id: Unique name of the worker (host, pid and a random suffix by default)
+            batch_size: Jobs claimed at once (settings.refresh_concurrency by default)
+            lease_seconds: Length of the leases (settings.job_lease_seconds by default)
+            poll_seconds: Wait between polls of an empty queue (settings.job_poll_seconds by default)
+        """
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.batch_size = batch_size or max(settings.refresh_concurrency, 1)
+        self.lease_seconds = lease_seconds or settings.job_lease_seconds
+        self.poll_seconds = poll_seconds if poll_seconds is not None else settings.job_poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def run_once(self, stats: Optional[RefreshStats] = None, podcast_ids: Optional[List[int]] = None) -> int:
+        """
+        Claim one batch of jobs and process it.
+        
+        Args:
+            stats: RefreshStats to fill in with the outcome of the batch
+            podcast_ids: Only claim the jobs of these podcasts (any job by default)
+        
+        Returns:
+            Number of jobs claimed
+        """
+        with get_db() as db:
+            jobs = FeedJobQueue(db).claim(self.worker_id, self.batch_size, self.lease_seconds, podcast_ids=podcast_ids)
+        if not jobs:
+            return 0
+        
+        started = time.perf_counter()
+        try:
+            with self._renewing(jobs), get_db() as db:
+                podcasts = db.query(Podcast).filter(Podcast.id.in_([job.podcast_id for job in jobs])).all()
+                if podcasts:
+                    PodcastService(db).refresh_podcasts(podcasts, stats=stats)
+        
+        except Exception as e:
+            refresh_job_seconds.labels(QUEUE_BATCH, "failed").observe(time.perf_counter() - started)
+            logger.error(f"Worker {self.worker_id} failed processing {len(jobs)} feed job(s): {e}")
+            with get_db() as db:
+                FeedJobQueue(db).release(self.worker_id, jobs)
+            return len(jobs)
+        
+        refresh_job_seconds.labels(QUEUE_BATCH, "succeeded").observe(time.perf_counter() - started)
+        with get_db() as db:
+            FeedJobQueue(db).complete(self.worker_id, jobs)
+        return len(jobs)
+    
+    def run(self) -> None:
+        """Process jobs until stop() is called; the batch in progress is finished first."""
+        logger.info(f"Refresh worker {self.worker_id} started")
+        
+        while not self._stop.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                logger.error(f"Refresh worker {self.worker_id} error: {e}")
+                claimed = 0
+            
+            if not claimed:
+                self._stop.wait(self.poll_seconds)
+        
+        logger.info(f"Refresh worker {self.worker_id} stopped")
+    
+    def start(self) -> None:
+        """Run the worker in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name=f"refresh-worker-{self.worker_id[-6:]}", daemon=True)
+        self._thread.start()
+    
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Ask the worker to stop, waiting for its thread if it has one.
+        
+        Args:
+            timeout: Longest wait for the batch in progress, in seconds
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    @contextmanager
+    def _renewing(self, jobs: List[ClaimedJob]) -> Iterator[None]:
+        """Renew the leases of the jobs every third of a lease while the block runs."""
+        done = threading.Event()
+        
+        def renew():
+            while not done.wait(self.lease_seconds / 3):
+                try:
+                    with get_db() as db:
+                        renewed = FeedJobQueue(db).renew(self.worker_id, jobs, self.lease_seconds)
+                except Exception as e:
+                    logger.error(f"Worker {self.worker_id} could not renew its leases: {e}")
+                    continue
+                if renewed < len(jobs):
+                    logger.warning(f"Worker {self.worker_id} lost {len(jobs) - renewed} lease(s)")
+        
+        thread = threading.Thread(target=renew, name=f"lease-{self.worker_id[-6:]}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            done.set()
+            thread.join()
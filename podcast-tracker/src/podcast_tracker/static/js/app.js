@@ -3,8 +3,11 @@ const API_BASE = '';
 
 // State
 let currentPage = 1;
+let pageCursors = [null]; // pageCursors[n - 1] loads page n
 let currentPodcastFilter = '';
 let podcasts = [];
+let eventsConnected = false;
+let reloadTimer = null;
 
 // DOM Elements
 const episodesList = document.getElementById('episodesList');
@@ -25,10 +28,36 @@ document.addEventListener('DOMContentLoaded', () => {
     refreshBtn.addEventListener('click', handleRefresh);
     podcastFilter.addEventListener('change', handleFilterChange);
     
-    // Auto-refresh every 5 minutes
-    setInterval(loadEpisodes, 5 * 60 * 1000);
+    connectEvents();
 });
 
+// Live updates: the server pushes new episodes and listened changes
+function connectEvents() {
+    if (!window.EventSource) {
+        // Auto-refresh every 5 minutes
+        setInterval(loadEpisodes, 5 * 60 * 1000);
+        return;
+    }
+    
+    // On errors the browser reconnects by itself, resuming from the last event id
+    const source = new EventSource(`${API_BASE}/api/events`);
+    source.onopen = () => { eventsConnected = true; };
+    source.onerror = () => { eventsConnected = false; };
+    
+    source.addEventListener('episodes', scheduleReload);
+    source.addEventListener('listened', scheduleReload);
+    source.addEventListener('reset', () => {
+        loadPodcasts();
+        scheduleReload();
+    });
+}
+
+// Reload the current page once a burst of events is over
+function scheduleReload() {
+    clearTimeout(reloadTimer);
+    reloadTimer = setTimeout(() => loadEpisodes(currentPage), 500);
+}
+
 // Load podcasts for filter
 async function loadPodcasts() {
     try {
@@ -55,7 +84,12 @@ async function loadEpisodes(page = 1) {
     showLoading();
     
     try {
-        let url = `${API_BASE}/api/episodes?page=${page}&page_size=20`;
+        // Pages after the first are fetched by cursor: constant cost at any depth
+        const cursor = pageCursors[page - 1];
+        let url = `${API_BASE}/api/episodes?page=${page}&page_size=20&compact=true`;
+        if (cursor) {
+            url += `&cursor=${encodeURIComponent(cursor)}`;
+        }
         if (currentPodcastFilter) {
             url += `&podcast_id=${currentPodcastFilter}`;
         }
@@ -63,12 +97,13 @@ async function loadEpisodes(page = 1) {
         const response = await fetch(url);
         const data = await response.json();
         
+        pageCursors[page] = data.next_cursor;
         totalEpisodesEl.textContent = data.total;
         
         if (data.episodes.length === 0) {
             showEmptyState();
         } else {
-            displayEpisodes(data.episodes);
+            displayEpisodes(data.episodes, data.podcasts);
             displayPagination(data);
         }
     } catch (error) {
@@ -78,24 +113,24 @@ async function loadEpisodes(page = 1) {
 }
 
 // Display episodes
-function displayEpisodes(episodes) {
+function displayEpisodes(episodes, podcastsById) {
     hideLoading();
     hideEmptyState();
     
     episodesList.innerHTML = '';
     
     episodes.forEach(episode => {
-        const card = createEpisodeCard(episode);
+        const card = createEpisodeCard(episode, podcastsById[episode.podcast_id]);
         episodesList.appendChild(card);
     });
 }
 
 // Create episode card
-function createEpisodeCard(episode) {
+function createEpisodeCard(episode, podcast) {
     const card = document.createElement('div');
     card.className = 'episode-card';
     
-    const podcastName = episode.podcast ? episode.podcast.name : 'Unknown Podcast';
+    const podcastName = podcast ? podcast.name : 'Unknown Podcast';
     const formattedDate = formatDate(episode.pub_date);
     
     card.innerHTML = `
@@ -109,7 +144,7 @@ function createEpisodeCard(episode) {
                 </div>
             </div>
         </div>
-        ${episode.description ? `<p class="episode-description">${escapeHtml(episode.description)}</p>` : ''}
+        ${episode.summary ? `<p class="episode-description">${escapeHtml(episode.summary)}</p>` : ''}
         <div class="episode-actions">
             ${episode.spotify_url ? 
                 `<a href="${episode.spotify_url}" target="_blank" class="btn btn-primary">
@@ -139,8 +174,8 @@ async function markAsListened(episodeId) {
             body: JSON.stringify({ listened: true })
         });
         
-        if (response.ok) {
-            // Reload episodes
+        // With live updates on, the listened event reloads the page
+        if (response.ok && !eventsConnected) {
             loadEpisodes(currentPage);
         }
     } catch (error) {
@@ -160,8 +195,15 @@ async function handleRefresh() {
         
         const data = await response.json();
         
+        // The refresh runs in the background: follow its job until it finishes
+        const job = await waitForRefreshJob(data.job);
+        
         // Show notification
-        alert(data.message);
+        if (job.status === 'succeeded') {
+            alert(`Actualización completada. ${job.new_episodes} episodios nuevos.`);
+        } else {
+            alert('Error al actualizar podcasts');
+        }
         
         // Reload episodes
         await loadEpisodes(currentPage);
@@ -174,10 +216,24 @@ async function handleRefresh() {
     }
 }
 
+// Poll a refresh job until it is no longer queued or running
+async function waitForRefreshJob(job) {
+    while (job.status === 'queued' || job.status === 'running') {
+        refreshBtn.innerHTML = `<span class="refresh-icon">🔄</span> Actualizando... ${job.checked}/${job.total}`;
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        
+        const response = await fetch(`${API_BASE}/api/podcasts/refresh/${job.id}`);
+        if (!response.ok) throw new Error(`Failed to get refresh job ${job.id}`);
+        job = await response.json();
+    }
+    return job;
+}
+
 // Handle filter change
 function handleFilterChange(e) {
     currentPodcastFilter = e.target.value;
     currentPage = 1;
+    pageCursors = [null];
     loadEpisodes(currentPage);
 }
 
@@ -204,7 +260,7 @@ function displayPagination(data) {
     // Next button
     const nextBtn = document.createElement('button');
     nextBtn.textContent = 'Siguiente →';
-    nextBtn.disabled = data.page === data.total_pages;
+    nextBtn.disabled = !data.next_cursor;
     nextBtn.onclick = () => {
         currentPage = data.page + 1;
         loadEpisodes(currentPage);
@@ -15,6 +15,7 @@ os.environ["TESTING"] = "true"
 import podcast_tracker.database.database as db_module
 from podcast_tracker.database.models import Base
 from podcast_tracker.database.database import get_db_session
+from podcast_tracker.api.cache import response_cache
 from podcast_tracker.main import app
 
 
@@ -80,6 +81,9 @@ def client(test_db_engine):
         # Apply the override
         app.dependency_overrides[get_db_session] = override_get_db_session
         
+        # Start from an empty response cache, entries may come from another test's database
+        response_cache.clear()
+        
         # NOW create test client after setting engine via proxy
         test_client = TestClient(app)
         
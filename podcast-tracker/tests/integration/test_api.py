@@ -4,6 +4,7 @@ import pytest
 from datetime import datetime
 
 from podcast_tracker.database.models import Podcast, Episode
+from podcast_tracker.database.stats import rebuild_podcast_stats
 
 
 @pytest.mark.integration
@@ -173,3 +174,456 @@ def test_filter_episodes_by_podcast(client, test_db, sample_podcast_data):
     data = response.json()
     assert data["total"] == 3
     assert all("P1" in ep["title"] for ep in data["episodes"])
+
+
+@pytest.mark.integration
+def test_get_episodes_cursor_pagination(client, test_db, sample_podcast_data):
+    """Test walking every page with next_cursor, including pub_date ties."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    
+    # Identical dates force the id tie-breaker to keep pages stable
+    pub_date = datetime(2023, 11, 20, 10, 0)
+    for i in range(25):
+        test_db.add(Episode(
+            podcast_id=podcast.id,
+            title=f"Episode {i+1}",
+            pub_date=pub_date,
+            episode_url=f"https://example.com/ep{i+1}.mp3",
+            listened=False
+        ))
+    test_db.commit()
+    
+    seen = []
+    url = "/api/episodes?page_size=10&include_total=false"
+    next_cursor = None
+    for _ in range(3):
+        response = client.get(url + (f"&cursor={next_cursor}" if next_cursor else ""))
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] is None
+        seen.extend(ep["id"] for ep in data["episodes"])
+        next_cursor = data["next_cursor"]
+    
+    assert next_cursor is None
+    assert len(seen) == 25
+    assert len(set(seen)) == 25
+    assert seen == sorted(seen, reverse=True)
+
+
+@pytest.mark.integration
+def test_get_episodes_invalid_cursor(client):
+    """Test a malformed cursor is rejected."""
+    response = client.get("/api/episodes?cursor=not-a-cursor")
+    
+    assert response.status_code == 400
+
+
+@pytest.mark.integration
+def test_get_episodes_loads_podcasts_without_n_plus_one(client, test_db, test_db_engine):
+    """Test a page of episodes from many podcasts costs a constant number of queries."""
+    from sqlalchemy import event
+    
+    for p in range(5):
+        podcast = Podcast(name=f"Podcast {p}", rss_url=f"https://example.com/feed{p}.xml")
+        test_db.add(podcast)
+        test_db.commit()
+        test_db.refresh(podcast)
+        for i in range(4):
+            test_db.add(Episode(
+                podcast_id=podcast.id,
+                title=f"P{p} Episode {i}",
+                pub_date=datetime(2023, 11, i + 1),
+                episode_url=f"https://example.com/p{p}/ep{i}.mp3",
+                listened=False
+            ))
+    test_db.commit()
+    
+    statements = []
+    
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+    
+    event.listen(test_db_engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.get("/api/episodes?page_size=20")
+    finally:
+        event.remove(test_db_engine, "before_cursor_execute", count_statement)
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["episodes"]) == 20
+    assert all(ep["podcast"]["name"].startswith("Podcast") for ep in data["episodes"])
+    assert len(statements) == 3  # data version + count + page
+
+
+@pytest.mark.integration
+def test_get_episodes_defers_description(client, test_db, test_db_engine, sample_podcast_data, sample_episode_data):
+    """Test list pages carry the summary and only read the description on request."""
+    from sqlalchemy import event
+    
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    episode = Episode(
+        podcast_id=podcast.id,
+        **dict(sample_episode_data, description="<p>Hablamos de <b>agentes</b> &amp; modelos</p>")
+    )
+    test_db.add(episode)
+    test_db.commit()
+    episode_id = episode.id
+    
+    statements = []
+    
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(test_db_engine, "before_cursor_execute", record_statement)
+    try:
+        response = client.get("/api/episodes")
+    finally:
+        event.remove(test_db_engine, "before_cursor_execute", record_statement)
+    
+    assert response.status_code == 200
+    data = response.json()["episodes"][0]
+    assert data["summary"] == "Hablamos de agentes & modelos"
+    assert data["description"] is None
+    assert data["podcast"]["description"] is None
+    assert not any("description" in statement for statement in statements)
+    
+    response = client.get("/api/episodes?include=description")
+    assert response.json()["episodes"][0]["description"] == "<p>Hablamos de <b>agentes</b> &amp; modelos</p>"
+    
+    assert client.get("/api/episodes?include=transcript").status_code == 400
+    assert client.get(f"/api/episodes/{episode_id}").json()["description"].startswith("<p>")
+    assert client.get("/api/podcasts").json()[0]["description"] == sample_podcast_data["description"]
+
+
+@pytest.mark.integration
+def test_get_episodes_compact(client, test_db, sample_podcast_data, sample_episode_data):
+    """Test compact mode returns each podcast once in a side map."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    
+    for i in range(3):
+        episode_data = dict(sample_episode_data, title=f"Episode {i}")
+        test_db.add(Episode(podcast_id=podcast.id, **episode_data))
+    test_db.commit()
+    
+    response = client.get("/api/episodes?compact=true")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["episodes"]) == 3
+    assert all(ep["podcast"] is None for ep in data["episodes"])
+    assert list(data["podcasts"]) == [str(podcast.id)]
+    assert data["podcasts"][str(podcast.id)]["name"] == podcast.name
+
+
+@pytest.mark.integration
+def test_episode_total_follows_listened_toggle(client, test_db, sample_podcast_data, sample_episode_data):
+    """Test the pending total served from the counters follows PATCH updates."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    
+    episode = Episode(podcast_id=podcast.id, **sample_episode_data)
+    test_db.add(episode)
+    test_db.commit()
+    test_db.refresh(episode)
+    
+    assert client.get("/api/episodes").json()["total"] == 1
+    
+    client.patch(f"/api/episodes/{episode.id}/listened", json={"listened": True})
+    assert client.get("/api/episodes").json()["total"] == 0
+    
+    client.patch(f"/api/episodes/{episode.id}/listened", json={"listened": False})
+    assert client.get("/api/episodes").json()["total"] == 1
+
+
+@pytest.mark.integration
+def test_search_episodes(client, test_db, sample_podcast_data):
+    """Test searching episodes by title and description."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    
+    for i in range(3):
+        test_db.add(Episode(
+            podcast_id=podcast.id,
+            title=f"Agentes autónomos {i+1}",
+            description="Un repaso a los agentes",
+            pub_date=datetime(2024, 1, i + 1),
+            episode_url=f"https://example.com/ep{i+1}",
+            listened=i == 0
+        ))
+    test_db.add(Episode(
+        podcast_id=podcast.id,
+        title="Otra cosa",
+        pub_date=datetime(2024, 1, 10),
+        episode_url="https://example.com/other"
+    ))
+    test_db.commit()
+    
+    response = client.get("/api/episodes/search?q=agentes&page_size=2")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["query"] == "agentes"
+    assert data["has_more"] is True
+    assert len(data["episodes"]) == 2
+    assert data["episodes"][0]["podcast"]["name"] == sample_podcast_data["name"]
+    assert "<mark>" in data["episodes"][0]["snippet"]
+    
+    response = client.get("/api/episodes/search?q=agentes&page=2&page_size=2")
+    assert len(response.json()["episodes"]) == 1
+    assert response.json()["has_more"] is False
+    
+    assert client.get("/api/episodes/search?q=autonomos").json()["episodes"] != []
+    assert client.get("/api/episodes/search?q=").status_code == 422
+
+
+@pytest.mark.integration
+def test_response_cache_and_etags(client, test_db, sample_podcast_data, sample_episode_data):
+    """Test repeated reads are cached, revalidated and invalidated by writes."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    episode = Episode(podcast_id=podcast.id, **sample_episode_data)
+    test_db.add(episode)
+    test_db.commit()
+    
+    first = client.get("/api/episodes")
+    second = client.get("/api/episodes")
+    etag = first.headers["etag"]
+    
+    assert second.json() == first.json()
+    assert second.headers["etag"] == etag
+    assert client.get("/api/cache/stats").json()["hits"] == 1
+    
+    not_modified = client.get("/api/episodes", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    
+    # Other podcasts' scoped entries survive the write
+    client.get(f"/api/episodes?podcast_id={podcast.id + 1}")
+    client.patch(f"/api/episodes/{episode.id}/listened", json={"listened": True})
+    
+    changed = client.get("/api/episodes", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["total"] == 0
+    assert changed.headers["etag"] != etag
+    
+    client.get(f"/api/episodes?podcast_id={podcast.id + 1}")
+    assert client.get("/api/cache/stats").json() == {
+        "hits": 3, "misses": 3, "not_modified": 1, "entries": 2
+    }
+
+
+@pytest.mark.integration
+def test_bulk_mark_episodes_listened(client, test_db, test_db_engine, sample_podcast_data):
+    """Test clearing a large backlog takes one UPDATE and one commit."""
+    from sqlalchemy import event, insert
+    
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.execute(insert(Episode), [
+        {"podcast_id": podcast.id, "title": f"Episode {i}", "pub_date": datetime(2020, 1, 1),
+         "episode_url": f"https://example.com/ep{i}.mp3", "listened": False}
+        for i in range(5000)
+    ])
+    test_db.add(Episode(
+        podcast_id=podcast.id,
+        title="Recent",
+        pub_date=datetime(2024, 1, 1),
+        episode_url="https://example.com/recent.mp3"
+    ))
+    # The bulk insert above bypasses the counters
+    rebuild_podcast_stats(test_db.connection())
+    test_db.commit()
+    
+    updates = []
+    commits = []
+    
+    def count_update(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE EPISODES"):
+            updates.append(statement)
+    
+    def count_commit(conn):
+        commits.append(conn)
+    
+    event.listen(test_db_engine, "before_cursor_execute", count_update)
+    event.listen(test_db_engine, "commit", count_commit)
+    try:
+        response = client.patch("/api/episodes/listened", json={
+            "podcast_id": podcast.id,
+            "before": "2023-01-01T00:00:00"
+        })
+    finally:
+        event.remove(test_db_engine, "before_cursor_execute", count_update)
+        event.remove(test_db_engine, "commit", count_commit)
+    
+    assert response.status_code == 200
+    assert response.json() == {"updated": 5000}
+    assert len(updates) == 1
+    assert len(commits) == 1
+    assert client.get("/api/episodes").json()["total"] == 1
+
+
+@pytest.mark.integration
+def test_bulk_mark_episodes_listened_by_ids(client, test_db, sample_podcast_data):
+    """Test updating episodes by id, and the request validation."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    for i in range(3):
+        test_db.add(Episode(
+            podcast_id=podcast.id,
+            title=f"Episode {i}",
+            pub_date=datetime(2024, 1, i + 1),
+            episode_url=f"https://example.com/ep{i}.mp3"
+        ))
+    test_db.commit()
+    
+    response = client.patch("/api/episodes/listened", json={"ids": [1, 2, 999]})
+    assert response.json() == {"updated": 2}
+    
+    # Episodes already in the requested state are not counted
+    response = client.patch("/api/episodes/listened", json={"ids": [1, 3]})
+    assert response.json() == {"updated": 1}
+    
+    response = client.patch("/api/episodes/listened", json={"ids": [1], "listened": False})
+    assert response.json() == {"updated": 1}
+    assert client.get("/api/episodes").json()["total"] == 1
+    
+    assert client.patch("/api/episodes/listened", json={}).status_code == 422
+    assert client.patch("/api/episodes/listened", json={"ids": [1], "podcast_id": 1}).status_code == 422
+    assert client.patch("/api/episodes/listened", json={"ids": []}).status_code == 422
+
+
+@pytest.mark.integration
+def test_refresh_runs_as_background_job(client, test_db, sample_podcast_data):
+    """Test a refresh returns a job immediately and reports its progress."""
+    from unittest.mock import patch
+    
+    test_db.add(Podcast(**sample_podcast_data))
+    test_db.commit()
+    
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', return_value=None):
+        response = client.post("/api/podcasts/refresh")
+        assert response.status_code == 202
+        job = response.json()["job"]
+        assert job["kind"] == "all"
+        
+        from podcast_tracker.services import refresh_jobs
+        assert refresh_jobs.get(job["id"]).wait(5)
+    
+    status = client.get(f"/api/podcasts/refresh/{job['id']}").json()
+    assert status["status"] == "succeeded"
+    assert (status["total"], status["checked"], status["failed"]) == (1, 1, 1)
+    
+    assert client.get("/api/podcasts/refresh/unknown").status_code == 404
+
+
+@pytest.mark.integration
+def test_feed_health(client, test_db):
+    """Test feed health lists failing feeds first with their last error."""
+    from datetime import timedelta
+    from podcast_tracker.database.models import FeedState
+    
+    now = datetime.utcnow()
+    healthy = Podcast(name="Healthy", rss_url="https://example.com/healthy.xml")
+    dead = Podcast(name="Dead", rss_url="https://example.com/dead.xml")
+    new = Podcast(name="New", rss_url="https://example.com/new.xml")
+    test_db.add_all([healthy, dead, new])
+    test_db.commit()
+    test_db.add_all([
+        FeedState(podcast_id=healthy.id, consecutive_failures=0, last_success_at=now),
+        FeedState(podcast_id=dead.id, consecutive_failures=7, last_error="HTTP 404",
+                  last_error_at=now, retry_after=now + timedelta(hours=8)),
+    ])
+    test_db.commit()
+    
+    response = client.get("/api/feeds/health")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [feed["name"] for feed in data["feeds"]] == ["Dead", "Healthy", "New"]
+    assert data["feeds"][0]["status"] == "open"
+    assert data["feeds"][0]["last_error"] == "HTTP 404"
+    assert data["feeds"][0]["consecutive_failures"] == 7
+    assert data["counts"] == {"ok": 1, "failing": 0, "open": 1, "half_open": 0, "unknown": 1}
+
+
+@pytest.mark.integration
+def test_metrics_endpoint(client, test_db, sample_podcast_data, sample_episode_data):
+    """Test /metrics exposes request latency by route template and ingest counters."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    episode = Episode(podcast_id=podcast.id, **sample_episode_data)
+    test_db.add(episode)
+    test_db.commit()
+    
+    assert client.get(f"/api/episodes/{episode.id}").status_code == 200
+    assert client.get("/api/episodes/999999").status_code == 404
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = response.text
+    assert 'podcast_tracker_http_request_seconds_count{method="GET",route="/api/episodes/{episode_id}",status="200"}' in body
+    assert 'route="/api/episodes/{episode_id}",status="404"' in body
+    assert "/api/episodes/999999" not in body
+    assert "# TYPE podcast_tracker_db_commit_seconds histogram" in body
+    assert 'podcast_tracker_date_parses_total{path="rfc822"}' in body
+
+
+@pytest.mark.integration
+def test_opml_import_and_export(client, test_db, sample_podcast_data):
+    """Test an OPML upload imports its feeds and the export lists them."""
+    from unittest.mock import patch
+    
+    test_db.add(Podcast(**sample_podcast_data))
+    test_db.commit()
+    
+    opml = f"""<?xml version="1.0"?>
+<opml version="2.0"><body>
+  <outline type="rss" text="Existing" xmlUrl="{sample_podcast_data['rss_url']}"/>
+  <outline type="rss" text="New Show" xmlUrl="https://new.example.com/feed.xml"/>
+  <outline type="rss" text="Gone" xmlUrl="https://gone.example.com/feed.xml"/>
+</body></opml>"""
+    feed = {"title": "New Show", "description": None, "artwork_url": None, "etag": None,
+            "last_modified": None, "episodes": [{"guid": "1", "title": "Episode 1",
+            "pub_date": datetime(2024, 1, 1), "episode_url": "https://new.example.com/1.mp3", "description": None}]}
+    
+    def fake_parse_feed(rss_url, etag=None, modified=None):
+        return feed if "new" in rss_url else None
+    
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=fake_parse_feed):
+        response = client.post("/api/podcasts/opml", content=opml, headers={"Content-Type": "text/x-opml"})
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert (data["imported"], data["existing"], data["failed"]) == (1, 1, 1)
+    assert [result["status"] for result in data["results"]] == ["exists", "imported", "failed"]
+    assert data["results"][1]["episodes"] == 1
+    assert client.get("/api/episodes").json()["total"] == 1
+    
+    response = client.get("/api/podcasts/opml")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/x-opml")
+    assert "attachment" in response.headers["content-disposition"]
+    assert 'xmlUrl="https://new.example.com/feed.xml"' in response.text
+    assert f'xmlUrl="{sample_podcast_data["rss_url"]}"' in response.text
+    
+    assert client.post("/api/podcasts/opml", content="<rss/>").status_code == 400
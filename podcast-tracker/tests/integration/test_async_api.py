@@ -0,0 +1,119 @@
+"""Integration tests for the async API routes."""
+
+import pytest
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+pytest.importorskip("aiosqlite")
+
+from podcast_tracker.api import async_router
+from podcast_tracker.database.database import (
+    create_db_engine,
+    create_async_db_engine,
+    get_async_db_session,
+)
+from podcast_tracker.database.models import Base, Podcast, Episode
+
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path):
+    """Create a test client serving the async routes from a file database."""
+    db_path = tmp_path / "async.db"
+    sync_engine = create_db_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    
+    async_engine = create_async_db_engine(f"sqlite+aiosqlite:///{db_path}")
+    TestAsyncSessionLocal = async_sessionmaker(autoflush=False, bind=async_engine)
+    
+    async def override_get_async_db_session():
+        """Override the get_async_db_session dependency."""
+        async with TestAsyncSessionLocal() as db:
+            yield db
+    
+    app = FastAPI()
+    app.include_router(async_router)
+    app.dependency_overrides[get_async_db_session] = override_get_async_db_session
+    
+    SyncSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    with TestClient(app) as client:
+        yield client, SyncSessionLocal
+    
+    sync_engine.dispose()
+
+
+def _add_episodes(SessionLocal, count):
+    db = SessionLocal()
+    podcast = Podcast(name="Async Podcast", rss_url="https://example.com/async.xml")
+    db.add(podcast)
+    db.commit()
+    for i in range(count):
+        db.add(Episode(
+            podcast_id=podcast.id,
+            title=f"Episode {i+1}",
+            episode_url=f"https://example.com/ep{i+1}",
+            pub_date=datetime(2024, 1, i + 1)
+        ))
+    db.commit()
+    podcast_id = podcast.id
+    db.close()
+    return podcast_id
+
+
+@pytest.mark.integration
+def test_async_get_podcasts(async_client):
+    """Test listing podcasts through the async routes."""
+    client, SessionLocal = async_client
+    _add_episodes(SessionLocal, 0)
+    
+    response = client.get("/api/podcasts")
+    
+    assert response.status_code == 200
+    assert [podcast["name"] for podcast in response.json()] == ["Async Podcast"]
+
+
+@pytest.mark.integration
+def test_async_get_episodes(async_client):
+    """Test paginating episodes through the async routes."""
+    client, SessionLocal = async_client
+    _add_episodes(SessionLocal, 5)
+    
+    response = client.get("/api/episodes?page_size=2")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert [episode["title"] for episode in data["episodes"]] == ["Episode 5", "Episode 4"]
+    assert data["episodes"][0]["podcast"]["name"] == "Async Podcast"
+    
+    response = client.get(f"/api/episodes?page_size=2&cursor={data['next_cursor']}")
+    assert [episode["title"] for episode in response.json()["episodes"]] == ["Episode 3", "Episode 2"]
+
+
+@pytest.mark.integration
+def test_async_mark_episode_listened(async_client):
+    """Test updating an episode through the async routes."""
+    client, SessionLocal = async_client
+    _add_episodes(SessionLocal, 2)
+    
+    response = client.patch("/api/episodes/1/listened", json={"listened": True})
+    
+    assert response.status_code == 200
+    assert response.json()["listened"] is True
+    assert client.get("/api/episodes/1").json()["listened"] is True
+    assert client.get("/api/episodes").json()["total"] == 1
+    assert client.get("/api/episodes/999").status_code == 404
+
+
+@pytest.mark.integration
+def test_async_search_episodes(async_client):
+    """Test the search route is not shadowed by /api/episodes/{episode_id}."""
+    client, SessionLocal = async_client
+    _add_episodes(SessionLocal, 3)
+    
+    response = client.get("/api/episodes/search?q=episode")
+    
+    assert response.status_code == 200
+    assert len(response.json()["episodes"]) == 3
@@ -0,0 +1,130 @@
+"""Unit tests for the response cache and data versions."""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import QueryParams
+
+from podcast_tracker.api.cache import ResponseCache, etag_matches, make_etag
+from podcast_tracker.database.models import Base, Podcast, Episode
+from podcast_tracker.database.versions import DataVersion
+from podcast_tracker.services.job_queue import FeedJobQueue
+from podcast_tracker.services.podcast_service import PodcastService
+
+
+@pytest.mark.unit
+def test_data_version_scopes(test_db_engine):
+    """Test podcast writes only invalidate that podcast and unscoped reads."""
+    versions = DataVersion(test_db_engine)
+    before = {scope: versions.current(scope) for scope in (None, 1, 2)}
+    
+    versions.bump([1])
+    assert versions.current(None) != before[None]
+    assert versions.current(1) != before[1]
+    assert versions.current(2) == before[2]
+    
+    versions.bump()
+    assert versions.current(2) != before[2]
+
+
+@pytest.mark.unit
+def test_commits_bump_data_version(test_db, sample_podcast_data, sample_episode_data):
+    """Test committed writes bump the version of the podcasts they touch."""
+    data_version = DataVersion(test_db.get_bind())
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    other_podcast_version = data_version.current(podcast.id + 1)
+    
+    version = data_version.current(podcast.id)
+    episode = Episode(podcast_id=podcast.id, **sample_episode_data)
+    test_db.add(episode)
+    test_db.commit()
+    assert data_version.current(podcast.id) != version
+    
+    # Rolled back and no-op writes do not count
+    version = data_version.current(podcast.id)
+    episode.listened = True
+    test_db.flush()
+    test_db.rollback()
+    episode.title = episode.title
+    test_db.commit()
+    assert data_version.current(podcast.id) == version
+    
+    # Bulk inserts from a feed are attributed to their podcast
+    PodcastService(test_db)._add_episodes_from_feed(podcast, [
+        {"guid": "new", "title": "New", "pub_date": datetime(2024, 1, 1),
+         "episode_url": "https://example.com/new.mp3"}
+    ])
+    assert data_version.current(podcast.id) != version
+    assert data_version.current(podcast.id + 1) == other_podcast_version
+    
+    # Job queue bookkeeping does not invalidate anything
+    version = data_version.current()
+    queue = FeedJobQueue(test_db)
+    queue.enqueue([podcast.id])
+    queue.complete("worker", queue.claim("worker", limit=1))
+    assert data_version.current() == version
+
+
+@pytest.mark.unit
+def test_response_cache_versions_and_lru(test_db_engine):
+    """Test entries expire with their data version and the LRU bound."""
+    versions = DataVersion(test_db_engine)
+    cache = ResponseCache(max_entries=2, versions=versions)
+    key = cache.key("/api/episodes", QueryParams("page=2&page_size=10"))
+    assert key == cache.key("/api/episodes", QueryParams("page_size=10&page=2"))
+    
+    assert cache.get(key, versions.current()) is None
+    entry = cache.put(key, versions.current(), b"[]", "application/json")
+    assert cache.get(key, versions.current()) == entry
+    
+    versions.bump([1])
+    assert cache.get(key, versions.current()) is None
+    
+    for i in range(3):
+        cache.put(f"key-{i}", versions.current(), b"[]", "application/json")
+    assert cache.get("key-0", versions.current()) is None
+    assert cache.stats() == {"hits": 1, "misses": 3, "not_modified": 0, "entries": 2}
+
+
+@pytest.mark.unit
+def test_writes_from_another_process_invalidate(tmp_path, sample_podcast_data):
+    """Test a write committed through another engine invalidates this process's entries."""
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    writer, reader = create_engine(url), create_engine(url)
+    Base.metadata.create_all(bind=writer)
+    versions = DataVersion(reader)
+    cache = ResponseCache(versions=versions)
+    cache.put("key", versions.current(), b"[]", "application/json")
+    
+    with Session(writer) as session:
+        session.add(Podcast(**sample_podcast_data))
+        session.commit()
+    
+    assert cache.get("key", versions.current()) is None
+    writer.dispose()
+    reader.dispose()
+
+
+@pytest.mark.unit
+def test_response_cache_ttl():
+    """Test entries older than the TTL are not served."""
+    cache = ResponseCache(ttl_seconds=0, versions=DataVersion())
+    cache.put("key", (0, 0), b"[]", "application/json")
+    
+    assert cache.get("key", (0, 0)) is None
+
+
+@pytest.mark.unit
+def test_etag_matches():
+    """Test If-None-Match parsing."""
+    etag = make_etag(b"[]")
+    
+    assert etag.startswith('"') and etag == make_etag(b"[]")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
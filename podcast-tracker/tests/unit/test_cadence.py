@@ -0,0 +1,56 @@
+"""Unit tests for refresh intervals learned from publication cadence."""
+
+import pytest
+from datetime import datetime, timedelta
+
+from podcast_tracker.services.cadence import learn_refresh_interval, with_jitter
+
+
+NOW = datetime(2024, 3, 1, 12, 0)
+
+
+def _every(gap, count=10, since=timedelta(0)):
+    return [NOW - since - gap * i for i in range(count)]
+
+
+@pytest.mark.unit
+def test_refresh_interval_follows_cadence():
+    """Test busier feeds are polled more often than quieter ones."""
+    daily = learn_refresh_interval(_every(timedelta(days=1)), NOW)
+    weekly = learn_refresh_interval(_every(timedelta(days=7)), NOW)
+    
+    assert daily == timedelta(minutes=30)
+    assert weekly == timedelta(hours=3, minutes=30)
+
+
+@pytest.mark.unit
+def test_refresh_interval_bounds():
+    """Test intervals are clamped, and quiet or unknown feeds fall back."""
+    hourly = learn_refresh_interval(_every(timedelta(hours=1)), NOW)
+    monthly = learn_refresh_interval(_every(timedelta(days=30)), NOW)
+    dormant = learn_refresh_interval(_every(timedelta(days=1), since=timedelta(days=400)), NOW)
+    
+    assert hourly == timedelta(minutes=30)
+    assert monthly == timedelta(hours=15)
+    assert dormant == timedelta(hours=24)
+    assert learn_refresh_interval([], NOW) == timedelta(hours=1)
+    assert learn_refresh_interval([NOW], NOW) == timedelta(hours=1)
+
+
+@pytest.mark.unit
+def test_refresh_interval_ignores_batches():
+    """Test episodes released together do not make a feed look busy."""
+    weekly = _every(timedelta(days=7), count=4)
+    batch = [weekly[-1] - timedelta(seconds=i) for i in range(1, 20)]
+    
+    assert learn_refresh_interval(weekly + batch, NOW) == timedelta(hours=3, minutes=30)
+
+
+@pytest.mark.unit
+def test_with_jitter():
+    """Test jitter stays within its bounds."""
+    interval = timedelta(hours=1)
+    
+    for _ in range(50):
+        assert timedelta(minutes=54) <= with_jitter(interval, 0.1) <= timedelta(minutes=66)
+    assert with_jitter(interval, 0) == interval
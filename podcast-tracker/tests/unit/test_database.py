@@ -0,0 +1,50 @@
+"""Unit tests for engine and session configuration."""
+
+import pytest
+from sqlalchemy import text
+
+from podcast_tracker.database.database import (
+    create_db_engine,
+    is_async_database_url,
+    sync_database_url,
+)
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+@pytest.mark.unit
+def test_create_db_engine_applies_sqlite_profile(tmp_path):
+    """Test new SQLite connections get the tuned pragmas."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "busy_timeout") == 5000
+    assert _pragma(engine, "temp_store") == 2  # MEMORY
+    assert _pragma(engine, "cache_size") == -65536
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_create_db_engine_untuned(tmp_path):
+    """Test the profile can be turned off."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'plain.db'}", tuned=False)
+    
+    assert _pragma(engine, "journal_mode") == "delete"
+    assert _pragma(engine, "synchronous") == 2  # FULL
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_async_database_url_helpers():
+    """Test async URLs are detected and mapped to their sync driver."""
+    assert is_async_database_url("sqlite+aiosqlite:///./podcast_tracker.db")
+    assert is_async_database_url("postgresql+asyncpg://user:pw@db/podcasts")
+    assert not is_async_database_url("sqlite:///./podcast_tracker.db")
+    
+    assert sync_database_url("sqlite+aiosqlite:///./podcast_tracker.db") == "sqlite:///./podcast_tracker.db"
+    assert sync_database_url("postgresql+asyncpg://user:pw@db/podcasts") == "postgresql://user:pw@db/podcasts"
+    assert sync_database_url("sqlite:///./podcast_tracker.db") == "sqlite:///./podcast_tracker.db"
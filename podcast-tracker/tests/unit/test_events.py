@@ -0,0 +1,224 @@
+"""Unit tests for the change event broadcaster and the SSE stream."""
+
+import asyncio
+import json
+import threading
+import pytest
+from datetime import datetime
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from podcast_tracker.api.events import event_stream
+from podcast_tracker.api.routes import stream_events
+from podcast_tracker.database.models import Base, ChangeEvent, Podcast, Episode
+from podcast_tracker.events import (
+    EPISODES_ADDED,
+    LISTENED_CHANGED,
+    RESET,
+    Event,
+    EventBroadcaster,
+    EventRelay,
+    broadcaster,
+)
+from podcast_tracker.services.podcast_service import PodcastService
+
+
+def logged_events(db):
+    """(type, data) of every logged change event, oldest first."""
+    return [(event.type, json.loads(event.data)) for event in db.query(ChangeEvent).order_by(ChangeEvent.id)]
+
+
+@pytest.mark.unit
+def test_publish_fans_out_across_threads():
+    """Test an event published from another thread reaches every subscriber."""
+    events = EventBroadcaster(history=10)
+    
+    async def scenario():
+        first, _ = events.subscribe()
+        second, _ = events.subscribe()
+        
+        thread = threading.Thread(target=events.publish, args=(Event(1, EPISODES_ADDED, {"podcast_id": 1}),))
+        thread.start()
+        thread.join()
+        
+        received = [await asyncio.wait_for(sub.queue.get(), 1) for sub in (first, second)]
+        assert [event.data for event in received] == [{"podcast_id": 1}, {"podcast_id": 1}]
+        assert events.subscriber_count == 2
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.unit
+def test_subscribe_resumes_from_last_event_id():
+    """Test missed events are replayed, and a reset is sent when they are gone."""
+    events = EventBroadcaster(history=3)
+    
+    async def scenario():
+        published = [Event(n + 1, LISTENED_CHANGED, {"n": n}) for n in range(5)]
+        for event in published:
+            events.publish(event)
+        
+        _, backlog = events.subscribe(published[2].id)
+        assert [event.data for event in backlog] == [{"n": 3}, {"n": 4}]
+        
+        _, backlog = events.subscribe(published[4].id)
+        assert backlog == []
+        
+        # Event 1 is no longer kept: events 1..4 cannot all be replayed
+        _, backlog = events.subscribe(published[0].id)
+        assert [(event.id, event.type) for event in backlog] == [(published[4].id, RESET)]
+        
+        _, backlog = events.subscribe()
+        assert backlog == []
+        
+        # Ids sent by a process whose relay is ahead: not sent twice
+        ahead, backlog = events.subscribe(7)
+        assert backlog == []
+        for event_id in (6, 7, 8):
+            events.publish(Event(event_id, LISTENED_CHANGED, {}))
+        assert (await asyncio.wait_for(ahead.queue.get(), 1)).id == 8
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.unit
+def test_slow_subscriber_is_dropped():
+    """Test a subscriber whose queue overflows is marked as lagged."""
+    events = EventBroadcaster(history=2)
+    
+    async def scenario():
+        subscription, _ = events.subscribe()
+        for n in range(3):
+            events.publish(Event(n + 1, EPISODES_ADDED, {"n": n}))
+        await asyncio.sleep(0)
+        
+        assert subscription.lagged
+        stream = event_stream(events, subscription, [], heartbeat=1)
+        assert [chunk async for chunk in stream] == ["retry: 3000\n\n"]
+        assert events.subscriber_count == 0
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.unit
+def test_event_stream_sends_backlog_live_events_and_heartbeats():
+    """Test the SSE stream through the route, until the client goes away."""
+    async def scenario():
+        missed = Event(broadcaster._last_id + 1, EPISODES_ADDED, {"podcast_id": 7, "count": 2})
+        broadcaster.publish(missed)
+        
+        response = await stream_events(last_event_id=str(missed.id - 1), since=None)
+        assert response.media_type == "text/event-stream"
+        assert response.headers["cache-control"] == "no-cache"
+        
+        body = response.body_iterator
+        assert await body.__anext__() == "retry: 3000\n\n"
+        assert await body.__anext__() == (
+            f'id: {missed.id}\nevent: episodes\ndata: {{"podcast_id": 7, "count": 2}}\n\n'
+        )
+        
+        live = Event(missed.id + 1, LISTENED_CHANGED, {"episode_ids": [1]})
+        broadcaster.publish(live)
+        assert (await body.__anext__()).startswith(f"id: {live.id}\nevent: listened\n")
+        
+        subscribers = broadcaster.subscriber_count
+        await body.aclose()
+        assert broadcaster.subscriber_count == subscribers - 1
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.unit
+def test_event_stream_heartbeat():
+    """Test idle streams get keep-alive comments."""
+    events = EventBroadcaster(history=10)
+    
+    async def scenario():
+        subscription, _ = events.subscribe()
+        stream = event_stream(events, subscription, [], heartbeat=0.01)
+        assert await stream.__anext__() == "retry: 3000\n\n"
+        assert await stream.__anext__() == ": keep-alive\n\n"
+        await stream.aclose()
+    
+    asyncio.run(scenario())
+
+
+@pytest.mark.unit
+def test_service_logs_changes(test_db, sample_podcast_data):
+    """Test new episodes and listened changes are logged with their writes."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    service = PodcastService(test_db)
+    
+    service._add_episodes_from_feed(podcast, [
+        {"guid": f"ep-{i}", "title": f"Episode {i}", "pub_date": datetime(2023, 11, 20 + i),
+         "episode_url": f"https://example.com/{i}.mp3"}
+        for i in range(2)
+    ])
+    event_type, data = logged_events(test_db)[-1]
+    assert (event_type, data["podcast_id"], data["count"]) == (EPISODES_ADDED, podcast.id, 2)
+    
+    episode_ids = sorted(episode.id for episode in test_db.query(Episode))
+    assert service.set_listened_bulk(True, podcast_id=podcast.id) == 2
+    assert logged_events(test_db)[-1] == (
+        LISTENED_CHANGED, {"listened": True, "count": 2, "episode_ids": episode_ids, "podcast_ids": [podcast.id]}
+    )
+    
+    # Nothing changes, nothing is logged
+    assert service.set_listened_bulk(True, podcast_id=podcast.id) == 0
+    episode = test_db.get(Episode, episode_ids[0])
+    service.set_listened(episode, True)
+    assert len(logged_events(test_db)) == 2
+    
+    service.set_listened(episode, False)
+    assert logged_events(test_db)[-1][1]["episode_ids"] == [episode.id]
+
+
+@pytest.mark.unit
+def test_relay_streams_changes_made_by_other_processes(tmp_path, sample_podcast_data):
+    """Test changes made through another engine, such as a worker's, reach this process's clients."""
+    url = f"sqlite:///{tmp_path / 'shared.db'}"
+    worker, server, other_server = create_engine(url), create_engine(url), create_engine(url)
+    Base.metadata.create_all(bind=worker)
+    events = EventBroadcaster(history=2)
+    relay = EventRelay(events, engine=server)
+    
+    def add_episode(db, podcast, guid):
+        PodcastService(db)._add_episodes_from_feed(podcast, [
+            {"guid": guid, "title": guid, "pub_date": datetime(2024, 1, 1), "episode_url": f"https://example.com/{guid}.mp3"}
+        ])
+    
+    async def scenario():
+        with Session(worker) as db:
+            podcast = Podcast(**sample_podcast_data)
+            db.add(podcast)
+            db.commit()
+            podcast_id = podcast.id
+            add_episode(db, podcast, "before")
+            
+            assert relay.poll() == 1
+            subscription, _ = events.subscribe()
+            add_episode(db, podcast, "after")
+            assert relay.poll() == 1
+        
+        event = await asyncio.wait_for(subscription.queue.get(), 1)
+        assert (event.type, event.data["podcast_id"], event.data["count"]) == (EPISODES_ADDED, podcast_id, 1)
+        
+        # Another server process resumes a client from the same ids
+        other = EventBroadcaster(history=2)
+        EventRelay(other, engine=other_server).poll()
+        _, backlog = other.subscribe(event.id - 1)
+        assert backlog == [event]
+        
+        with Session(worker) as db:
+            podcast = db.get(Podcast, podcast_id)
+            for guid in ("one", "two", "three"):
+                add_episode(db, podcast, guid)
+            relay.poll()
+            # Events older than the history are pruned from the log
+            assert [event_id for (event_id,) in db.query(ChangeEvent.id)] == [event.id + 2, event.id + 3]
+    
+    asyncio.run(scenario())
+    for engine in (worker, server, other_server):
+        engine.dispose()
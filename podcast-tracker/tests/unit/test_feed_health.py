@@ -0,0 +1,57 @@
+"""Unit tests for feed backoff and circuit breaking."""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from podcast_tracker.database.models import FeedState
+from podcast_tracker.services.feed_health import (
+    FEED_FAILING,
+    FEED_HALF_OPEN,
+    FEED_OK,
+    FEED_OPEN,
+    FEED_UNKNOWN,
+    backoff_delay,
+    circuit_open,
+    feed_status,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_jitter():
+    """Deterministic delays."""
+    with patch('podcast_tracker.services.feed_health.settings.refresh_jitter', 0):
+        yield
+
+
+@pytest.mark.unit
+def test_backoff_delay_doubles_up_to_the_maximum():
+    """Test the delay doubles with every failure and is capped."""
+    assert [backoff_delay(failures) for failures in (1, 2, 3)] == [
+        timedelta(minutes=15), timedelta(minutes=30), timedelta(hours=1)
+    ]
+    assert backoff_delay(10) == timedelta(hours=24)
+    assert backoff_delay(10_000) == timedelta(hours=24)
+
+
+@pytest.mark.unit
+def test_feed_status():
+    """Test feeds are classified from their failures and backoff."""
+    now = datetime(2024, 1, 1, 12, 0)
+    
+    def state(failures, retry_in=None, succeeded=True):
+        return FeedState(
+            consecutive_failures=failures,
+            last_success_at=now - timedelta(days=1) if succeeded else None,
+            retry_after=now + retry_in if retry_in is not None else None
+        )
+    
+    assert feed_status(None, now) == FEED_UNKNOWN
+    assert feed_status(state(0, succeeded=False), now) == FEED_UNKNOWN
+    assert feed_status(state(0), now) == FEED_OK
+    assert feed_status(state(4, timedelta(hours=1)), now) == FEED_FAILING
+    assert feed_status(state(5, timedelta(hours=1)), now) == FEED_OPEN
+    assert feed_status(state(5, timedelta(hours=-1)), now) == FEED_HALF_OPEN
+    
+    assert circuit_open(state(5, timedelta(hours=1)), now)
+    assert not circuit_open(state(4, timedelta(hours=1)), now)
@@ -0,0 +1,178 @@
+"""Unit tests for the feed HTTP client, against a local HTTP server."""
+
+import gzip
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from podcast_tracker.services.http_client import FeedFetcher, FeedFetchError, ACCEPT_ENCODING
+from podcast_tracker.services.rss_parser import RSSParser
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel>
+<title>Local Podcast</title><description>Served locally</description>
+<item><title>Episode 1</title><guid isPermaLink="false">ep-1</guid>
+<pubDate>Mon, 20 Nov 2023 10:00:00 GMT</pubDate>
+<enclosure url="https://example.com/1.mp3" type="audio/mpeg"/></item>
+</channel></rss>"""
+
+ETAG = '"v1"'
+
+
+class FeedHandler(BaseHTTPRequestHandler):
+    """Serves FEED in several flavours depending on the path."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers), self.client_address))
+        
+        if self.path == "/missing":
+            self._send(404, b"not found")
+        elif self.path == "/large":
+            self._send(200, b"x" * 4096)
+        elif self.path == "/bomb":
+            self._send(200, gzip.compress(b" " * 1_000_000), {"Content-Encoding": "gzip"})
+        elif self.path == "/drip":
+            self.send_response(200)
+            self.send_header("Content-Length", "20")
+            self.end_headers()
+            for _ in range(20):
+                self.wfile.write(b" ")
+                self.wfile.flush()
+                time.sleep(0.02)
+        elif self.path == "/slow":
+            with FeedHandler.lock:
+                FeedHandler.active += 1
+                FeedHandler.peak = max(FeedHandler.peak, FeedHandler.active)
+            time.sleep(0.1)
+            with FeedHandler.lock:
+                FeedHandler.active -= 1
+            self._send(200, FEED)
+        elif self.headers.get("If-None-Match") == ETAG:
+            self._send(304, b"")
+        elif "gzip" in self.headers.get("Accept-Encoding", ""):
+            self._send(200, gzip.compress(FEED), {"Content-Encoding": "gzip", "ETag": ETAG})
+        else:
+            self._send(200, FEED, {"ETag": ETAG})
+    
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    """A local feed server on a free port."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FeedHandler)
+    httpd.requests = []
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def fetcher():
+    """A fetcher with a small body limit."""
+    fetcher = FeedFetcher(max_body_bytes=1024, per_host_limit=2)
+    yield fetcher
+    fetcher.close()
+
+
+def url(server, path):
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+@pytest.mark.unit
+def test_fetch_negotiates_compression(server, fetcher):
+    """Test the feed is requested compressed and decoded."""
+    result = fetcher.fetch(url(server, "/feed"))
+    
+    assert result.status_code == 200
+    assert result.content == FEED
+    assert result.headers["etag"] == ETAG
+    assert server.requests[0][1]["Accept-Encoding"] == ACCEPT_ENCODING
+
+
+@pytest.mark.unit
+def test_fetch_reuses_connection(server, fetcher):
+    """Test consecutive fetches to one host share a keep-alive connection."""
+    fetcher.fetch(url(server, "/feed"))
+    fetcher.fetch(url(server, "/feed"))
+    
+    assert len(server.requests) == 2
+    assert len({client for _, _, client in server.requests}) == 1
+
+
+@pytest.mark.unit
+def test_fetch_conditional(server, fetcher):
+    """Test validators are sent and a 304 has an empty body."""
+    result = fetcher.fetch(url(server, "/feed"), etag=ETAG, modified="Mon, 20 Nov 2023 10:00:00 GMT")
+    
+    assert result.status_code == 304
+    assert result.content == b""
+    assert server.requests[0][1]["If-Modified-Since"] == "Mon, 20 Nov 2023 10:00:00 GMT"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("path", ["/missing", "/large", "/bomb"])
+def test_fetch_rejects(server, fetcher, path):
+    """Test error statuses and oversized bodies (declared or decompressed) fail."""
+    with pytest.raises(FeedFetchError):
+        fetcher.fetch(url(server, path))
+
+
+@pytest.mark.unit
+def test_fetch_caps_requests_per_host(server, fetcher):
+    """Test no more than per_host_limit requests run against a host at once."""
+    FeedHandler.peak = 0
+    threads = [threading.Thread(target=fetcher.fetch, args=(url(server, "/slow"),)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(server.requests) == 6
+    assert FeedHandler.peak == 2
+
+
+@pytest.mark.unit
+def test_parse_feed_from_local_server(server, fetcher, monkeypatch):
+    """Test RSSParser parses the fetched bytes and returns the validators."""
+    monkeypatch.setattr("podcast_tracker.services.rss_parser.feed_fetcher", fetcher)
+    
+    result = RSSParser.parse_feed(url(server, "/feed"))
+    
+    assert result["title"] == "Local Podcast"
+    assert result["etag"] == ETAG
+    assert [episode["guid"] for episode in result["episodes"]] == ["ep-1"]
+    assert RSSParser.parse_feed(url(server, "/feed"), etag=ETAG) == {"not_modified": True}
+    assert RSSParser.parse_feed(url(server, "/missing")) is None
+
+
+@pytest.mark.unit
+def test_fetch_enforces_total_timeout(server):
+    """Test a host sending the body too slowly fails even though every read is quick."""
+    fetcher = FeedFetcher(read_timeout=1, total_timeout=0.1)
+    try:
+        with pytest.raises(FeedFetchError, match="longer than"):
+            fetcher.fetch(url(server, "/drip"))
+    finally:
+        fetcher.close()
@@ -0,0 +1,183 @@
+"""Unit tests for the feed job queue and refresh workers."""
+
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from podcast_tracker.config import settings
+from podcast_tracker.database.models import Podcast, FeedJob, FeedState
+from podcast_tracker.metrics import refresh_job_seconds
+from podcast_tracker.services.job_queue import FeedJobQueue
+from podcast_tracker.services.podcast_service import PodcastService
+from podcast_tracker.services.scheduler import PodcastScheduler
+from podcast_tracker.services.worker import RefreshWorker
+
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def timed_batches(status):
+    """Number of worker batches timed with the given status."""
+    return sum(refresh_job_seconds.labels("queue", status).counts)
+
+
+@pytest.fixture
+def podcasts(test_db):
+    """Three podcasts."""
+    podcasts = [Podcast(name=f"Podcast {i}", rss_url=f"https://example.com/{i}.xml") for i in range(3)]
+    test_db.add_all(podcasts)
+    test_db.commit()
+    return podcasts
+
+
+@pytest.fixture
+def queue(test_db):
+    """A queue on the test session."""
+    return FeedJobQueue(test_db)
+
+
+@pytest.fixture
+def use_test_db(test_db):
+    """Make workers and the scheduler use the test session."""
+    @contextmanager
+    def test_get_db():
+        yield test_db
+    
+    with patch('podcast_tracker.services.worker.get_db', test_get_db), \
+            patch('podcast_tracker.services.scheduler.get_db', test_get_db):
+        yield
+
+
+@pytest.mark.unit
+def test_enqueue_keeps_one_job_per_podcast(queue, podcasts, test_db):
+    """Test a podcast with a pending job is not queued again."""
+    first, second, third = (podcast.id for podcast in podcasts)
+    
+    assert queue.enqueue([first, second], now=NOW) == 2
+    assert queue.enqueue([first, second, third, 999], now=NOW) == 1
+    assert queue.enqueue([]) == 0
+    
+    assert sorted(job.podcast_id for job in test_db.query(FeedJob)) == [first, second, third]
+
+
+@pytest.mark.unit
+def test_claim_leases_jobs_to_one_worker(queue, podcasts):
+    """Test claimed jobs are not handed to another worker while leased."""
+    queue.enqueue([podcast.id for podcast in podcasts], now=NOW)
+    
+    claimed = queue.claim("worker-a", limit=2, lease_seconds=60, now=NOW)
+    assert [job.podcast_id for job in claimed] == [podcasts[0].id, podcasts[1].id]
+    assert all(job.attempt == 1 for job in claimed)
+    
+    rest = queue.claim("worker-b", limit=5, lease_seconds=60, now=NOW)
+    assert [job.podcast_id for job in rest] == [podcasts[2].id]
+    assert queue.claim("worker-b", limit=5, lease_seconds=60, now=NOW + timedelta(seconds=30)) == []
+    
+    assert queue.complete("worker-a", claimed) == 2
+    assert queue.complete("worker-b", rest) == 1
+    assert queue.claim("worker-b", limit=5, now=NOW + timedelta(hours=1)) == []
+
+
+@pytest.mark.unit
+def test_expired_lease_is_reclaimed_and_fenced(queue, podcasts, test_db):
+    """Test a job whose lease expired moves to another worker, and the first one loses it."""
+    queue.enqueue([podcasts[0].id], now=NOW)
+    [stale] = queue.claim("worker-a", limit=1, lease_seconds=60, now=NOW)
+    
+    # Renewing keeps the job away from other workers
+    assert queue.renew("worker-a", [stale], lease_seconds=60, now=NOW + timedelta(seconds=50)) == 1
+    assert queue.claim("worker-b", limit=1, now=NOW + timedelta(seconds=70)) == []
+    
+    # worker-a stops renewing: its lease expires
+    [current] = queue.claim("worker-b", limit=1, lease_seconds=60, now=NOW + timedelta(seconds=111))
+    assert (current.id, current.attempt) == (stale.id, 2)
+    
+    assert queue.renew("worker-a", [stale], now=NOW + timedelta(seconds=120)) == 0
+    assert queue.complete("worker-a", [stale]) == 0
+    assert test_db.query(FeedJob).count() == 1
+    
+    assert queue.complete("worker-b", [current]) == 1
+    assert test_db.query(FeedJob).count() == 0
+
+
+@pytest.mark.unit
+def test_jobs_are_dropped_after_max_attempts(queue, podcasts, test_db):
+    """Test a job whose workers keep dying is eventually dropped."""
+    queue.enqueue([podcasts[0].id], now=NOW)
+    
+    with patch('podcast_tracker.services.job_queue.settings.job_max_attempts', 2):
+        assert len(queue.claim("worker-a", limit=1, lease_seconds=60, now=NOW)) == 1
+        assert len(queue.claim("worker-b", limit=1, lease_seconds=60, now=NOW + timedelta(minutes=2))) == 1
+        assert queue.claim("worker-c", limit=1, lease_seconds=60, now=NOW + timedelta(minutes=4)) == []
+    
+    assert test_db.query(FeedJob).count() == 0
+    
+    # It counts as a failure: the feed is not due again at the next scheduler tick
+    state = test_db.get(FeedState, podcasts[0].id)
+    assert state.consecutive_failures == 1 and state.last_error.startswith("Check abandoned")
+    assert state.next_check_at == state.retry_after > NOW + timedelta(minutes=4)
+    next_tick = NOW + timedelta(minutes=4 + settings.scheduler_tick_minutes)
+    assert podcasts[0] not in PodcastService(test_db).get_due_podcasts(now=next_tick)
+    assert podcasts[0] in PodcastService(test_db).get_due_podcasts(now=state.retry_after)
+
+
+@pytest.mark.unit
+def test_released_jobs_are_claimable_at_once(queue, podcasts):
+    """Test a released job goes back to the queue without waiting for its lease."""
+    queue.enqueue([podcasts[0].id], now=NOW)
+    claimed = queue.claim("worker-a", limit=1, lease_seconds=600, now=NOW)
+    
+    assert queue.release("worker-a", claimed, now=NOW) == 1
+    [again] = queue.claim("worker-b", limit=1, now=NOW)
+    assert again.attempt == 2
+
+
+@pytest.mark.unit
+def test_worker_processes_claimed_jobs(use_test_db, queue, podcasts, test_db):
+    """Test a worker checks the queued feeds and removes their jobs."""
+    queue.enqueue([podcasts[0].id, podcasts[1].id])
+    checked = []
+    
+    def fake_parse_feed(rss_url, etag=None, modified=None):
+        checked.append(rss_url)
+        return {"not_modified": True}
+    
+    worker = RefreshWorker(worker_id="worker-a", batch_size=5, lease_seconds=600)
+    timed = timed_batches("succeeded")
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=fake_parse_feed):
+        assert worker.run_once() == 2
+        assert worker.run_once() == 0
+    assert timed_batches("succeeded") == timed + 1
+    
+    assert sorted(checked) == sorted([podcasts[0].rss_url, podcasts[1].rss_url])
+    assert test_db.query(FeedJob).count() == 0
+    assert test_db.get(FeedState, podcasts[0].id).last_success_at is not None
+
+
+@pytest.mark.unit
+def test_worker_releases_jobs_when_the_batch_fails(use_test_db, queue, podcasts, test_db):
+    """Test jobs go back to the queue when processing them raises."""
+    queue.enqueue([podcasts[0].id])
+    
+    worker = RefreshWorker(worker_id="worker-a", lease_seconds=600)
+    timed = timed_batches("failed")
+    with patch('podcast_tracker.services.worker.PodcastService.refresh_podcasts', side_effect=RuntimeError("boom")):
+        assert worker.run_once() == 1
+    assert timed_batches("failed") == timed + 1
+    
+    job = test_db.query(FeedJob).one()
+    assert (job.lease_owner, job.attempts) == (None, 1)
+
+
+@pytest.mark.unit
+def test_scheduler_queues_due_podcasts(use_test_db, podcasts, test_db):
+    """Test a scheduler tick queues each due podcast once."""
+    test_db.add(FeedState(podcast_id=podcasts[2].id, next_check_at=datetime.utcnow() + timedelta(hours=1)))
+    test_db.commit()
+    
+    scheduler = PodcastScheduler()
+    scheduler._check_new_episodes_job()
+    scheduler._check_new_episodes_job()
+    
+    assert sorted(job.podcast_id for job in test_db.query(FeedJob)) == [podcasts[0].id, podcasts[1].id]
@@ -0,0 +1,138 @@
+"""Unit tests for leader election."""
+
+import threading
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import patch
+
+from podcast_tracker.database.models import LeaderLease
+from podcast_tracker.services.leader import LeaderElection, SCHEDULER_LEASE
+from podcast_tracker.services.scheduler import PodcastScheduler
+
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def elections(test_db_engine):
+    """Make two elections for the scheduler lease, recording their transitions."""
+    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_db_engine)
+    
+    @contextmanager
+    def test_get_db():
+        db = TestSessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    def make(owner_id, events):
+        return LeaderElection(
+            SCHEDULER_LEASE,
+            on_elected=lambda: events.append((owner_id, "elected")),
+            on_demoted=lambda: events.append((owner_id, "demoted")),
+            owner_id=owner_id,
+            lease_seconds=30
+        )
+    
+    with patch('podcast_tracker.services.leader.get_db', test_get_db):
+        events = []
+        yield make("a", events), make("b", events), events, TestSessionLocal
+
+
+def expire_lease(session_factory):
+    """Make the stored lease look abandoned."""
+    with session_factory() as db:
+        db.execute(update(LeaderLease).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+        db.commit()
+
+
+@pytest.mark.unit
+def test_lease_has_one_holder_until_it_expires(elections):
+    """Test the lease is held by one owner at a time and can be renewed."""
+    first, second, _, _ = elections
+    
+    assert first.try_acquire(NOW)
+    assert not second.try_acquire(NOW)
+    assert first.try_acquire(NOW + timedelta(seconds=20))
+    assert not second.try_acquire(NOW + timedelta(seconds=40))
+    
+    # Renewed at +20s, so it lasts until +50s
+    assert second.try_acquire(NOW + timedelta(seconds=50))
+    assert not first.try_acquire(NOW + timedelta(seconds=55))
+
+
+@pytest.mark.unit
+def test_leader_fails_over_when_its_lease_expires(elections):
+    """Test another process takes over from a leader that stopped renewing."""
+    first, second, events, session_factory = elections
+    
+    assert first.step()
+    assert not second.step()
+    assert events == [("a", "elected")]
+    
+    expire_lease(session_factory)
+    assert second.step()
+    assert not first.step()
+    assert events == [("a", "elected"), ("b", "elected"), ("a", "demoted")]
+
+
+@pytest.mark.unit
+def test_stop_releases_the_lease(elections):
+    """Test a leader shutting down lets another process take over at once."""
+    first, second, events, _ = elections
+    
+    assert first.step()
+    first.stop()
+    assert not first.is_leader
+    assert second.step()
+    assert events == [("a", "elected"), ("a", "demoted"), ("b", "elected")]
+
+
+@pytest.mark.unit
+def test_leader_survives_a_failed_renewal(elections):
+    """Test a renewal error keeps the leader while its lease lasts."""
+    first, _, events, _ = elections
+    assert first.step()
+    
+    with patch.object(first, "try_acquire", side_effect=RuntimeError("database is locked")):
+        assert first.step()
+        
+        # Too close to the end of the lease for another try
+        first._expires_at = datetime.utcnow() + timedelta(seconds=5)
+        assert not first.step()
+    
+    assert events == [("a", "elected"), ("a", "demoted")]
+
+
+@pytest.mark.unit
+def test_scheduler_runs_again_after_re_election(elections):
+    """Test a leader that lost the lease and won it back schedules checks again."""
+    first, second, _, session_factory = elections
+    scheduler = PodcastScheduler()
+    ticks = threading.Semaphore(0)
+    first.on_elected, first.on_demoted = scheduler.start, scheduler.stop
+    
+    with patch.object(scheduler, "_check_new_episodes_job", side_effect=ticks.release):
+        try:
+            assert first.step()
+            assert ticks.acquire(timeout=5)
+            
+            expire_lease(session_factory)
+            assert second.step()
+            assert not first.step()
+            assert not scheduler.is_running
+            
+            second.release()
+            assert first.step()
+            assert ticks.acquire(timeout=5)
+        finally:
+            if scheduler.is_running:
+                scheduler.stop()
@@ -0,0 +1,63 @@
+"""Unit tests for the metrics registry."""
+
+import pytest
+
+from podcast_tracker.metrics import Counter, CounterFunc, Histogram, Registry
+
+
+@pytest.mark.unit
+def test_counter_renders_labels():
+    """Test counters render one _total sample per label set, with escaped values."""
+    registry = Registry()
+    fetches = registry.register(Counter("fetches", "Fetches.", ["feed", "result"]))
+    
+    fetches.labels('https://example.com/"feed"', "ok").inc()
+    fetches.labels('https://example.com/"feed"', "ok").inc(2)
+    
+    assert registry.render().splitlines() == [
+        "# HELP fetches Fetches.",
+        "# TYPE fetches counter",
+        'fetches_total{feed="https://example.com/\\"feed\\"",result="ok"} 3',
+    ]
+
+
+@pytest.mark.unit
+def test_histogram_buckets_are_cumulative():
+    """Test observations land in the first bucket whose bound they do not exceed."""
+    registry = Registry()
+    latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+    
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe(value)
+    
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{le="0.1"} 2',
+        'latency_seconds_bucket{le="1.0"} 3',
+        'latency_seconds_bucket{le="+Inf"} 4',
+        "latency_seconds_sum 2.65",
+        "latency_seconds_count 4",
+    ]
+
+
+@pytest.mark.unit
+def test_counter_func_reads_on_render():
+    """Test function-backed counters read their source at render time."""
+    registry = Registry()
+    source = {"hits": 1}
+    registry.register(CounterFunc("cache", "Cache.", "result", lambda: source))
+    
+    source["hits"] = 5
+    
+    assert 'cache_total{result="hits"} 5' in registry.render()
+
+
+@pytest.mark.unit
+def test_registry_rejects_duplicates_and_bad_labels():
+    """Test metric names are unique and label counts are checked."""
+    registry = Registry()
+    counter = registry.register(Counter("events", "Events.", ["kind"]))
+    
+    with pytest.raises(ValueError):
+        registry.register(Counter("events", "Events."))
+    with pytest.raises(ValueError):
+        counter.labels("a", "b")
@@ -0,0 +1,163 @@
+"""Unit tests for schema migrations."""
+
+import os
+import subprocess
+import sys
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from podcast_tracker.database.models import Base
+from podcast_tracker.database.migrations import MIGRATIONS, get_applied_versions, run_migrations
+
+
+LEGACY_EPISODES_TABLE = (
+    "CREATE TABLE episodes (id INTEGER PRIMARY KEY, podcast_id INTEGER NOT NULL, "
+    "title VARCHAR(500) NOT NULL, description TEXT, pub_date DATETIME NOT NULL, "
+    "duration VARCHAR(50), episode_url VARCHAR(500) NOT NULL, spotify_url VARCHAR(500), "
+    "listened BOOLEAN NOT NULL, created_at DATETIME)"
+)
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """Engine on a database created before migrations existed."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(text(LEGACY_EPISODES_TABLE))
+        conn.execute(text(
+            "INSERT INTO episodes (podcast_id, title, pub_date, episode_url, listened) "
+            "VALUES (1, 'Episode 1', '2023-11-20 10:00:00', 'https://example.com/ep1.mp3', 0)"
+        ))
+    
+    yield engine
+    
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_run_migrations_upgrades_legacy_database(legacy_engine):
+    """Test a legacy database gets the new column and indexes."""
+    applied = run_migrations(legacy_engine)
+    
+    assert applied == len(MIGRATIONS)
+    
+    inspector = inspect(legacy_engine)
+    assert "guid" in {column["name"] for column in inspector.get_columns("episodes")}
+    
+    assert {"feed_jobs", "leader_leases", "data_versions", "change_events", "refresh_jobs"} <= set(inspector.get_table_names())
+    
+    index_names = {index["name"] for index in inspector.get_indexes("episodes")}
+    assert {
+        "ix_episodes_podcast_id_guid",
+        "ix_episodes_listened_pub_date",
+        "ix_episodes_podcast_id_listened_pub_date",
+    } <= index_names
+    
+    with legacy_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM episodes")).scalar() == 1
+        assert conn.execute(
+            text("SELECT total_count, pending_count FROM podcast_stats WHERE podcast_id = 1")
+        ).one() == (1, 1)
+        assert conn.execute(
+            text("SELECT rowid FROM episodes_fts WHERE episodes_fts MATCH 'episode'")
+        ).scalars().all() == [1]
+
+
+@pytest.mark.unit
+def test_run_migrations_is_idempotent(legacy_engine):
+    """Test migrations are recorded and not applied twice."""
+    run_migrations(legacy_engine)
+    
+    assert run_migrations(legacy_engine) == 0
+    assert get_applied_versions(legacy_engine) == [m.version for m in MIGRATIONS]
+
+
+@pytest.mark.unit
+def test_run_migrations_on_fresh_database(tmp_path):
+    """Test migrations are no-ops on a schema built by create_all."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    Base.metadata.create_all(bind=engine)
+    
+    assert run_migrations(engine) == len(MIGRATIONS)
+    engine.dispose()
+
+
+@pytest.mark.unit
+def test_run_migrations_moves_description_last(legacy_engine):
+    """Test the episodes table is rebuilt with a summary and description as the last column."""
+    with legacy_engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO episodes (podcast_id, title, description, pub_date, episode_url, listened) "
+            "VALUES (1, 'Episode 2', '<p>Notas del <b>episodio</b></p>', '2023-11-21 10:00:00', "
+            "'https://example.com/ep2.mp3', 0)"
+        ))
+    
+    run_migrations(legacy_engine)
+    
+    inspector = inspect(legacy_engine)
+    columns = [column["name"] for column in inspector.get_columns("episodes")]
+    assert columns[-1] == "description"
+    assert "summary" in columns
+    assert "ix_episodes_listened_pub_date" in {index["name"] for index in inspector.get_indexes("episodes")}
+    
+    with legacy_engine.begin() as conn:
+        assert conn.execute(text("SELECT id, summary FROM episodes ORDER BY id")).all() == [
+            (1, None),
+            (2, "Notas del episodio"),
+        ]
+        # Search triggers are recreated on the new table
+        conn.execute(text(
+            "INSERT INTO episodes (podcast_id, title, pub_date, episode_url, listened) "
+            "VALUES (1, 'Robots', '2023-11-22 10:00:00', 'https://example.com/ep3.mp3', 0)"
+        ))
+        assert conn.execute(
+            text("SELECT rowid FROM episodes_fts WHERE episodes_fts MATCH 'robots OR notas'")
+        ).scalars().all() == [2, 3]
+
+
+@pytest.mark.unit
+def test_run_migrations_adds_feed_health(legacy_engine):
+    """Test feed_states rows from before failure tracking start with no failures."""
+    with legacy_engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE feed_states (podcast_id INTEGER PRIMARY KEY, etag VARCHAR(255), "
+            "last_modified VARCHAR(100), check_interval_seconds INTEGER, next_check_at DATETIME, "
+            "updated_at DATETIME)"
+        ))
+        conn.execute(text("INSERT INTO feed_states (podcast_id, etag) VALUES (1, '\"v1\"')"))
+    
+    run_migrations(legacy_engine)
+    
+    columns = {column["name"] for column in inspect(legacy_engine).get_columns("feed_states")}
+    assert {"consecutive_failures", "last_error", "last_error_at", "last_success_at", "retry_after"} <= columns
+    with legacy_engine.connect() as conn:
+        assert conn.execute(
+            text("SELECT etag, consecutive_failures, retry_after FROM feed_states")
+        ).one() == ('"v1"', 0, None)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("legacy", [False, True])
+def test_init_db_from_concurrent_processes(tmp_path, legacy):
+    """Test server processes starting together set up the schema once, without errors."""
+    path = tmp_path / "shared.db"
+    engine = create_engine(f"sqlite:///{path}")
+    if legacy:
+        with engine.begin() as conn:
+            conn.execute(text(LEGACY_EPISODES_TABLE))
+    
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}", PYTHONPATH=os.pathsep.join(sys.path))
+    processes = [
+        subprocess.Popen(
+            [sys.executable, "-c", "from podcast_tracker.database import init_db; init_db()"],
+            env=env,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        for _ in range(4)
+    ]
+    errors = [process.communicate(timeout=120)[1] for process in processes]
+    
+    assert [process.returncode for process in processes] == [0] * 4, errors
+    assert get_applied_versions(engine) == [m.version for m in MIGRATIONS]
+    engine.dispose()
@@ -2,8 +2,9 @@
 
 import pytest
 from datetime import datetime
+from sqlalchemy import insert
 
-from podcast_tracker.database.models import Podcast, Episode
+from podcast_tracker.database.models import Podcast, Episode, SUMMARY_LENGTH, make_summary
 
 
 @pytest.mark.unit
@@ -103,3 +104,82 @@ def test_episode_listened_default(test_db, sample_podcast_data, sample_episode_d
     test_db.refresh(episode)
     
     assert episode.listened == False
+
+
+@pytest.mark.unit
+def test_episode_guid_unique_per_podcast(test_db, sample_podcast_data, sample_episode_data):
+    """Test the same GUID cannot be stored twice for a podcast."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    
+    test_db.add(Episode(podcast_id=podcast.id, guid="guid-1", **sample_episode_data))
+    test_db.commit()
+    
+    test_db.add(Episode(podcast_id=podcast.id, guid="guid-1", **sample_episode_data))
+    with pytest.raises(Exception):
+        test_db.commit()
+
+
+
+def _query_plan(db, query):
+    """Return the SQLite query plan of an ORM query."""
+    from sqlalchemy import text
+    
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return " | ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+@pytest.mark.unit
+def test_pending_episodes_query_uses_index(test_db):
+    """Test the pending-episodes listing is served by an index, without sorting."""
+    from podcast_tracker.services.podcast_service import PodcastService
+    
+    query = PodcastService(test_db).pending_episodes_query()
+    plan = _query_plan(test_db, query.limit(20))
+    
+    assert "ix_episodes_listened_pub_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.unit
+def test_pending_episodes_by_podcast_query_uses_index(test_db):
+    """Test filtering pending episodes by podcast uses the composite index."""
+    from podcast_tracker.services.podcast_service import PodcastService
+    
+    query = PodcastService(test_db).pending_episodes_query(podcast_id=1)
+    plan = _query_plan(test_db, query.limit(20))
+    
+    assert "ix_episodes_podcast_id_listened_pub_date" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.unit
+def test_make_summary():
+    """Test summaries are plain text, cut at a word boundary."""
+    assert make_summary("<p>Uno &amp; dos</p>\n<ul><li>tres</li></ul>") == "Uno & dos tres"
+    assert make_summary("<p></p>") is None
+    assert make_summary(None) is None
+    
+    summary = make_summary("<p>" + "palabra " * 100 + "</p>")
+    assert len(summary) <= SUMMARY_LENGTH
+    assert summary.endswith("palabra…")
+
+
+@pytest.mark.unit
+def test_episode_summary_set_on_insert(test_db, sample_podcast_data, sample_episode_data):
+    """Test the summary is stored by ORM and bulk inserts alike."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    
+    test_db.add(Episode(podcast_id=podcast.id, **dict(sample_episode_data, description="<b>ORM</b>")))
+    test_db.execute(insert(Episode), [
+        dict(sample_episode_data, podcast_id=podcast.id, guid=f"bulk-{i}", description=f"<i>Bulk {i}</i>")
+        for i in range(2)
+    ])
+    test_db.commit()
+    
+    summaries = {summary for (summary,) in test_db.query(Episode.summary)}
+    assert summaries == {"ORM", "Bulk 0", "Bulk 1"}
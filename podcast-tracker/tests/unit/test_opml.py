@@ -0,0 +1,167 @@
+"""Unit tests for OPML import and export."""
+
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from podcast_tracker.database.models import ChangeEvent, Podcast, Episode, FeedState, PodcastStats
+from podcast_tracker.services.opml import OpmlError, OpmlFeed, iter_opml_feeds, render_opml
+from podcast_tracker.services.podcast_service import PodcastService, EXISTING, FAILED, IMPORTED
+
+
+OPML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<opml version="2.0">
+  <head><title>Subscriptions</title></head>
+  <body>
+    <outline text="Tech">
+      <outline type="rss" text="First" title="First Show" xmlUrl="https://one.example.com/feed.xml"
+               htmlUrl="https://open.spotify.com/show/1"/>
+      <outline type="rss" text="Second" xmlUrl="https://two.example.com/feed.xml" htmlUrl="https://two.example.com/"/>
+    </outline>
+    <outline type="rss" text="First again" xmlUrl="https://one.example.com/feed.xml"/>
+    <outline type="rss" xmlUrl="https://three.example.com/feed.xml"/>
+  </body>
+</opml>
+"""
+
+
+def feed_data(name, episodes=2):
+    """Parsed feed data with a repeated item, as some feeds have."""
+    items = [
+        {"guid": f"{name}-{i}", "title": f"{name} {i}", "pub_date": datetime(2024, 1, 1 + i),
+         "episode_url": f"https://example.com/{name}/{i}.mp3", "description": f"<p>{name} {i}</p>"}
+        for i in range(episodes)
+    ]
+    return {"title": name, "description": f"About {name}", "artwork_url": None, "etag": f'"{name}"',
+            "last_modified": None, "episodes": items + items[:1]}
+
+
+@pytest.mark.unit
+def test_iter_opml_feeds_flattens_and_dedupes():
+    """Test feeds are read from nested outlines, once per URL."""
+    feeds = list(iter_opml_feeds(io.BytesIO(OPML)))
+    
+    assert feeds == [
+        OpmlFeed("First Show", "https://one.example.com/feed.xml", "https://open.spotify.com/show/1"),
+        OpmlFeed("Second", "https://two.example.com/feed.xml", None),
+        OpmlFeed("https://three.example.com/feed.xml", "https://three.example.com/feed.xml", None),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("document", [b"<rss><channel/></rss>", b"<opml><body><outline", b""])
+def test_iter_opml_feeds_rejects_invalid_documents(document):
+    """Test documents that are not OPML raise OpmlError."""
+    with pytest.raises(OpmlError):
+        list(iter_opml_feeds(io.BytesIO(document)))
+
+
+@pytest.mark.unit
+def test_render_opml_round_trips(sample_podcast_data):
+    """Test an export can be imported back."""
+    podcast = Podcast(**sample_podcast_data)
+    
+    document = render_opml([podcast])
+    
+    assert document.startswith(b"<?xml")
+    assert list(iter_opml_feeds(io.BytesIO(document))) == [
+        OpmlFeed(podcast.name, podcast.rss_url, podcast.spotify_url)
+    ]
+
+
+@pytest.mark.unit
+def test_import_podcasts(test_db, sample_podcast_data):
+    """Test feeds are fetched and stored with their episodes, counters and fetch state."""
+    existing = Podcast(**sample_podcast_data)
+    test_db.add(existing)
+    test_db.commit()
+    
+    def fake_parse_feed(rss_url, etag=None, modified=None):
+        if "broken" in rss_url:
+            return None
+        return feed_data(rss_url.split("/")[2])
+    
+    feeds = [
+        OpmlFeed("One", "https://one.example.com/feed.xml"),
+        OpmlFeed("Existing", existing.rss_url),
+        OpmlFeed("Broken", "https://broken.example.com/feed.xml"),
+        OpmlFeed(existing.name, "https://other.example.com/feed.xml"),
+        OpmlFeed("Two", "https://two.example.com/feed.xml", "https://open.spotify.com/show/2"),
+    ]
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=fake_parse_feed):
+        results = PodcastService(test_db).import_podcasts(feeds, batch_size=1)
+    
+    assert [(result.name, result.status) for result in results] == [
+        ("One", IMPORTED), ("Existing", EXISTING), ("Broken", FAILED), (existing.name, FAILED), ("Two", IMPORTED)
+    ]
+    assert results[1].podcast_id == existing.id
+    assert results[3].error == "Another podcast already has this name"
+    
+    two = test_db.query(Podcast).filter(Podcast.name == "Two").one()
+    assert (two.id, two.spotify_url, two.description) == (results[4].podcast_id, "https://open.spotify.com/show/2", "About two.example.com")
+    assert results[4].episodes == 2
+    assert test_db.query(Episode).filter(Episode.podcast_id == two.id).count() == 2
+    assert test_db.get(PodcastStats, two.id).pending_count == 2
+    
+    state = test_db.get(FeedState, two.id)
+    assert state.etag == '"two.example.com"'
+    assert state.last_success_at is not None and state.next_check_at is not None
+
+
+@pytest.mark.unit
+def test_import_podcasts_isolates_a_bad_feed_in_a_batch(test_db):
+    """Test a feed that cannot be stored fails alone, not with its whole batch."""
+    def fake_parse_feed(rss_url, etag=None, modified=None):
+        data = feed_data(rss_url.split("/")[2])
+        if "bad" in rss_url:
+            data["episodes"][0]["pub_date"] = None
+        return data
+    
+    feeds = [OpmlFeed(name, f"https://{name}.example.com/feed.xml") for name in ("good", "bad", "fine")]
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=fake_parse_feed):
+        results = PodcastService(test_db).import_podcasts(feeds)
+    
+    assert [result.status for result in results] == [IMPORTED, FAILED, IMPORTED]
+    assert sorted(name for (name,) in test_db.query(Podcast.name)) == ["fine", "good"]
+    assert test_db.query(Episode).count() == 4
+
+
+@pytest.mark.unit
+def test_import_podcasts_keeps_feeds_read_before_an_invalid_outline(test_db):
+    """Test a document that breaks partway still imports the feeds listed before the error."""
+    outlines = "".join(
+        f'<outline type="rss" text="{name}" xmlUrl="https://{name}.example.com/feed.xml"/>'
+        for name in ("one", "two", "three")
+    )
+    document = f'<opml version="2.0"><body>{outlines}<outline text="broken" <</body></opml>'.encode()
+    
+    def fake_parse_feed(rss_url, etag=None, modified=None):
+        return feed_data(rss_url.split("/")[2])
+    
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=fake_parse_feed):
+        with pytest.raises(OpmlError):
+            PodcastService(test_db).import_podcasts(iter_opml_feeds(io.BytesIO(document)), batch_size=2)
+    
+    assert sorted(name for (name,) in test_db.query(Podcast.name)) == ["one", "three", "two"]
+    assert test_db.query(Episode).count() == 6
+
+
+@pytest.mark.unit
+def test_import_podcasts_with_aware_and_naive_dates(test_db):
+    """Test a batch with feeds mixing aware and naive publication dates is imported once."""
+    def fake_parse_feed(rss_url, etag=None, modified=None):
+        data = feed_data(rss_url.split("/")[2])
+        data["episodes"][0]["pub_date"] = datetime(2024, 3, 1, tzinfo=timezone.utc)
+        return data
+    
+    feeds = [OpmlFeed(name, f"https://{name}.example.com/feed.xml") for name in ("one", "two")]
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=fake_parse_feed):
+        results = PodcastService(test_db).import_podcasts(feeds, batch_size=2)
+    
+    assert [(result.status, result.episodes) for result in results] == [(IMPORTED, 2), (IMPORTED, 2)]
+    assert test_db.query(Episode).count() == 4
+    events = [json.loads(event.data) for event in test_db.query(ChangeEvent)]
+    assert [event["latest_pub_date"] for event in events] == ["2024-03-01T00:00:00"] * 2
+    assert all(state.next_check_at is not None for state in test_db.query(FeedState))
@@ -2,10 +2,10 @@
 
 import pytest
 from unittest.mock import patch, MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from podcast_tracker.services.podcast_service import PodcastService
-from podcast_tracker.database.models import Podcast, Episode
+from podcast_tracker.database.models import Podcast, Episode, FeedState
 
 
 @pytest.mark.unit
@@ -179,3 +179,318 @@ def test_add_episodes_from_feed(test_db, sample_podcast_data):
     # Verify episodes were added
     episodes = test_db.query(Episode).filter(Episode.podcast_id == podcast.id).all()
     assert len(episodes) == 2
+
+
+@pytest.mark.unit
+def test_refresh_all_podcasts_concurrent(test_db):
+    """Test concurrent refresh stores episodes from every feed."""
+    for i in range(4):
+        test_db.add(Podcast(name=f"Podcast {i+1}", rss_url=f"https://host{i % 2}.example.com/feed{i+1}.xml"))
+    test_db.commit()
+    
+    def fake_parse_feed(rss_url, etag=None, modified=None):
+        return {
+            "title": "Feed",
+            "description": "",
+            "artwork_url": None,
+            "episodes": [{
+                "title": f"Episode of {rss_url}",
+                "description": "",
+                "pub_date": datetime(2023, 11, 20),
+                "episode_url": f"{rss_url}/ep.mp3",
+                "duration": None
+            }]
+        }
+    
+    with patch('podcast_tracker.services.podcast_service.settings.refresh_concurrency', 4):
+        with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=fake_parse_feed):
+            service = PodcastService(test_db)
+            total_new = service.refresh_all_podcasts()
+    
+    assert total_new == 4
+    assert test_db.query(Episode).count() == 4
+
+
+@pytest.mark.unit
+def test_refresh_all_podcasts_respects_per_host_limit(test_db):
+    """Test concurrent refresh never exceeds the per-host limit."""
+    import threading
+    import time
+    
+    for i in range(6):
+        test_db.add(Podcast(name=f"Podcast {i+1}", rss_url=f"https://same-host.example.com/feed{i+1}.xml"))
+    test_db.commit()
+    
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+    
+    def slow_parse_feed(rss_url, etag=None, modified=None):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.02)
+        with lock:
+            state["active"] -= 1
+        return None
+    
+    with patch('podcast_tracker.services.podcast_service.settings.refresh_concurrency', 6), \
+            patch('podcast_tracker.services.podcast_service.settings.refresh_per_host_limit', 2):
+        with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=slow_parse_feed):
+            service = PodcastService(test_db)
+            total_new = service.refresh_all_podcasts()
+    
+    assert total_new == 0
+    assert state["peak"] <= 2
+
+
+@pytest.mark.unit
+def test_refresh_podcasts_conditional_get(test_db, sample_podcast_data):
+    """Test validators are stored and a 304 skips all episode work."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    
+    full_feed = {
+        "title": "Test Podcast",
+        "description": "",
+        "artwork_url": None,
+        "etag": '"abc123"',
+        "last_modified": "Mon, 20 Nov 2023 10:00:00 GMT",
+        "episodes": []
+    }
+    
+    service = PodcastService(test_db)
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', return_value=full_feed):
+        stats = service.refresh_podcasts()
+    
+    assert stats.not_modified == 0
+    feed_state = test_db.query(FeedState).filter(FeedState.podcast_id == podcast.id).one()
+    assert feed_state.etag == '"abc123"'
+    
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed',
+               return_value={"not_modified": True}) as mock_parse:
+        with patch.object(PodcastService, '_add_episodes_from_feed') as mock_add:
+            stats = service.refresh_podcasts()
+    
+    mock_parse.assert_called_once_with(
+        podcast.rss_url,
+        etag='"abc123"',
+        modified="Mon, 20 Nov 2023 10:00:00 GMT"
+    )
+    mock_add.assert_not_called()
+    assert stats.not_modified == 1
+    assert stats.new_episodes == 0
+
+
+@pytest.mark.unit
+def test_add_episodes_from_feed_skips_existing(test_db, sample_podcast_data):
+    """Test stored and repeated feed entries are not inserted twice."""
+    from datetime import timezone
+    
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    
+    pub_date = datetime(2023, 11, 20, 10, 0, tzinfo=timezone.utc)
+    episodes_data = [
+        {"title": "Episode 1", "pub_date": pub_date, "episode_url": "https://example.com/ep1.mp3"},
+        {"title": "Episode 1", "pub_date": pub_date, "episode_url": "https://example.com/ep1.mp3"},
+        {"title": "Episode 2", "pub_date": pub_date, "episode_url": "https://example.com/ep2.mp3"},
+    ]
+    
+    service = PodcastService(test_db)
+    assert service._add_episodes_from_feed(podcast, episodes_data) == 2
+    assert service._add_episodes_from_feed(podcast, episodes_data) == 0
+    
+    episodes = test_db.query(Episode).filter(Episode.podcast_id == podcast.id).all()
+    assert len(episodes) == 2
+    assert all(ep.created_at is not None and ep.listened == False for ep in episodes)
+
+
+@pytest.mark.unit
+def test_add_episodes_from_feed_query_count(test_db, test_db_engine, sample_podcast_data):
+    """Test a large feed is stored with a constant number of queries."""
+    from sqlalchemy import event
+    
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    
+    episodes_data = [
+        {
+            "title": f"Episode {i}",
+            "pub_date": datetime(2020, 1, 1),
+            "episode_url": f"https://example.com/ep{i}.mp3"
+        }
+        for i in range(2000)
+    ]
+    
+    statements = []
+    
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(test_db_engine, "before_cursor_execute", count_statement)
+    try:
+        service = PodcastService(test_db)
+        new_count = service._add_episodes_from_feed(podcast, episodes_data)
+    finally:
+        event.remove(test_db_engine, "before_cursor_execute", count_statement)
+    
+    assert new_count == 2000
+    assert len(statements) <= 7  # Including the change event and the data version bump
+
+
+@pytest.mark.unit
+def test_add_episodes_from_feed_uses_guid(test_db, sample_podcast_data):
+    """Test a republished title updates the stored episode instead of duplicating it."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    
+    # Stored before GUIDs were tracked
+    legacy = Episode(
+        podcast_id=podcast.id,
+        title="Legacy Episode",
+        pub_date=datetime(2023, 1, 1),
+        episode_url="https://example.com/legacy.mp3"
+    )
+    test_db.add(legacy)
+    test_db.commit()
+    
+    episodes_data = [
+        {"guid": "guid-1", "title": "Episode 1", "pub_date": datetime(2023, 2, 1),
+         "episode_url": "https://example.com/ep1.mp3"},
+        {"guid": "guid-legacy", "title": "Legacy Episode", "pub_date": datetime(2023, 1, 1),
+         "episode_url": "https://example.com/legacy.mp3"},
+    ]
+    
+    service = PodcastService(test_db)
+    assert service._add_episodes_from_feed(podcast, episodes_data) == 1
+    
+    episodes_data[0]["title"] = "Episode 1 (fixed title)"
+    assert service._add_episodes_from_feed(podcast, episodes_data) == 0
+    
+    test_db.expire_all()
+    episodes = {ep.guid: ep for ep in test_db.query(Episode).filter(Episode.podcast_id == podcast.id)}
+    assert set(episodes) == {"guid-1", "guid-legacy"}
+    assert episodes["guid-1"].title == "Episode 1 (fixed title)"
+    assert episodes["guid-legacy"].id == legacy.id
+
+
+@pytest.mark.unit
+def test_refresh_podcasts_schedules_next_checks(test_db):
+    """Test each podcast gets its own next check, and only due podcasts are refreshed."""
+    now = datetime.utcnow()
+    weekly = Podcast(name="Weekly", rss_url="https://example.com/weekly.xml")
+    silent = Podcast(name="Silent", rss_url="https://example.com/silent.xml")
+    test_db.add_all([weekly, silent])
+    test_db.commit()
+    for i in range(5):
+        test_db.add(Episode(
+            podcast_id=weekly.id,
+            title=f"Episode {i}",
+            pub_date=now - timedelta(days=7 * i + 1),
+            episode_url=f"https://example.com/weekly/{i}.mp3"
+        ))
+    test_db.commit()
+    
+    service = PodcastService(test_db)
+    assert {podcast.name for podcast in service.get_due_podcasts()} == {"Weekly", "Silent"}
+    
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', return_value=None):
+        service.refresh_podcasts()
+    
+    states = {state.podcast_id: state for state in test_db.query(FeedState)}
+    assert states[weekly.id].check_interval_seconds == 3.5 * 3600
+    assert states[silent.id].check_interval_seconds == 3600
+    assert now < states[weekly.id].next_check_at < now + timedelta(hours=4)
+    
+    assert service.get_due_podcasts() == []
+    later = states[silent.id].next_check_at + timedelta(seconds=1)
+    assert [podcast.name for podcast in service.get_due_podcasts(later)] == ["Silent"]
+
+
+@pytest.mark.unit
+def test_refresh_podcasts_backs_off_failing_feeds(test_db, sample_podcast_data):
+    """Test failures are recorded, back off exponentially and open the circuit."""
+    from podcast_tracker.services.http_client import FeedFetchError, FetchResult
+    
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    service = PodcastService(test_db)
+    
+    fetch = 'podcast_tracker.services.rss_parser.feed_fetcher.fetch'
+    with patch('podcast_tracker.services.feed_health.settings.feed_failure_threshold', 2), \
+            patch('podcast_tracker.services.feed_health.settings.refresh_jitter', 0):
+        with patch(fetch, side_effect=FeedFetchError("HTTP 503 fetching feed")) as mock_fetch:
+            before = datetime.utcnow()
+            stats = service.refresh_podcasts()
+            
+            feed_state = test_db.query(FeedState).one()
+            assert (stats.failed, stats.skipped) == (1, 0)
+            assert feed_state.consecutive_failures == 1
+            assert feed_state.last_error == "HTTP 503 fetching feed"
+            assert feed_state.retry_after - before >= timedelta(minutes=15)
+            assert feed_state.next_check_at >= feed_state.retry_after
+            
+            service.refresh_podcasts()
+            assert feed_state.consecutive_failures == 2
+            assert feed_state.retry_after - feed_state.last_error_at == timedelta(minutes=30)
+            
+            # Circuit open: the feed is not fetched at all
+            stats = service.refresh_podcasts()
+            assert (stats.total, stats.skipped) == (0, 1)
+            assert mock_fetch.call_count == 2
+        
+        # Backoff over: the next refresh probes the feed, which has recovered
+        feed_state.retry_after = datetime.utcnow() - timedelta(seconds=1)
+        test_db.commit()
+        feed = b"<rss><channel><title>Back</title></channel></rss>"
+        with patch(fetch, return_value=FetchResult(200, feed, {}, podcast.rss_url)):
+            stats = service.refresh_podcasts()
+    
+    assert (stats.checked, stats.failed, stats.skipped) == (1, 0, 0)
+    assert feed_state.consecutive_failures == 0
+    assert feed_state.retry_after is None
+    assert feed_state.last_success_at is not None
+    assert feed_state.last_error == "HTTP 503 fetching feed"
+
+
+@pytest.mark.unit
+def test_overlapping_checks_of_a_feed(test_db, sample_podcast_data):
+    """Test a feed checked twice at once stores its episodes once and is not marked as failing."""
+    from podcast_tracker.database.models import PodcastStats
+    from podcast_tracker.services.podcast_service import RefreshStats
+    
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    
+    feed_data = {"etag": None, "last_modified": None, "episodes": [
+        {"guid": f"ep-{i}", "title": f"Episode {i}", "pub_date": datetime(2024, 1, 1 + i),
+         "episode_url": f"https://example.com/{i}.mp3"}
+        for i in range(2)
+    ]}
+    first, second = RefreshStats(), RefreshStats()
+    episode_row = PodcastService._episode_row
+    
+    def interleaved(*args):
+        # The other check stores the episodes after this one loaded the stored ones
+        if not second.checked:
+            second.checked = 1
+            PodcastService(test_db)._apply_feed(podcast, None, feed_data, second)
+        return episode_row(*args)
+    
+    with patch.object(PodcastService, "_episode_row", side_effect=interleaved):
+        PodcastService(test_db)._apply_feed(podcast, None, feed_data, first)
+    
+    assert (second.new_episodes, first.new_episodes, first.failed) == (2, 0, 0)
+    assert test_db.query(Episode).count() == 2
+    assert test_db.get(PodcastStats, podcast.id).pending_count == 2
+    feed_state = test_db.get(FeedState, podcast.id)
+    assert (feed_state.consecutive_failures, feed_state.last_error) == (0, None)
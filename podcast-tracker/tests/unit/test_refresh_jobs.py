@@ -0,0 +1,159 @@
+"""Unit tests for background refresh jobs."""
+
+import threading
+import pytest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from podcast_tracker.database.models import Podcast, FeedJob, RefreshJobState
+from podcast_tracker.services.job_queue import FeedJobQueue
+from podcast_tracker.services.refresh_jobs import (
+    RefreshJobManager,
+    RUNNING,
+    SUCCEEDED,
+    FAILED,
+)
+
+
+@pytest.fixture
+def manager(test_db):
+    """A job manager whose jobs use the test session."""
+    @contextmanager
+    def test_get_db():
+        yield test_db
+    
+    with patch('podcast_tracker.services.refresh_jobs.get_db', test_get_db), \
+            patch('podcast_tracker.services.worker.get_db', test_get_db):
+        yield RefreshJobManager(history=2)
+
+
+@pytest.mark.unit
+def test_concurrent_refreshes_share_one_job(manager, test_db):
+    """Test refreshes requested while one is in flight join it."""
+    for i in range(3):
+        test_db.add(Podcast(name=f"Podcast {i}", rss_url=f"https://example.com/{i}.xml"))
+    test_db.commit()
+    
+    release = threading.Event()
+    calls = []
+    
+    def blocking_parse_feed(rss_url, etag=None, modified=None):
+        calls.append(rss_url)
+        release.wait(5)
+        return None
+    
+    with patch('podcast_tracker.services.podcast_service.settings.refresh_concurrency', 1), \
+            patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=blocking_parse_feed):
+        job, created = manager.submit()
+        again, created_again = manager.submit()
+        release.set()
+        assert job.wait(5)
+    
+    assert created and not created_again
+    assert again is job
+    assert job.status == SUCCEEDED
+    assert (job.stats.total, job.stats.checked, job.stats.failed) == (3, 3, 3)
+    assert len(calls) == 3
+    assert manager.get(job.id).to_dict() == job.to_dict()
+    assert test_db.query(FeedJob).count() == 0
+    
+    # A finished job is not joined
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', return_value=None):
+        next_job, created = manager.submit()
+        assert created and next_job is not job
+        assert next_job.wait(5)
+    assert next_job.stats.checked == 3
+
+
+@pytest.mark.unit
+def test_refresh_waits_for_feeds_checked_by_other_workers(manager, test_db):
+    """Test a manual refresh does not check a feed another worker is checking."""
+    podcasts = [Podcast(name=f"Podcast {i}", rss_url=f"https://example.com/{i}.xml") for i in range(2)]
+    test_db.add_all(podcasts)
+    test_db.commit()
+    
+    queue = FeedJobQueue(test_db)
+    queue.enqueue([podcasts[0].id])
+    held = queue.claim("worker-b", limit=1, lease_seconds=600)
+    calls = []
+    
+    def parse_feed(rss_url, etag=None, modified=None):
+        calls.append(rss_url)
+        return None
+    
+    def other_worker_finishes(seconds):
+        queue.complete("worker-b", held)
+    
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=parse_feed), \
+            patch('podcast_tracker.services.refresh_jobs.time.sleep', side_effect=other_worker_finishes) as sleep:
+        job, _ = manager.submit()
+        assert job.wait(5)
+    
+    assert job.status == SUCCEEDED
+    assert calls == [podcasts[1].rss_url]
+    assert sleep.call_count == 1
+    assert (job.stats.total, job.stats.checked, job.stats.failed) == (2, 2, 1)
+
+
+@pytest.mark.unit
+def test_failed_refresh_job(manager):
+    """Test errors end the job as failed and the history is bounded."""
+    with patch('podcast_tracker.services.refresh_jobs.PodcastService.get_all_podcasts',
+               side_effect=RuntimeError("boom")):
+        job, _ = manager.submit()
+        assert job.wait(5)
+    
+    assert job.status == FAILED
+    assert job.error == "boom"
+    assert job.to_dict()["failed"] == 0
+    
+    for _ in range(2):
+        manager.submit()[0].wait(5)
+    assert manager.get(job.id) is None
+
+
+@pytest.mark.unit
+def test_refresh_job_is_shared_with_other_processes(manager, test_db):
+    """Test another process joins the in-flight job and reports its progress."""
+    test_db.add(Podcast(name="Podcast", rss_url="https://example.com/feed.xml"))
+    test_db.commit()
+    other_process = RefreshJobManager(history=2)
+    release = threading.Event()
+    
+    def blocking_parse_feed(rss_url, etag=None, modified=None):
+        release.wait(5)
+        return None
+    
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', side_effect=blocking_parse_feed):
+        job, _ = manager.submit()
+        joined, created = other_process.submit()
+        assert not created
+        assert joined.id == job.id and joined is not job
+        assert other_process.get(job.id).in_flight
+        release.set()
+        assert job.wait(5)
+    
+    status = other_process.get(job.id)
+    assert (status.status, status.stats.checked, status.stats.failed) == (SUCCEEDED, 1, 1)
+    assert status.wait(0)
+
+
+@pytest.mark.unit
+def test_job_of_a_stopped_process_is_failed(manager, test_db):
+    """Test an in-flight job whose process stopped renewing it neither blocks refreshes nor stays running."""
+    stale = datetime.utcnow() - timedelta(seconds=manager.stale_seconds + 1)
+    test_db.add(RefreshJobState(
+        id="stale", kind="all", status=RUNNING, owner="gone:1", created_at=stale, heartbeat_at=stale
+    ))
+    test_db.commit()
+    
+    assert manager.get("stale").status == FAILED
+    
+    test_db.get(RefreshJobState, "stale").status = RUNNING
+    test_db.commit()
+    with patch('podcast_tracker.services.podcast_service.RSSParser.parse_feed', return_value=None):
+        job, created = manager.submit()
+        assert job.wait(5)
+    assert created and job.id != "stale"
+    assert manager.get("stale").error == "The process running the job stopped"
@@ -1,10 +1,23 @@
 """Unit tests for RSS parser."""
 
+import feedparser
 import pytest
 from unittest.mock import patch, MagicMock
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 
-from podcast_tracker.services.rss_parser import RSSParser
+from podcast_tracker.services.http_client import FetchResult
+from podcast_tracker.services.rss_parser import RSSParser, date_parse_stats
+
+
+@pytest.fixture(autouse=True)
+def mock_fetch():
+    """Stub the HTTP fetch; tests patch feedparser.parse for the parsed feed."""
+    with patch(
+        'podcast_tracker.services.rss_parser.feed_fetcher.fetch',
+        side_effect=lambda url, **kwargs: FetchResult(200, b"", {}, url)
+    ) as fetch:
+        yield fetch
 
 
 @pytest.mark.unit
@@ -115,3 +128,94 @@ def test_extract_artwork_none():
     artwork = parser._extract_artwork(mock_feed)
     
     assert artwork is None
+
+
+@pytest.mark.unit
+def test_parse_feed_not_modified(mock_fetch):
+    """Test a 304 response short-circuits parsing."""
+    mock_fetch.side_effect = lambda url, **kwargs: FetchResult(304, b"", {}, url)
+    
+    with patch('feedparser.parse') as mock_parse:
+        result = RSSParser.parse_feed(
+            "https://example.com/feed.xml",
+            etag='"abc123"',
+            modified="Mon, 20 Nov 2023 10:00:00 GMT"
+        )
+    
+    mock_fetch.assert_called_once_with(
+        "https://example.com/feed.xml",
+        etag='"abc123"',
+        modified="Mon, 20 Nov 2023 10:00:00 GMT"
+    )
+    mock_parse.assert_not_called()
+    assert result == {"not_modified": True}
+
+
+@pytest.mark.unit
+def test_parse_feed_returns_validators(mock_fetch):
+    """Test ETag and Last-Modified are returned with the feed."""
+    mock_fetch.side_effect = lambda url, **kwargs: FetchResult(
+        200, b"<rss/>", {"etag": '"abc123"', "last-modified": "Mon, 20 Nov 2023 10:00:00 GMT"}, url
+    )
+    mock_feed = MagicMock()
+    mock_feed.bozo = False
+    mock_feed.feed = {"title": "Test Podcast", "description": ""}
+    mock_feed.entries = []
+    
+    with patch('feedparser.parse', return_value=mock_feed):
+        result = RSSParser.parse_feed("https://example.com/feed.xml")
+    
+    assert result["etag"] == '"abc123"'
+    assert result["last_modified"] == "Mon, 20 Nov 2023 10:00:00 GMT"
+
+
+@pytest.mark.unit
+def test_parse_episode_guid():
+    """Test the episode GUID falls back to the enclosure URL."""
+    entry = feedparser.FeedParserDict({
+        "id": "tag:example.com,2023:ep1",
+        "title": "Episode 1",
+        "link": "https://example.com/episode1",
+        "published": "Mon, 20 Nov 2023 10:00:00 GMT",
+        "links": [feedparser.FeedParserDict({"rel": "enclosure", "href": "https://example.com/ep1.mp3"})],
+    })
+    
+    assert RSSParser._parse_episode(entry)["guid"] == "tag:example.com,2023:ep1"
+    
+    del entry["id"]
+    assert RSSParser._parse_episode(entry)["guid"] == "https://example.com/ep1.mp3"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("published, expected, path", [
+    ("Mon, 20 Nov 2023 10:00:00 +0100", datetime(2023, 11, 20, 10, tzinfo=timezone(timedelta(hours=1))), "rfc822"),
+    ("20 Nov 2023 10:00 EST", datetime(2023, 11, 20, 10, tzinfo=timezone(timedelta(hours=-5))), "rfc822"),
+    ("2023-11-20T10:00:00Z", datetime(2023, 11, 20, 10, tzinfo=timezone.utc), "iso8601"),
+    ("2023-11-20 10:00", datetime(2023, 11, 20, 10), "iso8601"),
+    ("November 20, 2023 10:00", datetime(2023, 11, 20, 10), "dateutil"),
+])
+def test_parse_date_paths(published, expected, path):
+    """Test strict formats keep their offset and only odd dates reach dateutil."""
+    date_parse_stats.reset()
+    entry = feedparser.FeedParserDict({"title": "Episode", "published": published})
+    
+    assert RSSParser._parse_episode(entry)["pub_date"] == expected
+    assert date_parse_stats.snapshot()[path] == 1
+
+
+@pytest.mark.unit
+def test_parse_date_uses_feedparser_struct():
+    """Test dates only feedparser understands come from its parsed struct."""
+    date_parse_stats.reset()
+    entry = feedparser.FeedParserDict({
+        "title": "Episode",
+        "published": "Mon, 20 Nov 2023 10:00:00 GMT garbage",
+        "published_parsed": time.struct_time((2023, 11, 20, 10, 0, 0, 0, 324, 0)),
+    })
+    
+    with patch('podcast_tracker.services.rss_parser.date_parser.parse') as fuzzy:
+        result = RSSParser._parse_episode(entry)
+    
+    fuzzy.assert_not_called()
+    assert result["pub_date"] == datetime(2023, 11, 20, 10, tzinfo=timezone.utc)
+    assert date_parse_stats.snapshot()["struct"] == 1
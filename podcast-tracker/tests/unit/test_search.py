@@ -0,0 +1,104 @@
+"""Unit tests for full-text episode search."""
+
+import pytest
+from datetime import datetime
+from sqlalchemy import text
+
+from podcast_tracker.database.models import Podcast, Episode
+from podcast_tracker.database.search import (
+    format_snippet,
+    match_query,
+    rebuild_search_index,
+    search_episodes,
+)
+from podcast_tracker.services.podcast_service import PodcastService
+
+
+@pytest.fixture
+def podcast(test_db, sample_podcast_data):
+    """A stored podcast with a few episodes from its feed."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    
+    episodes_data = [
+        {"guid": "guid-1", "title": "Inteligencia artificial generativa",
+         "description": "<p>Hablamos de modelos de lenguaje</p>",
+         "pub_date": datetime(2023, 11, 1), "episode_url": "https://example.com/ep1.mp3"},
+        {"guid": "guid-2", "title": "Robótica y visión",
+         "description": "Sensores, cámaras y algo de inteligencia",
+         "pub_date": datetime(2023, 11, 2), "episode_url": "https://example.com/ep2.mp3"},
+        {"guid": "guid-3", "title": "Criptografía cuántica",
+         "description": None,
+         "pub_date": datetime(2023, 11, 3), "episode_url": "https://example.com/ep3.mp3"},
+    ]
+    PodcastService(test_db)._add_episodes_from_feed(podcast, episodes_data)
+    return podcast
+
+
+def _titles(test_db, query, **kwargs):
+    return [
+        episode.title
+        for episode, hit in PodcastService(test_db).search_episodes(query, **kwargs)
+    ]
+
+
+@pytest.mark.unit
+def test_match_query():
+    """Test user text is quoted and ANDed, keeping explicit prefixes."""
+    assert match_query("inteligencia artif*") == '"inteligencia" "artif"*'
+    assert match_query('foo" OR ^bar*') == '"foo" "OR" "bar"*'
+    assert match_query("  ()*: ") is None
+
+
+@pytest.mark.unit
+def test_search_finds_feed_episodes(test_db, podcast):
+    """Test episodes stored from a feed are indexed as they are inserted."""
+    # Title matches rank above description matches
+    assert _titles(test_db, "inteligencia") == [
+        "Inteligencia artificial generativa",
+        "Robótica y visión",
+    ]
+    # Accents are ignored and a trailing * matches a prefix
+    assert _titles(test_db, "robotica vis") == []
+    assert _titles(test_db, "robotica vis*") == ["Robótica y visión"]
+    assert _titles(test_db, "lenguaje") == ["Inteligencia artificial generativa"]
+    assert _titles(test_db, 'NEAR( "cuántica') == []
+    assert _titles(test_db, "inteligencia", podcast_id=podcast.id + 1) == []
+    assert _titles(test_db, "inteligencia", limit=1, offset=1) == ["Robótica y visión"]
+
+
+@pytest.mark.unit
+def test_search_follows_updates_and_deletes(test_db, podcast):
+    """Test title changes and deleted episodes are reflected in the index."""
+    episode = test_db.query(Episode).filter(Episode.guid == "guid-3").one()
+    episode.title = "Computación cuántica"
+    test_db.commit()
+    
+    assert _titles(test_db, "computacion") == ["Computación cuántica"]
+    assert _titles(test_db, "criptografia") == []
+    
+    test_db.delete(episode)
+    test_db.commit()
+    
+    assert _titles(test_db, "cuantica") == []
+
+
+@pytest.mark.unit
+def test_search_snippet_is_escaped(test_db, podcast):
+    """Test snippets drop feed HTML and highlight matches."""
+    hit = search_episodes(test_db.connection(), "modelos")[0]
+    
+    assert hit.snippet == "Hablamos de <mark>modelos</mark> de lenguaje"
+    assert format_snippet("a < b \x02x\x03") == "a &lt; b <mark>x</mark>"
+
+
+@pytest.mark.unit
+def test_rebuild_search_index(test_db, podcast):
+    """Test the index can be rebuilt from scratch."""
+    conn = test_db.connection()
+    conn.execute(text("INSERT INTO episodes_fts(episodes_fts) VALUES ('delete-all')"))
+    assert _titles(test_db, "inteligencia") == []
+    
+    assert rebuild_search_index(conn) == 3
+    assert len(_titles(test_db, "inteligencia")) == 2
@@ -0,0 +1,125 @@
+"""Unit tests for the per-podcast episode counters."""
+
+import pytest
+from datetime import datetime
+
+from podcast_tracker.database.models import Podcast, Episode, PodcastStats
+from podcast_tracker.database.stats import find_stats_drift, rebuild_podcast_stats
+from podcast_tracker.services.podcast_service import PodcastService
+
+
+@pytest.fixture
+def podcast(test_db, sample_podcast_data):
+    """A stored podcast."""
+    podcast = Podcast(**sample_podcast_data)
+    test_db.add(podcast)
+    test_db.commit()
+    test_db.refresh(podcast)
+    return podcast
+
+
+def _stats(test_db, podcast_id):
+    test_db.expire_all()
+    return test_db.query(PodcastStats).filter(PodcastStats.podcast_id == podcast_id).one()
+
+
+@pytest.mark.unit
+def test_bulk_insert_updates_stats(test_db, podcast):
+    """Test episodes stored from a feed are counted."""
+    episodes_data = [
+        {"guid": f"guid-{i}", "title": f"Episode {i}", "pub_date": datetime(2023, 11, i + 1),
+         "episode_url": f"https://example.com/ep{i}.mp3"}
+        for i in range(3)
+    ]
+    
+    service = PodcastService(test_db)
+    service._add_episodes_from_feed(podcast, episodes_data)
+    service._add_episodes_from_feed(podcast, episodes_data)
+    
+    stats = _stats(test_db, podcast.id)
+    assert stats.total_count == 3
+    assert stats.pending_count == 3
+    assert stats.latest_pub_date == datetime(2023, 11, 3)
+    assert service.count_pending_episodes() == 3
+    assert find_stats_drift(test_db.connection()) == []
+
+
+@pytest.mark.unit
+def test_listened_changes_update_stats(test_db, podcast, sample_episode_data):
+    """Test marking episodes listened and unlistened moves the pending counter."""
+    episode = Episode(podcast_id=podcast.id, **sample_episode_data)
+    test_db.add(episode)
+    test_db.commit()
+    
+    service = PodcastService(test_db)
+    assert service.mark_as_listened(episode.id)
+    assert _stats(test_db, podcast.id).pending_count == 0
+    
+    # Marking twice must not count twice
+    assert service.mark_as_listened(episode.id)
+    assert _stats(test_db, podcast.id).pending_count == 0
+    
+    episode.listened = False
+    test_db.commit()
+    
+    stats = _stats(test_db, podcast.id)
+    assert stats.pending_count == 1
+    assert stats.total_count == 1
+
+
+@pytest.mark.unit
+def test_deleting_episodes_recounts_stats(test_db, podcast, sample_episode_data):
+    """Test deleting an episode recomputes the counters of its podcast."""
+    episodes = [
+        Episode(podcast_id=podcast.id, **dict(sample_episode_data, title=f"Episode {i}"))
+        for i in range(2)
+    ]
+    test_db.add_all(episodes)
+    test_db.commit()
+    
+    test_db.delete(episodes[0])
+    test_db.commit()
+    
+    assert _stats(test_db, podcast.id).total_count == 1
+    assert find_stats_drift(test_db.connection()) == []
+
+
+@pytest.mark.unit
+def test_rebuild_repairs_drift(test_db, podcast, sample_episode_data):
+    """Test drifted counters are reported and rebuilt."""
+    test_db.add(Episode(podcast_id=podcast.id, **sample_episode_data))
+    test_db.commit()
+    
+    stats = _stats(test_db, podcast.id)
+    stats.pending_count = 42
+    test_db.commit()
+    
+    drift = find_stats_drift(test_db.connection())
+    assert [entry["podcast_id"] for entry in drift] == [podcast.id]
+    
+    assert rebuild_podcast_stats(test_db.connection()) == 1
+    test_db.commit()
+    
+    assert _stats(test_db, podcast.id).pending_count == 1
+    assert find_stats_drift(test_db.connection()) == []
+
+
+@pytest.mark.unit
+def test_bulk_listened_update_updates_stats(test_db, podcast):
+    """Test set-based listened updates keep the counters in step."""
+    for i in range(4):
+        test_db.add(Episode(
+            podcast_id=podcast.id,
+            title=f"Episode {i}",
+            pub_date=datetime(2023, 11, i + 1),
+            episode_url=f"https://example.com/ep{i}.mp3"
+        ))
+    test_db.commit()
+    
+    service = PodcastService(test_db)
+    assert service.set_listened_bulk(True, podcast_id=podcast.id, before=datetime(2023, 11, 3)) == 2
+    assert _stats(test_db, podcast.id).pending_count == 2
+    
+    assert service.set_listened_bulk(False, episode_ids=[1, 3]) == 1
+    assert _stats(test_db, podcast.id).pending_count == 3
+    assert find_stats_drift(test_db.connection()) == []